@@ -0,0 +1,2 @@
+# GEP icon library build tools, installable as the `gep_icons` package.
+# `gep-icons --help` (or `python -m gep_icons --help`) lists the commands; see cli.py.
@@ -0,0 +1,139 @@
+import io
+import os
+import sys
+import argparse
+import importlib
+
+# One entry point for every script in python/:
+#
+#   gep-icons generate --name hs-icons-master --no-standalone
+#   gep-icons pipeline sprite
+#   gep-icons check zbackup
+#
+# Each command runs the script's own main() with the remaining arguments, so
+# `gep-icons <command> --help` shows that script's options. A command's module
+# is only imported when it runs, which keeps `--help` and light commands from
+# paying for numpy/scipy. Build systems can call main([...]) in-process: it
+# returns the exit code instead of exiting, and --no-input makes any prompt
+# take its default.
+
+if __package__:
+    from . import helpers
+else:  # python python/cli.py from a checkout
+    import helpers
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (group, [(command, "module[:function]", help)]); modules are file names in python/ or python/helpers/
+COMMANDS = [
+    ("Build", [
+        ("generate", "generate", "Build the sprite, config and index from svg/"),
+        ("pipeline", "pipeline", "Run the stages in python/pipeline.json"),
+        ("ingest", "ingest", "Add the SVGs in zip archives to svg/"),
+        ("create-sprite", "create-sprite", "Legacy sprite build with categories in the config"),
+    ]),
+    ("Checks", [
+        ("check", "consistency_check", "Check that the sprite, config and icon-tags.json agree"),
+        ("budgets", "complexity_budget", "Check sprite symbols against complexity budgets"),
+        ("render-cost", "render_cost", "Rank sprite symbols by CPU render time"),
+        ("colors", "color_usage", "Index the colors each source SVG uses against the palette"),
+        ("reproducible", "canonical_xml", "Check that canonical builds are byte-reproducible"),
+        ("index", "sprite_index", "Build or query the sprite's byte-offset index"),
+        ("delta", "sprite_delta", "Diff, apply and verify sprite deltas"),
+        ("geometry", "svg_geometry", "Print bounding boxes and node counts of SVG files"),
+    ]),
+    ("Tags", [
+        ("tags", "tag_store", "Edit, import and export the SQLite tag store"),
+        ("tag-index", "tag_vocab", "Build dist/icon-tags-index.json"),
+        ("related", "related_icons", "Add related icons to the sprite config"),
+        ("categories", "category-generator", "Assign categories from icon ids and tags"),
+        ("convert-tags", "convert-tags-format", "Convert old tag JSON to the current format"),
+    ]),
+    ("Transforms", [
+        ("simplify", "simplify_paths", "Reduce path nodes within a tolerance"),
+        ("mask-css", "mask_css", "Build the UI icon mask stylesheet"),
+        ("non-scaling-stroke", "non-scaling-stroke", "Apply non-scaling strokes to SVGs in the current folder"),
+        ("recolor-css", "recolor_svg-cssmethod", "Recolor SVGs in the current folder to currentColor"),
+        ("recolor-ui", "icon_recolor-for-ui", "Convert SVGs in the current folder for UI use"),
+        ("background", "background:process_svgs", "Render SVGs in the current folder as banner backgrounds"),
+        ("sort-strokes", "check_icons", "Sort SVGs in the current folder by fill/stroke"),
+        ("find-duplicates", "identify-duplicates", "Move SVGs with identical content aside"),
+    ]),
+    ("Tools", [
+        ("serve", "preview_server", "Preview server with live reload"),
+        ("cache", "transform_cache", "Inspect or clear the transform cache"),
+    ]),
+]
+
+ENTRY_POINTS = {command: target for _, commands in COMMANDS for command, target, _ in commands}
+
+
+def load_module(name):
+    """A module from python/ (generate) or python/helpers/ (everything else)."""
+    if os.path.exists(os.path.join(PYTHON_DIR, f"{name}.py")):
+        return importlib.import_module(f"{__package__}.{name}" if __package__ else name)
+    return helpers.load(name)
+
+
+def run(command, args=(), no_input=False):
+    """Runs one command in this process. Returns its exit code."""
+    module_name, _, func_name = ENTRY_POINTS[command].partition(":")
+    func = getattr(load_module(module_name), func_name or "main")
+
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    sys.argv = [f"gep-icons {command}", *args]
+    if no_input:
+        sys.stdin = io.StringIO()
+    try:
+        func()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+    return 0
+
+
+def command_list():
+    lines = []
+    width = max(len(command) for command in ENTRY_POINTS) + 2
+    for group, commands in COMMANDS:
+        lines.append(f"{group}:")
+        lines.extend(f"  {command:<{width}}{text}" for command, _, text in commands)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="gep-icons",
+        description="GEP icon library build tools. Run `gep-icons <command> --help` for a command's options.",
+        epilog=command_list(),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("-C", dest="directory", metavar="DIR", help="run in this folder (default: the current folder, usually the project root)")
+    parser.add_argument("--no-input", action="store_true", help="never wait for input; prompts take their defaults")
+    parser.add_argument("command", nargs="?", help="one of the commands below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    try:
+        args = parser.parse_args(argv)
+        if not args.command:
+            parser.print_help()
+            return 2
+        if args.command not in ENTRY_POINTS:
+            parser.error(f"unknown command '{args.command}' (see gep-icons --help)")
+    except SystemExit as e:
+        return e.code
+
+    cwd = os.getcwd()
+    try:
+        if args.directory:
+            os.chdir(args.directory)
+        return run(args.command, args.args, args.no_input)
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
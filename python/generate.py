@@ -1,165 +1,373 @@
+import io
 import os
+import re
 import sys
 import json
+import hashlib
+import argparse
 from xml.etree import ElementTree as ET
 
-def create_gep_sprite_system():
-    # 1. Setup Configuration
-    file_name = input("Enter name for sprite file (e.g. hs-icons-masks): ").strip() or "hs-icons-masks"
-    
-    full_file_name = f"{file_name}.svg"
-    output_folder = "dist"
-    input_base_dir = "svg" 
-    
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+HELPERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "helpers")
+sys.path.insert(0, HELPERS_DIR)
+from sprite_delta import compute_delta, apply_delta, sprite_version, describe
+from svg_geometry import analyze_many
+from sprite_index import build_index, write_index, index_path_for
+import complexity_budget
+from complexity_budget import enforce
+import consistency_check
+from canonical_xml import canonicalize, serialize
+from prompts import ask, confirm
+try:
+    from related_icons import add_related
+except ImportError:  # needs scipy (see requirements.txt)
+    add_related = None
+
+# Everything the build's output depends on besides this file; the pipeline's sprite stage hashes them too
+# (related_icons.py and tag_vocab.py are added there when the stage has "related" inputs)
+PIPELINE_DEPENDS = [os.path.join(HELPERS_DIR, f"{name}.py") for name in (
+    "sprite_delta", "svg_geometry", "sprite_index", "complexity_budget", "consistency_check", "canonical_xml")]
+PIPELINE_DEPENDS.append(complexity_budget.DEFAULT_BUDGETS)
 
-    # GEP Color Library
-    color_map = {
-      "Quick Colors: Primary": {
-      "icon-blue": "#0072BC",
-      "icon-dark-blue": "#002F6E",
-      "icon-light-blue": "#3DB5E6",
-      "icon-green": "#008996",
-      "icon-red": "#ED1C24",
-      "icon-orange": "#F28B00",
-      "icon-violet": "#831A5B"
+SVG_NS = "http://www.w3.org/2000/svg"
+SHAPE_TAGS = ['path', 'circle', 'rect', 'line', 'polyline', 'polygon']
+
+# Standalone icons: root attributes that only make sense in the source file
+STANDALONE_DROP_ATTRS = {"width", "height", "x", "y", "id", "version", "enable-background"}
+STANDALONE_DIR = "icons"
+STANDALONE_NAME_RE = re.compile(r".+\.[0-9a-f]{10}\.svg$")
+
+# GEP Color Library
+COLOR_MAP = {
+    "Quick Colors: Primary": {
+        "icon-blue": "#0072BC",
+        "icon-dark-blue": "#002F6E",
+        "icon-light-blue": "#3DB5E6",
+        "icon-green": "#008996",
+        "icon-red": "#ED1C24",
+        "icon-orange": "#F28B00",
+        "icon-violet": "#831A5B"
     },
     "Primary Blues": {
-      "icon-blue": "#0072BC",
-      "icon-blue-s1": "#0061a0",
-      "icon-blue-t4": "#80B9DE",
-      "icon-blue-t3": "#B3D5EB",
-      "icon-blue-t2": "#E6F1F9",
-      "icon-blue-t1": "#F5F9FC",
-      "icon-dark-blue": "#002F6E",
-      "icon-dark-blue-s1": "#00285e",
-      "icon-dark-blue-t4": "#8098B7",
-      "icon-dark-blue-t3": "#B3C1D4",
-      "icon-dark-blue-t2": "#E6EBF1",
-      "icon-dark-blue-t1": "#F5F7F9",
-      "icon-light-blue": "#3DB5E6",
-      "icon-light-blue-s1": "#349ac4",
-      "icon-light-blue-t4": "#9FDBF3",
-      "icon-light-blue-t3": "#C5E9F8",
-      "icon-light-blue-t2": "#ECF8FD",
-      "icon-light-blue-t1": "#F7FCFE"
+        "icon-blue": "#0072BC",
+        "icon-blue-s1": "#0061a0",
+        "icon-blue-t4": "#80B9DE",
+        "icon-blue-t3": "#B3D5EB",
+        "icon-blue-t2": "#E6F1F9",
+        "icon-blue-t1": "#F5F9FC",
+        "icon-dark-blue": "#002F6E",
+        "icon-dark-blue-s1": "#00285e",
+        "icon-dark-blue-t4": "#8098B7",
+        "icon-dark-blue-t3": "#B3C1D4",
+        "icon-dark-blue-t2": "#E6EBF1",
+        "icon-dark-blue-t1": "#F5F7F9",
+        "icon-light-blue": "#3DB5E6",
+        "icon-light-blue-s1": "#349ac4",
+        "icon-light-blue-t4": "#9FDBF3",
+        "icon-light-blue-t3": "#C5E9F8",
+        "icon-light-blue-t2": "#ECF8FD",
+        "icon-light-blue-t1": "#F7FCFE"
     },
     "Brand Accents": {
-      "icon-green": "#008996",
-      "icon-green-s1": "#007480",
-      "icon-green-t4": "#80C5CB",
-      "icon-green-t3": "#B3DCE0",
-      "icon-green-t2": "#E6F4F5",
-      "icon-green-t1": "#F5FAFB",
-      "icon-red": "#ED1C24",
-      "icon-red-s1": "#c9181f",
-      "icon-red-t4": "#F78E92",
-      "icon-red-t3": "#FABBB0",
-      "icon-red-t2": "#FEE9EA",
-      "icon-red-t1": "#FFF6F6",
-      "icon-orange": "#F28B00",
-      "icon-orange-s1": "#ce7600",
-      "icon-orange-t1": "#FFFAF5",
-      "icon-orange-t2": "#FEF4E6",
-      "icon-orange-t3": "#FBDCB3",
-      "icon-orange-t4": "#F9C680",
-      "icon-violet": "#831A5B",
-      "icon-violet-s1": "#6f164d",
-      "icon-violet-t4": "#C28DAE",
-      "icon-violet-t3": "#DABACE",
-      "icon-violet-t2": "#F3E9EF",
-      "icon-violet-t1": "#FAF6F8"
+        "icon-green": "#008996",
+        "icon-green-s1": "#007480",
+        "icon-green-t4": "#80C5CB",
+        "icon-green-t3": "#B3DCE0",
+        "icon-green-t2": "#E6F4F5",
+        "icon-green-t1": "#F5FAFB",
+        "icon-red": "#ED1C24",
+        "icon-red-s1": "#c9181f",
+        "icon-red-t4": "#F78E92",
+        "icon-red-t3": "#FABBB0",
+        "icon-red-t2": "#FEE9EA",
+        "icon-red-t1": "#FFF6F6",
+        "icon-orange": "#F28B00",
+        "icon-orange-s1": "#ce7600",
+        "icon-orange-t1": "#FFFAF5",
+        "icon-orange-t2": "#FEF4E6",
+        "icon-orange-t3": "#FBDCB3",
+        "icon-orange-t4": "#F9C680",
+        "icon-violet": "#831A5B",
+        "icon-violet-s1": "#6f164d",
+        "icon-violet-t4": "#C28DAE",
+        "icon-violet-t3": "#DABACE",
+        "icon-violet-t2": "#F3E9EF",
+        "icon-violet-t1": "#FAF6F8"
     },
     "Neutrals": {
-      "icon-dark-gray": "#474F50",
-      "icon-gray": "#6B6F70",
-      "icon-light-gray-1": "#F7F7F6",
-      "icon-light-gray-2": "#E6E6E6",
-      "icon-black": "#000000",
-      "icon-white": "#FFFFFF"
+        "icon-dark-gray": "#474F50",
+        "icon-gray": "#6B6F70",
+        "icon-light-gray-1": "#F7F7F6",
+        "icon-light-gray-2": "#E6E6E6",
+        "icon-black": "#000000",
+        "icon-white": "#FFFFFF"
     }
-  }
-
-    sprite_root = ET.Element("svg", {"xmlns": "http://www.w3.org/2000/svg", "style": "display: none;"})
-    icon_metadata = []
+}
 
-    if not os.path.exists(input_base_dir):
-        sys.exit(f"Error: Folder '{input_base_dir}' not found.")
 
+def iter_source_files(input_base_dir):
+    """Yields (folder_name, svg_file, file_path) for every SVG below input_base_dir, in sorted order."""
     for root_dir, dirs, files in os.walk(input_base_dir):
-        # Identify folder name to check for backgrounds
+        # os.walk lists in file system order, which differs between machines
+        dirs.sort()
         folder_name = os.path.basename(root_dir).lower()
+        for svg_file in sorted(files):
+            if svg_file.lower().endswith(".svg"):
+                yield folder_name, svg_file, os.path.join(root_dir, svg_file)
+
+def standalone_svg(svg_content, viewBox, canonical=False):
+    """Serializes one parsed icon as a minimal standalone <svg> (no declaration, no fixed size)."""
+    attrs = {k: v for k, v in svg_content.attrib.items() if k not in STANDALONE_DROP_ATTRS}
+    attrs["viewBox"] = viewBox
+    root = ET.Element(f"{{{SVG_NS}}}svg", attrs)
+    root.extend(list(svg_content))
+    if canonical:
+        data = serialize(canonicalize(root), xml_declaration=False)
+    else:
+        data = ET.tostring(root, encoding="utf-8")
+    # Indentation between tags is insignificant unless the icon contains text
+    if b"<text" not in data:
+        data = re.sub(rb">\s+<", b"><", data)
+    return data
+
+
+def build_sprite(sources, file_name, standalone=False, canonical=False):
+    """
+    Builds the sprite and its config from (folder_name, svg_file, src) entries.
+    `src` can be a path or a file-like object, so callers can pass files kept in memory.
+    With `standalone`, every icon is also serialized on its own from the same parse,
+    under icons/<asset_type>/<id>.<content hash>.svg.
+    With `canonical`, sources are taken in sorted order and written with
+    canonical_xml, so the same sources always give the same bytes.
+    Returns (sprite_bytes, config, {relative path: standalone bytes}).
+    """
+    if canonical:
+        sources = sorted(sources, key=lambda source: (source[0], source[1]))
+    # Serialize SVG elements without ns0: prefixes, regardless of what other helpers registered
+    ET.register_namespace("", SVG_NS)
+
+    full_file_name = f"{file_name}.svg"
+    sprite_root = ET.Element(f"{{{SVG_NS}}}svg", {"style": "display: none;"})
+    icon_metadata = []
+    parsed_roots = []
+    standalone_files = {}
+
+    for folder_name, svg_file, src in sources:
+        # Identify folder name to check for backgrounds
         is_background_folder = (folder_name == "non-scaling")
+        base_name = os.path.splitext(svg_file)[0]
 
-        for svg_file in files:
-            if not svg_file.lower().endswith(".svg"):
-                continue
-
-            file_path = os.path.join(root_dir, svg_file)
-            base_name = os.path.splitext(svg_file)[0]
-            
-            # Simplified: Determine type from filename pattern or folder
-            # Remove category logic - categories will be handled via tags
-            parts = base_name.split('_', 1)
-            
-            if is_background_folder:
-                asset_type = "background"
-                icon_id = base_name
-            elif len(parts) >= 2:
-                asset_type = parts[0]
-                icon_id = parts[1]
-            else:
-                asset_type = "general"
-                icon_id = base_name
-
-            try:
-                tree = ET.parse(file_path)
-                svg_content = tree.getroot()
-                viewBox = svg_content.get("viewBox", "0 0 110 110")
-                
-                # If NOT a background, add to the SVG Sprite
-                if not is_background_folder:
-                    symbol = ET.SubElement(sprite_root, "symbol", {"id": icon_id, "viewBox": viewBox})
-                    for element in svg_content.iter():
-                        if any(tag in element.tag for tag in ['path', 'circle', 'rect', 'line', 'polyline', 'polygon']):
-                            element.set("vector-effect", "non-scaling-stroke")
-                    for child in svg_content:
-                        symbol.append(child)
-                
-                # Metadata - NO CATEGORY FIELD
-                # Categories will be managed through tags in icon-tags.json
-                icon_metadata.append({
-                    "id": icon_id,
-                    "viewBox": viewBox,
-                    "type": asset_type,
-                    "path": f"https://assets.henryschein.com/{base_name}.svg" if is_background_folder else None
-                })
-                
-                print(f"Processed: {icon_id} (Type: {asset_type})")
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
+        # Simplified: Determine type from filename pattern or folder
+        # Remove category logic - categories will be handled via tags
+        parts = base_name.split('_', 1)
 
-    # 4. Save SVG sprite (even if empty, it prevents the JS error)
-    sprite_path = os.path.join(output_folder, full_file_name)
-    with open(sprite_path, "wb") as f:
-        f.write(ET.tostring(sprite_root, encoding="utf-8", xml_declaration=True))
-    
-    # 5. Save configuration JSON (NO categories in config)
+        if is_background_folder:
+            asset_type = "background"
+            icon_id = base_name
+        elif len(parts) >= 2:
+            asset_type = parts[0]
+            icon_id = parts[1]
+        else:
+            asset_type = "general"
+            icon_id = base_name
+
+        try:
+            tree = ET.parse(src)
+            svg_content = tree.getroot()
+            if canonical:
+                canonicalize(svg_content)
+            viewBox = svg_content.get("viewBox", "0 0 110 110")
+
+            # Metadata - NO CATEGORY FIELD
+            # Categories will be managed through tags in icon-tags.json
+            meta = {
+                "id": icon_id,
+                "viewBox": viewBox,
+                "type": asset_type,
+                "path": f"https://assets.henryschein.com/{base_name}.svg" if is_background_folder else None
+            }
+            if not is_background_folder:
+                for element in svg_content.iter():
+                    if any(tag in element.tag for tag in SHAPE_TAGS):
+                        element.set("vector-effect", "non-scaling-stroke")
+            if standalone:
+                data = standalone_svg(svg_content, viewBox, canonical)
+                digest = hashlib.sha256(data).hexdigest()[:10]
+                rel_path = f"{STANDALONE_DIR}/{asset_type}/{icon_id}.{digest}.svg"
+                standalone_files[rel_path] = data
+                meta["file"] = f"./dist/{rel_path}"
+
+            # Nothing below can fail, so the sprite, metadata and geometry stay in step
+            # If NOT a background, add to the SVG Sprite
+            if not is_background_folder:
+                symbol = ET.SubElement(sprite_root, f"{{{SVG_NS}}}symbol", {"id": icon_id, "viewBox": viewBox})
+                for child in svg_content:
+                    symbol.append(child)
+            icon_metadata.append(meta)
+            parsed_roots.append(svg_content)
+
+            print(f"Processed: {icon_id} (Type: {asset_type})")
+        except Exception as e:
+            print(f"Error processing {folder_name}/{svg_file}: {e}")
+
+    # Geometry for every icon in one vectorized pass: exact bbox, bbox area, node count
+    # and a tight viewBox (bbox + half stroke) so consumers can size cards without the DOM.
+    # Symbols keep the source viewBox so icons on a shared grid stay optically aligned.
+    for meta, geometry in zip(icon_metadata, analyze_many(parsed_roots)):
+        meta["tightViewBox"] = geometry["tightViewBox"]
+        meta["bbox"] = geometry["bbox"]
+        meta["area"] = geometry["area"]
+        meta["nodes"] = geometry["nodes"]
+        for error in geometry.get("errors", []):
+            print(f"⚠️  {meta['id']}: unreadable shape left out of the geometry - {error}")
+
+    if canonical:
+        sprite_bytes = serialize(canonicalize(sprite_root))
+    else:
+        sprite_bytes = ET.tostring(sprite_root, encoding="utf-8", xml_declaration=True)
+
+    # Configuration JSON (NO categories in config)
     config = {
         "spriteName": file_name,
-        "spriteUrl": f"./dist/{full_file_name}", 
-        "spriteFile": f"./dist/{full_file_name}", 
+        "spriteUrl": f"./dist/{full_file_name}",
+        "spriteFile": f"./dist/{full_file_name}",
+        "spriteVersion": sprite_version(sprite_bytes),
         "icons": icon_metadata,
-        "colors": color_map
+        "colors": COLOR_MAP
     }
+    return sprite_bytes, config, standalone_files
+
+def encode_config(config):
+    # Written as bytes so line endings are "\n" on every platform
+    return json.dumps(config, indent=2).encode("utf-8")
+
+def write_sprite_delta(previous_sprite, sprite_bytes, file_name, output_folder):
+    try:
+        delta = compute_delta(previous_sprite, sprite_bytes, file_name)
+    except (ET.ParseError, ValueError) as e:
+        print(f"⚠️  Previous sprite could not be read, no delta written: {e}")
+        return
+    if delta["from"] == delta["to"]:
+        print("ℹ️  Sprite symbols unchanged - no delta written")
+        return
+
+    # Never publish a delta that does not reproduce this build
+    try:
+        apply_delta(previous_sprite, delta)
+    except ValueError as e:
+        print(f"⚠️  Delta does not reproduce this build, none written: {e}")
+        return
+
+    delta_path = os.path.join(output_folder, f"{file_name}-delta.json")
+    with open(delta_path, "w", encoding="utf-8") as f:
+        json.dump(delta, f, indent=2, ensure_ascii=False)
+    print(f"✓ Delta {describe(delta)} -> {delta_path}")
+
+def write_standalone_files(files, output_folder):
+    """Writes new content-hashed icons and removes ones no longer referenced."""
+    written = 0
+    for rel_path, data in files.items():
+        path = os.path.join(output_folder, rel_path)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        written += 1
+
+    removed = 0
+    current = {os.path.normpath(os.path.join(output_folder, p)) for p in files}
+    for root_dir, _, filenames in os.walk(os.path.join(output_folder, STANDALONE_DIR)):
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(root_dir, filename))
+            if STANDALONE_NAME_RE.match(filename) and path not in current:
+                os.remove(path)
+                removed += 1
+
+    total = sum(len(data) for data in files.values())
+    print(f"✓ Standalone icons: {len(files)} files ({total / 1024:.0f} KB), {written} new, {removed} removed "
+          f"-> {os.path.join(output_folder, STANDALONE_DIR)}")
+
+def create_gep_sprite_system(file_name=None, standalone=None, canonical=False):
+    """Builds dist/<file_name>.svg and its config. Settings left as None are asked for."""
+    # 1. Setup Configuration
+    if file_name is None:
+        file_name = ask("Enter name for sprite file (e.g. hs-icons-masks): ", "hs-icons-masks")
+    if standalone is None:
+        standalone = confirm("Also write standalone SVGs per icon to dist/icons? (y/N): ")
+    
+    full_file_name = f"{file_name}.svg"
+    output_folder = "dist"
+    input_base_dir = "svg" 
     
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    if not os.path.exists(input_base_dir):
+        sys.exit(f"Error: Folder '{input_base_dir}' not found.")
+
+    sprite_path = os.path.join(output_folder, full_file_name)
+    previous_sprite = None
+    if os.path.exists(sprite_path):
+        with open(sprite_path, "rb") as f:
+            previous_sprite = f.read()
+
+    try:
+        sprite_bytes, config, standalone_files = build_sprite(iter_source_files(input_base_dir), file_name, standalone, canonical)
+    except ValueError as e:  # e.g. two sources with the same icon id
+        sys.exit(f"❌ {e} - sprite not written")
+
+    # Catch asset-weight regressions before they ship (budgets in complexity-budgets.json)
+    if not enforce(sprite_bytes, config):
+        sys.exit("❌ Complexity budgets exceeded - sprite not written")
+
+    # Every id must line up across the sprite, the config and the Tag Manager's icon-tags.json
+    tags_path = os.path.join(output_folder, "icon-tags.json")
+    if not consistency_check.gate(io.BytesIO(sprite_bytes), config, tags_path):
+        sys.exit("❌ Sprite, config and tags disagree - sprite not written")
+
+    # 4. Save SVG sprite (even if empty, it prevents the JS error)
+    # Written by rename so processes that have the old sprite memory-mapped keep a valid file
+    tmp_path = f"{sprite_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(sprite_bytes)
+    os.replace(tmp_path, sprite_path)
+
+    # Byte offsets of every symbol, for SpriteReader lookups without parsing the sprite
+    write_index(build_index(sprite_bytes, config["spriteVersion"]), index_path_for(sprite_path))
+
+    # Symbol-level delta from the previous build, so embedding pages can patch instead of re-downloading
+    if previous_sprite:
+        write_sprite_delta(previous_sprite, sprite_bytes, file_name, output_folder)
+    
+    if standalone:
+        write_standalone_files(standalone_files, output_folder)
+
+    # "related" ids per icon, from shared tags
+    if os.path.exists(tags_path):
+        if add_related is None:
+            print("ℹ️  Related icons skipped - install scipy (python/requirements.txt)")
+        else:
+            with open(tags_path, "r", encoding="utf-8") as f:
+                count = add_related(config, json.load(f))
+            print(f"✓ Related icons: {count} icons")
+
+    # 5. Save configuration JSON (NO categories in config)
     config_path = os.path.join(output_folder, f"{file_name}-config.json")
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
+    with open(config_path, "wb") as f:
+        f.write(encode_config(config))
     
     print(f"\n✓ Done! Files saved in: {output_folder}")
     print(f"ℹ️  Categories removed - use the Tag Manager to add category tags!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Build the sprite and its config from svg/. Prompts for settings not given.")
+    parser.add_argument("--name", help="sprite file name without .svg, e.g. hs-icons-master")
+    parser.add_argument("--standalone", action="store_true", default=None, help="also write dist/icons/<type>/<id>.<hash>.svg")
+    parser.add_argument("--no-standalone", dest="standalone", action="store_false")
+    parser.add_argument("--canonical", action="store_true",
+                        help="byte-reproducible output: sorted sources, attributes and numbers (see helpers/canonical_xml.py)")
+    args = parser.parse_args()
+    create_gep_sprite_system(args.name, args.standalone, args.canonical)
+
 if __name__ == "__main__":
-    create_gep_sprite_system()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import sys
+import importlib
+import importlib.util
+
+# The helpers import each other by bare name (`from transform_cache import ...`)
+# and several file names contain hyphens, so this package puts its folder on
+# sys.path and maps importable names onto the files:
+#
+#   from gep_icons.helpers import non_scaling_stroke       # non-scaling-stroke.py
+#   from gep_icons.helpers import tag_vocab
+#
+# Modules are loaded on first access and registered under their underscore
+# names, so each file is imported once whichever way it is reached.
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+if HELPERS_DIR not in sys.path:
+    sys.path.insert(0, HELPERS_DIR)
+
+
+def module_name(name):
+    return name.replace("-", "_")
+
+
+def helper_names():
+    """Importable names of every helper module."""
+    return sorted(module_name(f[:-3]) for f in os.listdir(HELPERS_DIR)
+                  if f.endswith(".py") and not f.startswith("__"))
+
+
+def load(name):
+    """Imports a helper by file name or importable name ('non-scaling-stroke' or 'non_scaling_stroke')."""
+    importable = module_name(name)
+    if importable in sys.modules:
+        return sys.modules[importable]
+    for filename in os.listdir(HELPERS_DIR):
+        if filename.endswith(".py") and module_name(filename[:-3]) == importable:
+            break
+    else:
+        raise ImportError(f"No helper '{name}' in {HELPERS_DIR}")
+    if filename[:-3] == importable:
+        return importlib.import_module(importable)
+    spec = importlib.util.spec_from_file_location(importable, os.path.join(HELPERS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[importable] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[importable]
+        raise
+    return module
+
+
+def __getattr__(name):
+    if name.startswith("__") or name not in helper_names():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load(name)
@@ -0,0 +1,246 @@
+import os
+import re
+import sys
+import json
+import random
+import hashlib
+import argparse
+import subprocess
+import importlib.util
+from decimal import Decimal, InvalidOperation
+from xml.etree import ElementTree as ET
+
+from svg_geometry import NUMBER_RE, COMMAND_RE
+
+# Canonical SVG serialization, so the same sources always give the same bytes.
+#
+# generate.py --canonical (and "canonical": true on the pipeline's sprite stage)
+# sorts the source files and passes every icon through canonicalize():
+#   - attributes sorted by name on every element
+#   - numbers rewritten in one form ("120.000" -> "120", "0.50" -> ".5", "-0" -> "0")
+#     and path data re-emitted with single spaces ("M 1,2 L 3,4" -> "M1 2L3 4")
+#   - whitespace-only text between elements dropped (kept inside <text>)
+# serialize() then writes with fixed namespace prefixes, whatever prefixes other
+# code registered with ElementTree.
+#
+#   python canonical_xml.py check              build twice in fresh interpreters and compare
+#   python canonical_xml.py check --save build-digests.json
+#   python canonical_xml.py check --expect build-digests.json      (digests from another machine)
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATE = os.path.join(os.path.dirname(HELPERS_DIR), "generate.py")
+
+SVG_NS = "http://www.w3.org/2000/svg"
+PREFIXES = {
+    "": SVG_NS,
+    "xlink": "http://www.w3.org/1999/xlink",
+    "sodipodi": "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "inkscape": "http://www.inkscape.org/namespaces/inkscape",
+}
+
+# Attributes whose values are numbers or lists of numbers
+NUMERIC_ATTRS = {
+    "points", "viewBox", "transform", "gradientTransform", "patternTransform",
+    "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "fx", "fy", "width", "height",
+    "offset", "opacity", "fill-opacity", "stroke-opacity", "stop-opacity",
+    "stroke-width", "stroke-miterlimit", "stroke-dasharray", "stroke-dashoffset",
+}
+
+# Text content matters inside these elements
+TEXT_TAGS = {"text", "tspan", "textPath", "style", "title", "desc"}
+
+
+def local_name(tag):
+    return tag.split("}", 1)[1] if "}" in tag else tag
+
+
+def format_number(token):
+    """One spelling per value, without changing it: no trailing zeros, no leading zero, no exponent."""
+    try:
+        value = Decimal(token)
+    except InvalidOperation:
+        return token
+    if value == 0:
+        return "0"
+    text = format(value.normalize(), "f")
+    if len(text) > len(token) + 8:  # 1e30 and the like stay short
+        return token
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return text
+
+
+def format_numbers(value):
+    """Rewrites every number in a list-like attribute, collapsing whitespace."""
+    def replace(match):
+        number = format_number(match.group())
+        # "1.0.5" is two numbers; once the first loses its ".0" they need a separator
+        before = value[match.start() - 1] if match.start() else ""
+        if number[0] in ".0123456789" and (before.isdigit() or before == "."):
+            number = " " + number
+        return number
+    return re.sub(r"\s+", " ", NUMBER_RE.sub(replace, value)).strip()
+
+
+def format_path(d):
+    """Path data as command letters followed by space-separated numbers. Returns d unchanged if it cannot be read."""
+    parts = []
+    pos, length = 0, len(d)
+    command = None
+    arg_index = 0
+    while pos < length:
+        ch = d[pos]
+        if ch in " \t\r\n,":
+            pos += 1
+            continue
+        if COMMAND_RE.match(ch):
+            command = ch
+            arg_index = 0
+            parts.append(ch)
+            pos += 1
+            continue
+        # Arc flags (4th and 5th argument of each 7) are single characters, as in svg_geometry.tokenize_path
+        if command in ("A", "a") and arg_index % 7 in (3, 4) and ch in "01":
+            number = ch
+            pos += 1
+        else:
+            match = NUMBER_RE.match(d, pos)
+            if not match:
+                return d
+            number = format_number(match.group())
+            pos = match.end()
+        if parts and not COMMAND_RE.fullmatch(parts[-1]) and not number.startswith("-"):
+            parts.append(" ")
+        parts.append(number)
+        arg_index += 1
+    return "".join(parts)
+
+
+def canonicalize(element, in_text=False):
+    """Sorts attributes, normalizes numbers and drops formatting whitespace, in place, for the whole subtree."""
+    in_text = in_text or local_name(element.tag) in TEXT_TAGS
+    attrib = {}
+    for name, value in sorted(element.attrib.items()):
+        local = local_name(name)
+        if local == "d":
+            value = format_path(value)
+        elif local in NUMERIC_ATTRS:
+            value = format_numbers(value)
+        attrib[name] = value
+    element.attrib.clear()
+    element.attrib.update(attrib)
+    if not in_text:
+        if element.text and not element.text.strip():
+            element.text = None
+        for child in element:
+            if child.tail and not child.tail.strip():
+                child.tail = None
+    for child in element:
+        canonicalize(child, in_text)
+    return element
+
+
+def serialize(element, xml_declaration=True):
+    """Bytes with the prefixes in PREFIXES; other namespaces get ns0, ns1... in document order."""
+    for prefix, uri in PREFIXES.items():
+        ET.register_namespace(prefix, uri)
+    return ET.tostring(element, encoding="utf-8", xml_declaration=xml_declaration)
+
+
+def load_generate():
+    spec = importlib.util.spec_from_file_location("generate", GENERATE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_digests(svg_dir, name, shuffle=None):
+    """
+    Builds the sprite canonically in memory and returns the digests of everything
+    it produces. With `shuffle`, the sources are read in a random order and an
+    unrelated prefix is registered for the SVG namespace first, as a different
+    machine or an earlier helper might.
+    """
+    generate = load_generate()
+    sources = []
+    for folder_name, svg_file, path in generate.iter_source_files(svg_dir):
+        with open(path, "rb") as f:
+            sources.append((folder_name, svg_file, f.read()))
+    if shuffle is not None:
+        random.Random(shuffle).shuffle(sources)
+        ET.register_namespace("svg", SVG_NS)
+
+    sprite_bytes, config, standalone_files = generate.build_sprite(
+        [(folder, filename, generate.io.BytesIO(data)) for folder, filename, data in sources],
+        name, standalone=True, canonical=True)
+    return {
+        "sources": len(sources),
+        "sprite": sha256(sprite_bytes),
+        "config": sha256(generate.encode_config(config)),
+        "spriteVersion": config["spriteVersion"],
+        "standalone": sha256(json.dumps(sorted((p, sha256(d)) for p, d in standalone_files.items())).encode("utf-8")),
+    }
+
+
+def run_digest(svg_dir, name, hash_seed, shuffle=None):
+    """build_digests in a fresh interpreter (its own hash seed and ElementTree state)."""
+    command = [sys.executable, os.path.abspath(__file__), "digest", "--svg-dir", svg_dir, "--name", name]
+    if shuffle is not None:
+        command += ["--shuffle", str(shuffle)]
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"❌ Build failed:\n{result.stderr}")
+    # The build prints progress; the digests are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(label_a, a, label_b, b):
+    mismatches = [key for key in ("sprite", "config", "spriteVersion", "standalone") if a.get(key) != b.get(key)]
+    for key in mismatches:
+        print(f"❌ {key} differs: {label_a} {a.get(key)} / {label_b} {b.get(key)}")
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that canonical builds are byte-reproducible.")
+    parser.add_argument("command", choices=["check", "digest"], nargs="?", default="check")
+    parser.add_argument("--svg-dir", default="svg")
+    parser.add_argument("--name", default="hs-icons-master")
+    parser.add_argument("--shuffle", type=int, help="digest: read the sources in a random order (seed)")
+    parser.add_argument("--save", help="check: write the digests to compare on another machine")
+    parser.add_argument("--expect", help="check: digests saved on another machine")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.svg_dir):
+        sys.exit(f"❌ Folder not found: {args.svg_dir}")
+    if args.command == "digest":
+        print(json.dumps(build_digests(args.svg_dir, args.name, args.shuffle), sort_keys=True))
+        return
+
+    first = run_digest(args.svg_dir, args.name, hash_seed=0)
+    second = run_digest(args.svg_dir, args.name, hash_seed=12345, shuffle=1)
+    print(f"\n🔁 {first['sources']} sources built twice (different hash seeds, source order and namespace prefixes)")
+    ok = compare("first", first, "second", second)
+    if args.expect:
+        with open(args.expect, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        ok = compare(args.expect, expected, "this machine", first) and ok
+    if not ok:
+        sys.exit(1)
+    print(f"✓ Identical: sprite {first['sprite'][:12]}, config {first['config'][:12]}, "
+          f"version {first['spriteVersion']}, standalone {first['standalone'][:12]}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(first, f, indent=2, sort_keys=True)
+        print(f"ℹ️  Digests saved: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
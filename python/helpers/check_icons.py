@@ -1,4 +1,5 @@
 import os
+import argparse
 import shutil
 from xml.etree import ElementTree as ET
 
@@ -28,6 +29,7 @@ def has_stroke(filepath):
         return False
 
 def main():
+    argparse.ArgumentParser(description="Sort the SVGs in the current folder into Sorted_Icons/Fill_Only and Has_Strokes.").parse_args()
     source_dir = "."
     target_dir = "Sorted_Icons"
     fill_dir = os.path.join(target_dir, "Fill_Only")
@@ -0,0 +1,329 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import importlib.util
+from collections import Counter
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+# Which colors every source SVG actually uses, compared with the GEP palette.
+#
+# Fill, stroke and stop-color values are collected from attributes, style
+# attributes and <style> blocks, normalized to #RRGGBB, and every distinct
+# color is matched to its nearest COLOR_MAP entry (generate.py) by CIEDE2000
+# distance in one vectorized pass. The index is kept between runs and files
+# whose content did not change are not parsed again.
+#
+#   python color_usage.py                      svg/* -> dist/color-usage.json
+#   python color_usage.py --list off           files with off-brand colors
+#
+# File status, best to worst:
+#   themeable   only currentColor / none (recolored through CSS)
+#   brand       every color within BRAND_DELTA of a palette color
+#   near        a color within NEAR_DELTA (probably meant to be a palette color)
+#   off         a color further away, or a value that is not a color
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATE = os.path.join(PYTHON_DIR, "generate.py")
+PIPELINE_DEPENDS = [GENERATE]
+DEFAULT_FOLDERS = ["svg/pictographs", "svg/ui icons", "svg/wireblocks", "svg/non-scaling"]
+DEFAULT_OUTPUT = "color-usage.json"
+
+# CIEDE2000: ~1 is the smallest visible difference
+BRAND_DELTA = 1.0
+NEAR_DELTA = 5.0
+
+STATUSES = ("themeable", "brand", "near", "off")
+# Files a currentColor recolor pass can leave alone; "brand" files still have
+# literal palette hex that the pass rewrites
+CSS_READY = {"themeable"}
+
+COLOR_PROPS = ("fill", "stroke", "stop-color")
+KEYWORDS = {"none": "none", "currentcolor": "currentColor", "transparent": "transparent", "inherit": "inherit"}
+NAMED_COLORS = {
+    "black": "#000000", "white": "#FFFFFF", "red": "#FF0000", "green": "#008000", "blue": "#0000FF",
+    "gray": "#808080", "grey": "#808080", "silver": "#C0C0C0", "maroon": "#800000", "navy": "#000080",
+    "teal": "#008080", "purple": "#800080", "orange": "#FFA500", "yellow": "#FFFF00", "lime": "#00FF00",
+    "aqua": "#00FFFF", "cyan": "#00FFFF", "fuchsia": "#FF00FF", "magenta": "#FF00FF", "olive": "#808000",
+}
+
+HEX_RE = re.compile(r"#([0-9a-f]{3,4}|[0-9a-f]{6}|[0-9a-f]{8})$")
+RGB_RE = re.compile(r"rgba?\(\s*([\d.]+%?)\s*[, ]\s*([\d.]+%?)\s*[, ]\s*([\d.]+%?)")
+CSS_COLOR_RE = re.compile(r"(?<![\w-])(fill|stroke|stop-color)\s*:\s*([^;}!]+)")
+
+_palette = None
+
+
+def normalize_color(value):
+    """'#0072bc', '#07b', 'rgb(0,114,188)', 'navy' -> '#RRGGBB'; keywords -> their name; None if invalid."""
+    value = value.strip().lower()
+    if value in KEYWORDS:
+        return KEYWORDS[value]
+    if value.startswith("url("):
+        return "url"
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+    match = HEX_RE.match(value)
+    if match:
+        digits = match.group(1)
+        if len(digits) in (3, 4):
+            digits = "".join(c * 2 for c in digits)
+        return "#" + digits[:6].upper()
+    match = RGB_RE.match(value)
+    if match:
+        channels = [min(255, round(float(c[:-1]) * 255 / 100) if c.endswith("%") else round(float(c)))
+                    for c in match.groups()]
+        return "#" + "".join(f"{c:02X}" for c in channels)
+    return None
+
+
+def extract_colors(data):
+    """
+    {normalized color: {property: count}} and the invalid raw values for one SVG.
+    Reads attributes, style="" and <style> blocks.
+    """
+    found, invalid = {}, []
+
+    def add(prop, raw):
+        color = normalize_color(raw)
+        if color is None:
+            invalid.append(raw.strip())
+            return
+        counts = found.setdefault(color, {})
+        counts[prop] = counts.get(prop, 0) + 1
+
+    for el in ET.fromstring(data).iter():
+        if el.tag.rpartition("}")[2] == "style":
+            for prop, raw in CSS_COLOR_RE.findall(el.text or ""):
+                add(prop, raw)
+            continue
+        for prop in COLOR_PROPS:
+            if prop in el.attrib:
+                add(prop, el.attrib[prop])
+        if "style" in el.attrib:
+            for prop, raw in CSS_COLOR_RE.findall(el.attrib["style"]):
+                add(prop, raw)
+    return found, invalid
+
+
+def load_palette():
+    """{"#RRGGBB": name} from generate.COLOR_MAP (the first name wins for repeated colors)."""
+    global _palette
+    if _palette is None:
+        spec = importlib.util.spec_from_file_location("generate_palette", GENERATE)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _palette = {}
+        for group in module.COLOR_MAP.values():
+            for name, hex_value in group.items():
+                _palette.setdefault(normalize_color(hex_value), name)
+    return _palette
+
+
+def hex_to_lab(hex_colors):
+    """(N,) '#RRGGBB' -> (N, 3) CIELAB (D65)."""
+    rgb = np.array([[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in hex_colors], dtype=float).reshape(-1, 3) / 255
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.array([[0.4124564, 0.2126729, 0.0193339],
+                             [0.3575761, 0.7151522, 0.1191920],
+                             [0.1804375, 0.0721750, 0.9503041]])
+    xyz /= np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def ciede2000(lab1, lab2):
+    """CIEDE2000 difference between every row of lab1 (N, 3) and lab2 (M, 3) -> (N, M)."""
+    L1, a1, b1 = (lab1[:, None, i] for i in range(3))
+    L2, a2, b2 = (lab2[None, :, i] for i in range(3))
+
+    c_mean = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c_mean ** 7 / (c_mean ** 7 + 25.0 ** 7)))
+    a1p, a2p = a1 * (1 + g), a2 * (1 + g)
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dl = L2 - L1
+    dc = c2p - c1p
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(c1p * c2p == 0, 0, dh)
+    dH = 2 * np.sqrt(c1p * c2p) * np.sin(np.radians(dh / 2))
+
+    l_mean = (L1 + L2) / 2
+    cp_mean = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_mean = np.where(np.abs(h1p - h2p) > 180, np.where(h_sum < 360, h_sum + 360, h_sum - 360), h_sum) / 2
+    h_mean = np.where(c1p * c2p == 0, h_sum, h_mean)
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30)) + 0.24 * np.cos(np.radians(2 * h_mean))
+         + 0.32 * np.cos(np.radians(3 * h_mean + 6)) - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / np.sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * cp_mean
+    sh = 1 + 0.015 * cp_mean * t
+    rt = (-2 * np.sqrt(cp_mean ** 7 / (cp_mean ** 7 + 25.0 ** 7))
+          * np.sin(np.radians(60 * np.exp(-(((h_mean - 275) / 25) ** 2)))))
+    return np.sqrt((dl / sl) ** 2 + (dc / sc) ** 2 + (dH / sh) ** 2 + rt * (dc / sc) * (dH / sh))
+
+
+def match_palette(colors, palette):
+    """{color: {"nearest", "nearestHex", "deltaE", "status"}} for '#RRGGBB' colors, all in one pass."""
+    colors = sorted(colors)
+    if not colors:
+        return {}
+    palette_hex = list(palette)
+    distances = ciede2000(hex_to_lab(colors), hex_to_lab(palette_hex))
+    nearest = distances.argmin(axis=1)
+    best = distances[np.arange(len(colors)), nearest]
+    matches = {}
+    for color, index, delta in zip(colors, nearest, best):
+        status = "brand" if delta <= BRAND_DELTA else "near" if delta <= NEAR_DELTA else "off"
+        matches[color] = {"nearest": palette[palette_hex[index]], "nearestHex": palette_hex[index],
+                          "deltaE": round(float(delta), 2), "status": status}
+    return matches
+
+
+def file_status(entry, matches):
+    if entry["invalid"]:
+        return "off"
+    statuses = [matches[c]["status"] for c in entry["colors"] if c.startswith("#")]
+    return max(statuses, key=STATUSES.index) if statuses else "themeable"
+
+
+def build_index(files, previous=None, palette=None):
+    """
+    files: {name: (svg bytes, folder or None)}. Entries from `previous` are reused
+    for unchanged content. Returns (index document, number of files parsed).
+    """
+    palette = palette or load_palette()
+    old = (previous or {}).get("files", {})
+    entries, parsed = {}, 0
+    for name in sorted(files):
+        data, folder = files[name]
+        digest = hashlib.sha256(data).hexdigest()
+        if name in old and old[name].get("sha256") == digest:
+            entry = dict(old[name])
+        else:
+            try:
+                colors, invalid = extract_colors(data)
+            except ET.ParseError as e:
+                print(f"  Skipped: {name} ({e})")
+                continue
+            entry = {"sha256": digest, "colors": colors, "invalid": invalid}
+            parsed += 1
+        if folder:
+            entry["folder"] = folder
+        entries[name] = entry
+
+    matches = match_palette({c for e in entries.values() for c in e["colors"] if c.startswith("#")}, palette)
+    usage = Counter()
+    for entry in entries.values():
+        entry["status"] = file_status(entry, matches)
+        usage.update(c for c in entry["colors"] if c.startswith("#"))
+    for color, match in matches.items():
+        match["files"] = usage[color]
+
+    index = {
+        "palette": dict(sorted((name, hex_value) for hex_value, name in palette.items())),
+        "thresholds": {"brand": BRAND_DELTA, "near": NEAR_DELTA},
+        "summary": dict(Counter(e["status"] for e in entries.values())),
+        "colors": matches,
+        "files": entries,
+    }
+    return index, parsed
+
+
+def load_index(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compliant(index, name, data=None, statuses=CSS_READY):
+    """
+    True when the index lists `name` with one of `statuses`, so a recolor pass
+    can skip it. Given the file's bytes, the entry must also be for that content.
+    """
+    entry = (index or {}).get("files", {}).get(name)
+    if entry is None or entry["status"] not in statuses:
+        return False
+    return data is None or entry.get("sha256") == hashlib.sha256(data).hexdigest()
+
+
+def encode(index):
+    return json.dumps(index, indent=1, sort_keys=True).encode("utf-8")
+
+
+def print_report(index, parsed=None, top=10):
+    files = index["files"]
+    summary = ", ".join(f"{index['summary'].get(s, 0)} {s}" for s in STATUSES)
+    reparsed = f" ({parsed} parsed, {len(files) - parsed} unchanged)" if parsed is not None else ""
+    print(f"\n🎨 {len(files)} files{reparsed}: {summary}")
+    print(f"   {len(index['colors'])} distinct colors")
+    flagged = [(c, m) for c, m in index["colors"].items() if m["status"] != "brand"]
+    flagged.sort(key=lambda item: (-item[1]["files"], -item[1]["deltaE"]))
+    for color, match in flagged[:top]:
+        symbol = "⚠️ " if match["status"] == "near" else "❌"
+        print(f"   {symbol} {color} in {match['files']} files: nearest {match['nearest']} "
+              f"{match['nearestHex']} (ΔE {match['deltaE']})")
+    invalid = Counter(v for e in files.values() for v in e["invalid"])
+    for value, count in invalid.most_common(top):
+        print(f"   ❌ '{value}' is not a color ({count}x)")
+
+
+def build_color_index(files, output=DEFAULT_OUTPUT):
+    """Pipeline entry point: {filename: svg bytes} -> {output: index bytes}."""
+    index, parsed = build_index({name: (data, None) for name, data in files.items()})
+    print_report(index, parsed)
+    return {output: encode(index)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the colors used by every source SVG against the GEP palette.")
+    parser.add_argument("folders", nargs="*", default=DEFAULT_FOLDERS)
+    parser.add_argument("-o", "--output", default=os.path.join("dist", DEFAULT_OUTPUT))
+    parser.add_argument("--list", nargs="+", choices=STATUSES, metavar="STATUS",
+                        help="print the files with these statuses (themeable, brand, near, off)")
+    parser.add_argument("--strict", action="store_true", help="exit with an error when a file is off-brand")
+    args = parser.parse_args()
+
+    files = {}
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            sys.exit(f"❌ Folder not found: {folder}")
+        for filename in os.listdir(folder):
+            if filename.lower().endswith(".svg"):
+                with open(os.path.join(folder, filename), "rb") as f:
+                    files[filename] = (f.read(), folder)
+
+    index, parsed = build_index(files, load_index(args.output))
+    encoded = encode(index)
+    print_report(index, parsed)
+    try:
+        with open(args.output, "rb") as f:
+            unchanged = f.read() == encoded
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "wb") as f:
+            f.write(encoded)
+    print(f"✓ Index: {args.output}" + (" (unchanged)" if unchanged else ""))
+
+    if args.list:
+        for name, entry in index["files"].items():
+            if entry["status"] in args.list:
+                colors = ", ".join(c for c in entry["colors"] if c.startswith("#")) or "-"
+                print(f"   {entry['status']:<9} {os.path.join(entry.get('folder', ''), name)}  {colors}")
+    if args.strict and index["summary"].get("off"):
+        sys.exit(f"❌ {index['summary']['off']} files use off-brand colors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import argparse
+from xml.etree import ElementTree as ET
+
+from svg_geometry import local_name, tokenize_path, SHAPE_TAGS
+from canonical_xml import serialize
+
+# Per-symbol weight checks for the sprite: element count, path commands and bytes,
+# compared against budgets per asset type from python/complexity-budgets.json.
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGETS = os.path.join(PYTHON_DIR, "complexity-budgets.json")
+
+# Arguments per path command; implicit repeats count as extra commands
+PATH_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+METRICS = ("elements", "path_commands", "bytes")
+
+
+def count_path_commands(d):
+    try:
+        tokens = tokenize_path(d or "")
+    except ValueError:
+        return 0
+    count, command, args = 0, None, 0
+
+    def flush():
+        if command is None:
+            return 0
+        arity = PATH_ARITY[command.upper()]
+        return 1 if arity == 0 else max(1, args // arity)
+
+    for token in tokens:
+        if isinstance(token, str):
+            count += flush()
+            command, args = token, 0
+        else:
+            args += 1
+    return count + flush()
+
+
+def measure_symbol(symbol):
+    elements = 0
+    path_commands = 0
+    for el in symbol.iter():
+        tag = local_name(el.tag)
+        if tag in SHAPE_TAGS:
+            elements += 1
+        if tag == "path":
+            path_commands += count_path_commands(el.get("d"))
+    return {
+        "elements": elements,
+        "path_commands": path_commands,
+        # Fixed prefixes (SVG as the default namespace), whatever other code registered
+        "bytes": len(serialize(symbol, xml_declaration=False)),
+    }
+
+
+def load_budgets(path=DEFAULT_BUDGETS):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_sprite(sprite_bytes, config, budgets):
+    """
+    Measures every symbol and compares it to the budget for its asset type.
+    Returns (rows sorted heaviest first, violations).
+    """
+    types = {icon["id"]: icon.get("type", "general") for icon in config.get("icons", [])}
+    limits = budgets.get("budgets", {})
+    default = limits.get("default", {})
+
+    rows, violations = [], []
+    root = ET.fromstring(sprite_bytes)
+    for symbol in root:
+        if local_name(symbol.tag) != "symbol":
+            continue
+        icon_id = symbol.get("id")
+        asset_type = types.get(icon_id, "general")
+        row = {"id": icon_id, "type": asset_type, **measure_symbol(symbol)}
+        budget = limits.get(asset_type, default)
+        row["over"] = [m for m in METRICS if m in budget and row[m] > budget[m]]
+        for metric in row["over"]:
+            violations.append({"id": icon_id, "type": asset_type, "metric": metric,
+                               "value": row[metric], "budget": budget[metric]})
+        rows.append(row)
+
+    # Heaviest first: bytes dominate transfer size, path commands dominate paint cost
+    rows.sort(key=lambda r: (r["bytes"], r["path_commands"], r["elements"]), reverse=True)
+    return rows, violations
+
+
+def summarize_by_type(rows):
+    summary = {}
+    for row in rows:
+        s = summary.setdefault(row["type"], {"icons": 0, "bytes": 0, "path_commands": 0, "elements": 0})
+        s["icons"] += 1
+        for metric in METRICS:
+            s[metric] += row[metric]
+    return summary
+
+
+def write_report(path, rows, violations, budgets, sprite_name):
+    report = {
+        "sprite": sprite_name,
+        "totals": {m: sum(r[m] for r in rows) for m in METRICS},
+        "byType": summarize_by_type(rows),
+        "budgets": budgets.get("budgets", {}),
+        "violations": violations,
+        "ranking": rows,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def enforce(sprite_bytes, config, budgets_path=DEFAULT_BUDGETS, mode=None):
+    """
+    Runs the check, prints the heaviest icons and violations and writes the report.
+    Returns False when mode is "fail" and a budget was exceeded.
+    """
+    budgets = load_budgets(budgets_path)
+    mode = mode or budgets.get("mode", "warn")
+    rows, violations = check_sprite(sprite_bytes, config, budgets)
+
+    report_path = budgets.get("report")
+    if report_path:
+        write_report(report_path, rows, violations, budgets, config.get("spriteName"))
+
+    top = budgets.get("top", 10)
+    print(f"\n📊 Heaviest icons (of {len(rows)}):")
+    for row in rows[:top]:
+        flag = " ⚠️" if row["over"] else ""
+        print(f"   {row['bytes']:>7} B  {row['path_commands']:>4} cmds  {row['elements']:>3} els  {row['id']} ({row['type']}){flag}")
+
+    if violations:
+        symbol = "❌" if mode == "fail" else "⚠️ "
+        print(f"\n{symbol} {len(violations)} budget violation(s):")
+        for v in violations:
+            print(f"   {v['id']} ({v['type']}): {v['metric']} {v['value']} > {v['budget']}")
+    else:
+        print("\n✓ All icons within complexity budgets")
+    if report_path:
+        print(f"ℹ️  Full ranking: {report_path}")
+
+    return not (violations and mode == "fail")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check sprite symbols against complexity budgets.")
+    parser.add_argument("sprite", help="sprite SVG, e.g. dist/hs-icons-master.svg")
+    parser.add_argument("--config", help="sprite config JSON (default: <sprite>-config.json)")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS)
+    parser.add_argument("--mode", choices=["warn", "fail"])
+    args = parser.parse_args()
+
+    config_path = args.config or f"{os.path.splitext(args.sprite)[0]}-config.json"
+    with open(args.sprite, "rb") as f:
+        sprite_bytes = f.read()
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    if not enforce(sprite_bytes, config, args.budgets, args.mode):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
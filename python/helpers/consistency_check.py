@@ -0,0 +1,184 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from xml.etree import ElementTree as ET
+
+# Cross-checks the sprite, its config and icon-tags.json, which are edited by
+# different tools and drift apart (see the copies in zbackup/).
+#
+# The sprite is streamed with iterparse (only symbol ids and viewBoxes are
+# kept), each source becomes one dict/set keyed by icon id, and the checks are
+# set lookups over those indexes, so a full library takes a few milliseconds.
+#
+#   python consistency_check.py                  dist/hs-icons-master.svg, -config.json, icon-tags.json
+#   python consistency_check.py zbackup          the same files in another folder
+#
+# Errors: duplicate ids, config icons missing from the sprite (and the reverse),
+# viewBox mismatches.
+# Warnings: icons without tags, tags for icons that no longer exist (deleting an
+# icon must not break the build; --strict fails on them).
+
+DEFAULT_DIR = "dist"
+DEFAULT_SPRITE = "hs-icons-master"
+
+# Backgrounds are listed in the config but live outside the sprite and are not tagged
+UNSPRITED_TYPES = {"background"}
+UNTAGGED_TYPES = {"background"}
+
+
+def sprite_symbols(source):
+    """
+    [(id, viewBox)] for every top-level <symbol>, in document order.
+    `source` is a path or a binary file-like object.
+    """
+    symbols = []
+    depth = 0
+    for event, el in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and el.tag.rpartition("}")[2] == "symbol":
+            symbols.append((el.get("id"), el.get("viewBox")))
+            el.clear()
+    return symbols
+
+
+def load_tags(path):
+    """icon-tags.json as {id: {"tags", "categories"}}; the old {"tags": {id: [tags]}} layout is converted."""
+    with open(path, "r", encoding="utf-8") as f:
+        icon_tags = json.load(f)
+    if isinstance(icon_tags.get("tags"), dict) and "metadata" in icon_tags:
+        print(f"ℹ️  {path} uses the old tag format (see convert-tags-format.py)")
+        return {icon_id: {"tags": tags, "categories": []} for icon_id, tags in icon_tags["tags"].items()}
+    return icon_tags
+
+
+def same_viewbox(a, b):
+    if a == b:
+        return True
+    try:
+        return [float(v) for v in a.replace(",", " ").split()] == [float(v) for v in b.replace(",", " ").split()]
+    except (AttributeError, ValueError):
+        return False
+
+
+def check(symbols, config, icon_tags=None):
+    """
+    Joins sprite symbols, config icons and (optionally) icon-tags.json by id.
+    Returns {"errors": [(kind, id, detail)], "warnings": [...], "counts": {...}}.
+    """
+    errors, warnings = [], []
+
+    sprite = {}
+    for icon_id, view_box in symbols:
+        if not icon_id:
+            errors.append(("symbol-without-id", "", f"viewBox {view_box}"))
+        elif icon_id in sprite:
+            errors.append(("duplicate-id", icon_id, "sprite"))
+        else:
+            sprite[icon_id] = view_box
+
+    icons = {}
+    for icon in config.get("icons", []):
+        icon_id = icon.get("id")
+        if icon_id in icons:
+            errors.append(("duplicate-id", icon_id, "config"))
+        else:
+            icons[icon_id] = icon
+
+    for icon_id, icon in icons.items():
+        if icon.get("type") in UNSPRITED_TYPES:
+            continue
+        if icon_id not in sprite:
+            errors.append(("missing-from-sprite", icon_id, icon.get("type")))
+        elif not same_viewbox(sprite[icon_id], icon.get("viewBox")):
+            errors.append(("viewbox-mismatch", icon_id, f"sprite {sprite[icon_id]} / config {icon.get('viewBox')}"))
+
+    for icon_id in sprite.keys() - icons.keys():
+        errors.append(("missing-from-config", icon_id, "sprite symbol"))
+
+    if icon_tags is not None:
+        for icon_id in icon_tags.keys() - icons.keys():
+            warnings.append(("orphan-tags", icon_id, f"{len(icon_tags[icon_id].get('tags', []))} tags"))
+        for icon_id, icon in icons.items():
+            if icon.get("type") not in UNTAGGED_TYPES and not icon_tags.get(icon_id, {}).get("tags"):
+                warnings.append(("missing-tags", icon_id, icon.get("type")))
+
+    counts = {"symbols": len(symbols), "icons": len(config.get("icons", [])),
+              "tagged": len(icon_tags) if icon_tags is not None else None}
+    return {"errors": sorted(errors), "warnings": sorted(warnings), "counts": counts}
+
+
+def print_report(report, limit=20):
+    counts = report["counts"]
+    tagged = f", {counts['tagged']} tagged" if counts["tagged"] is not None else ""
+    print(f"\n🔗 Consistency: {counts['symbols']} symbols, {counts['icons']} config icons{tagged}")
+    for symbol, label, issues in (("❌", "error", report["errors"]), ("⚠️ ", "warning", report["warnings"])):
+        if not issues:
+            continue
+        print(f"{symbol} {len(issues)} {label}(s):")
+        for kind, total in sorted(Counter(kind for kind, _, _ in issues).items()):
+            print(f"   {kind}: {total}")
+        for kind, icon_id, detail in issues[:limit]:
+            print(f"   {kind}: {icon_id} ({detail})")
+        if len(issues) > limit:
+            print(f"   ... {len(issues) - limit} more")
+    if not report["errors"] and not report["warnings"]:
+        print("✓ Sprite, config and tags agree")
+
+
+def gate(sprite_source, config, tags_path):
+    """
+    Build hook: checks a freshly built sprite and config against icon-tags.json
+    (when it exists). Prints the report and returns False on errors.
+    """
+    icon_tags = load_tags(tags_path) if tags_path and os.path.exists(tags_path) else None
+    report = check(sprite_symbols(sprite_source), config, icon_tags)
+    print_report(report)
+    return not report["errors"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the sprite, its config and icon-tags.json agree.")
+    parser.add_argument("folder", nargs="?", default=DEFAULT_DIR, help="folder with the three files (default: dist)")
+    parser.add_argument("--sprite", default=DEFAULT_SPRITE, help="sprite name")
+    parser.add_argument("--tags", help="icon-tags.json (default: <folder>/icon-tags.json)")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    parser.add_argument("--json", help="write the report as JSON")
+    args = parser.parse_args()
+
+    sprite_path = os.path.join(args.folder, f"{args.sprite}.svg")
+    config_path = os.path.join(args.folder, f"{args.sprite}-config.json")
+    tags_path = args.tags or os.path.join(args.folder, "icon-tags.json")
+    for path in (sprite_path, config_path):
+        if not os.path.exists(path):
+            sys.exit(f"❌ {path} not found")
+
+    start = time.perf_counter()
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    icon_tags = None
+    if os.path.exists(tags_path):
+        icon_tags = load_tags(tags_path)
+    else:
+        print(f"ℹ️  {tags_path} not found - tags not checked")
+    report = check(sprite_symbols(sprite_path), config, icon_tags)
+    elapsed = time.perf_counter() - start
+
+    print_report(report)
+    print(f"ℹ️  Checked in {elapsed * 1000:.0f} ms")
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"ℹ️  Report: {args.json}")
+    if report["errors"] or (args.strict and report["warnings"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import json
 import sys
 import os
+import argparse
 
-def convert_json_format():
+from prompts import ask, confirm
+
+def convert_json_format(directory=None, input_file=None, output_file=None, create_dir=None, force=None):
     """
     Converts old format:
     {
@@ -30,10 +33,9 @@ def convert_json_format():
     print("=" * 60)
     print()
     
-    # Get directory location
-    directory = input("Enter directory path (e.g., dist, ./dist, or press Enter for current): ").strip()
-    if not directory:
-        directory = "."
+    # Get directory location (every setting left as None is asked for)
+    if directory is None:
+        directory = ask("Enter directory path (e.g., dist, ./dist, or press Enter for current): ", ".")
     
     # Normalize path
     directory = os.path.normpath(directory)
@@ -41,8 +43,9 @@ def convert_json_format():
     # Check if directory exists
     if not os.path.exists(directory):
         print(f"❌ Error: Directory '{directory}' does not exist")
-        create_dir = input(f"Create directory '{directory}'? (y/n): ").lower()
-        if create_dir == 'y':
+        if create_dir is None:
+            create_dir = confirm(f"Create directory '{directory}'? (y/n): ")
+        if create_dir:
             os.makedirs(directory)
             print(f"✓ Created directory: {directory}")
         else:
@@ -53,17 +56,15 @@ def convert_json_format():
     print()
     
     # Get input file
-    input_file = input("Enter input JSON filename (e.g., old-tags.json): ").strip()
-    if not input_file:
-        input_file = "icon-tags.json"
+    if input_file is None:
+        input_file = ask("Enter input JSON filename (e.g., old-tags.json): ", "icon-tags.json")
     
     # Build full input path
     input_path = os.path.join(directory, input_file)
     
     # Get output file
-    output_file = input("Enter output JSON filename (e.g., icon-tags-new.json): ").strip()
-    if not output_file:
-        output_file = "icon-tags-converted.json"
+    if output_file is None:
+        output_file = ask("Enter output JSON filename (e.g., icon-tags-new.json): ", "icon-tags-converted.json")
     
     # Build full output path
     output_path = os.path.join(directory, output_file)
@@ -83,8 +84,9 @@ def convert_json_format():
             first_key = next(iter(old_data))
             if isinstance(old_data[first_key], dict) and "tags" in old_data[first_key]:
                 print("⚠️  File appears to already be in new format!")
-                convert_anyway = input("Convert anyway? (y/n): ").lower()
-                if convert_anyway != 'y':
+                if force is None:
+                    force = confirm("Convert anyway? (y/n): ")
+                if not force:
                     print("❌ Conversion cancelled.")
                     return
                 tags_dict = old_data
@@ -149,9 +151,19 @@ def convert_json_format():
     except Exception as e:
         print(f"❌ Error: {str(e)}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Convert old icon tag JSON to the {id: {tags, categories}} format.")
+    parser.add_argument("--dir", help="working directory (prompted when missing)")
+    parser.add_argument("-i", "--input", help="input file name in --dir (default icon-tags.json)")
+    parser.add_argument("-o", "--output", help="output file name in --dir (default icon-tags-converted.json)")
+    parser.add_argument("--create-dir", action="store_true", default=None, help="create --dir if it does not exist")
+    parser.add_argument("--force", action="store_true", default=None, help="convert files already in the new format")
+    args = parser.parse_args()
+    convert_json_format(args.dir, args.input, args.output, args.create_dir, args.force)
+
 if __name__ == "__main__":
     try:
-        convert_json_format()
+        main()
     except KeyboardInterrupt:
         print("\n\n❌ Conversion cancelled by user")
     except Exception as e:
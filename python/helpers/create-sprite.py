@@ -1,11 +1,15 @@
 import os
 import sys
 import json
+import argparse
 from xml.etree import ElementTree as ET
 
-def create_gep_sprite_system():
+from prompts import ask
+
+def create_gep_sprite_system(file_name=None):
     # 1. Setup Configuration
-    file_name = input("Enter name for sprite file (e.g. hs-icons-v3): ").strip() or "hs-icons-v3"
+    if file_name is None:
+        file_name = ask("Enter name for sprite file (e.g. hs-icons-v3): ", "hs-icons-v3")
     
     full_file_name = f"{file_name}.svg"
     output_folder = "dist"
@@ -113,5 +117,11 @@ def create_gep_sprite_system():
     
     print(f"\n✓ Done! Files saved in: {output_folder}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Build a sprite from svg/ (legacy layout with categories in the config).")
+    parser.add_argument("--name", help="sprite file name without .svg (prompted when missing)")
+    args = parser.parse_args()
+    create_gep_sprite_system(args.name)
+
 if __name__ == "__main__":
-    create_gep_sprite_system()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,7 +1,15 @@
 import os
 import sys
+import shutil
+import argparse
 from xml.etree import ElementTree as ET
 
+from transform_cache import cached_transform
+from color_usage import load_index, compliant
+
+# Files with nothing but currentColor/none have no color left for this pass to convert
+SKIP_STATUSES = {"themeable"}
+
 WHITE_VALUES = {
     "white", "#fff", "#ffffff",
     "rgb(255,255,255)", "rgba(255,255,255,1)"
@@ -23,6 +31,7 @@ def is_white_or_transparent(val):
     v = val.lower().replace(" ", "")
     return v in WHITE_VALUES or v in TRANSPARENT_VALUES
 
+@cached_transform("recolor-for-ui")
 def convert_to_css_ready(src, dest):
     ET.register_namespace("", "http://www.w3.org/2000/svg")
 
@@ -74,18 +83,40 @@ def convert_to_css_ready(src, dest):
 
     tree.write(dest, encoding="utf-8", xml_declaration=True)
 
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
 def main():
+    parser = argparse.ArgumentParser(description="Convert every SVG in the current folder to currentColor UI strokes (written to CSS_Ready_Icons/).")
+    parser.add_argument("--colors", metavar="COLOR_USAGE_JSON",
+                        help="color-usage.json from color_usage.py; files that already use only currentColor are copied unchanged (stroke widths included)")
+    args = parser.parse_args()
     svgs = [f for f in os.listdir(".") if f.lower().endswith(".svg")]
     if not svgs:
         sys.exit("No SVG files found.")
 
+    colors = None
+    if args.colors:
+        colors = load_index(args.colors)
+        if colors is None:
+            sys.exit(f"❌ Could not read {args.colors}")
+
     out_dir = "CSS_Ready_Icons"
     os.makedirs(out_dir, exist_ok=True)
 
+    skipped = 0
     for svg_file in svgs:
-        convert_to_css_ready(svg_file, os.path.join(out_dir, svg_file))
+        dest = os.path.join(out_dir, svg_file)
+        if colors is not None and compliant(colors, svg_file, read_bytes(svg_file), SKIP_STATUSES):
+            shutil.copyfile(svg_file, dest)
+            skipped += 1
+            continue
+        convert_to_css_ready(svg_file, dest)
         print(f"Optimized: {svg_file}")
 
+    if skipped:
+        print(f"ℹ️  {skipped} already CSS-ready (copied unchanged)")
     print("\nDone! All icons now use currentColor and 1.5 stroke-width where applicable.")
 
 if __name__ == "__main__":
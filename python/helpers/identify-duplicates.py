@@ -1,12 +1,11 @@
 import os
+import argparse
 import hashlib
 import shutil
 import xml.etree.ElementTree as ET
 
-BASE_FOLDER = os.path.dirname(os.path.abspath(__file__))
-DUPLICATE_FOLDER = os.path.join(BASE_FOLDER, "duplicates")
-
-os.makedirs(DUPLICATE_FOLDER, exist_ok=True)
+BASE_FOLDER = "."
+DUPLICATE_FOLDER = "duplicates"
 
 
 def normalize_svg(path):
@@ -44,19 +43,17 @@ def hash_content(content):
     return hashlib.sha256(content).hexdigest()
 
 
-def find_and_move_duplicates():
+def find_and_move_duplicates(folder=BASE_FOLDER):
+    duplicate_folder = os.path.join(folder, DUPLICATE_FOLDER)
+    os.makedirs(duplicate_folder, exist_ok=True)
     seen_hashes = {}
     moved = []
 
-    for filename in os.listdir(BASE_FOLDER):
+    for filename in sorted(os.listdir(folder)):
         if not filename.lower().endswith(".svg"):
             continue
 
-        src_path = os.path.join(BASE_FOLDER, filename)
-
-        # Skip already-moved files
-        if DUPLICATE_FOLDER in src_path:
-            continue
+        src_path = os.path.join(folder, filename)
 
         normalized = normalize_svg(src_path)
         if not normalized:
@@ -67,7 +64,7 @@ def find_and_move_duplicates():
         if file_hash in seen_hashes:
             original = seen_hashes[file_hash]
 
-            dest_path = os.path.join(DUPLICATE_FOLDER, filename)
+            dest_path = os.path.join(duplicate_folder, filename)
 
             # Prevent overwrite in duplicates folder
             if os.path.exists(dest_path):
@@ -75,7 +72,7 @@ def find_and_move_duplicates():
                 i = 1
                 while os.path.exists(dest_path):
                     dest_path = os.path.join(
-                        DUPLICATE_FOLDER, f"{base}_{i}{ext}"
+                        duplicate_folder, f"{base}_{i}{ext}"
                     )
                     i += 1
 
@@ -88,12 +85,19 @@ def find_and_move_duplicates():
     return moved
 
 
-if __name__ == "__main__":
-    moved_duplicates = find_and_move_duplicates()
+def main():
+    parser = argparse.ArgumentParser(description="Move SVGs with identical content into <folder>/duplicates.")
+    parser.add_argument("folder", nargs="?", default=BASE_FOLDER, help="folder to scan (default: the current folder)")
+    args = parser.parse_args()
+    moved_duplicates = find_and_move_duplicates(args.folder)
 
     if not moved_duplicates:
         print("✅ No duplicate SVGs found.")
     else:
-        print("🗂️ Duplicates moved to ./duplicates/\n")
+        print(f"🗂️ Duplicates moved to {os.path.join(args.folder, DUPLICATE_FOLDER)}\n")
         for dup, original in moved_duplicates:
             print(f"- {dup} → duplicate of {original}")
+
+
+if __name__ == "__main__":
+    main()
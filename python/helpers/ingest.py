@@ -0,0 +1,375 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import queue
+import zipfile
+import argparse
+import threading
+import importlib.util
+from collections import Counter
+from xml.etree import ElementTree as ET
+
+# Adds new icons from zip exports to svg/ without unpacking them first.
+#
+#   python ingest.py drop-2024-05.zip more-icons.zip
+#   python ingest.py drop.zip --dry-run           only report what would be written
+#
+# One thread streams the SVG members out of the archives, a pool of workers
+# normalizes them and a single writer checks for duplicates and writes the
+# accepted files. The queues between them are bounded, so at most a few dozen
+# members are held in memory however large the archives are. Files are written
+# in archive order, which keeps the outcome the same whatever the worker timing.
+#
+# Each member is routed by its file name prefix (or, failing that, by a folder of
+# the same name inside the archive), gets a viewBox instead of fixed dimensions,
+# and is compared to every icon already in svg/ by the content hash that
+# identify-duplicates.py uses. New wireblocks also get their non-scaling-stroke
+# copy in svg/non-scaling, made and named the way the pipeline makes them (paths
+# simplified with the "wireblocks-simplified" tolerance, then non-scaling strokes);
+# that copy gets the same duplicate and --replace checks as the wireblock itself.
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_MANIFEST = os.path.join(os.path.dirname(HELPERS_DIR), "pipeline.json")
+SVG_NS = "http://www.w3.org/2000/svg"
+DEFAULT_SVG_DIR = "svg"
+
+# (file name prefix, svg/ subfolder); the first match wins
+ROUTES = [
+    ("HS_US_EN_Wireblock_non-scaling-stroke-2_", "non-scaling"),
+    ("pictograph_", "pictographs"),
+    ("UI_", "ui icons"),
+    ("wireblock_", "wireblocks"),
+]
+FOLDERS = {folder for _, folder in ROUTES}
+
+# Wireblocks also go to non-scaling/ under this name (see the "non-scaling" stage in pipeline.json)
+NON_SCALING_FROM = ("wireblock_", "HS_US_EN_Wireblock_non-scaling-stroke-2_")
+SIMPLIFY_STAGE = "wireblocks-simplified"
+
+# Members larger than this are rejected without being read
+MAX_MEMBER_BYTES = 5 * 1024 * 1024
+
+# Members waiting for a worker, and results waiting for the writer, per worker
+QUEUE_PER_WORKER = 4
+
+STATUSES = ("added", "replaced", "duplicate", "exists", "invalid", "unrouted", "too-large")
+
+_DONE = object()
+_helpers = {}
+
+
+def load_helper(filename):
+    """A helper with a hyphenated file name (not importable by name)."""
+    if filename not in _helpers:
+        spec = importlib.util.spec_from_file_location(filename.replace("-", "_"), os.path.join(HELPERS_DIR, f"{filename}.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _helpers[filename] = module
+    return _helpers[filename]
+
+
+def route(member):
+    """svg/ subfolder for a zip member path, or None."""
+    parts = member.replace("\\", "/").split("/")
+    for prefix, folder in ROUTES:
+        if parts[-1].startswith(prefix):
+            return folder
+    for part in reversed(parts[:-1]):
+        if part.lower() in FOLDERS:
+            return part.lower()
+    return None
+
+
+def parse_length(value):
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(px)?\s*", value or "")
+    return float(match.group(1)) if match else None
+
+
+def normalize_icon(data):
+    """
+    Source SVG bytes -> normalized bytes: the viewBox is kept (or made from
+    width/height) and the fixed dimensions are dropped. Raises ValueError for
+    files the build could not place.
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise ValueError(f"not well-formed ({e})")
+    if root.tag != f"{{{SVG_NS}}}svg":
+        raise ValueError(f"root element is {root.tag}, not an SVG <svg>")
+    if not root.get("viewBox"):
+        width, height = parse_length(root.get("width")), parse_length(root.get("height"))
+        if not width or not height:
+            raise ValueError("no viewBox and no width/height to make one from")
+        root.set("viewBox", f"0 0 {width:g} {height:g}")
+    root.attrib.pop("width", None)
+    root.attrib.pop("height", None)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def content_key(data):
+    """identify-duplicates.py's hash: attribute order and whitespace do not matter."""
+    duplicates = load_helper("identify-duplicates")
+    normalized = duplicates.normalize_svg(io.BytesIO(data))
+    return duplicates.hash_content(normalized) if normalized else None
+
+
+def simplify_tolerance():
+    """The tolerance of the pipeline's wireblock simplification, so ingested copies match its output."""
+    simplify = load_helper("simplify_paths")
+    try:
+        with open(PIPELINE_MANIFEST, "r", encoding="utf-8") as f:
+            stage = json.load(f)["stages"][SIMPLIFY_STAGE]
+        return stage.get("params", {}).get("tolerance", simplify.DEFAULT_TOLERANCE)
+    except (OSError, ValueError, KeyError):
+        return simplify.DEFAULT_TOLERANCE
+
+
+def non_scaling_copy(name, data, tolerance):
+    """(name, bytes, content key) of the svg/non-scaling copy of a wireblock."""
+    prefix, replacement = NON_SCALING_FROM
+    simplified, out = io.BytesIO(), io.BytesIO()
+    load_helper("simplify_paths").simplify_svg(io.BytesIO(data), simplified, tolerance=tolerance)
+    load_helper("non-scaling-stroke").process_svg(io.BytesIO(simplified.getvalue()), out)
+    return replacement + name[len(prefix):], out.getvalue(), content_key(out.getvalue())
+
+
+def process(job, tolerance):
+    """Worker step: one member -> result dict for the writer."""
+    seq, archive, member, folder, data = job
+    name = os.path.basename(member)
+    result = {"seq": seq, "archive": archive, "member": member, "folder": folder, "name": name}
+    try:
+        result["data"] = normalize_icon(data)
+    except ValueError as e:
+        result.update(status="invalid", detail=str(e))
+        return result
+    result["key"] = content_key(result["data"])
+    if folder == "wireblocks" and name.startswith(NON_SCALING_FROM[0]):
+        result["extra"] = non_scaling_copy(name, result["data"], tolerance)
+    return result
+
+
+def read_members(archives, jobs, results, workers):
+    """Reader thread: streams SVG members into `jobs`; rejections skip the workers."""
+    counter = [0]
+    try:
+        stream_members(archives, jobs, results, counter)
+    finally:
+        for _ in range(workers):
+            jobs.put(_DONE)
+        results.put(("read", counter[0]))
+
+
+def stream_members(archives, jobs, results, counter):
+    for archive in archives:
+        try:
+            zf = zipfile.ZipFile(archive)
+        except (OSError, zipfile.BadZipFile) as e:
+            results.put({"seq": counter[0], "archive": archive, "member": "", "folder": None, "name": "",
+                         "status": "invalid", "detail": f"cannot open archive ({e})"})
+            counter[0] += 1
+            continue
+        with zf:
+            for info in zf.infolist():
+                member = info.filename
+                name = os.path.basename(member)
+                if info.is_dir() or not name.lower().endswith(".svg") or name.startswith(".") \
+                        or member.startswith("__MACOSX/"):
+                    continue
+                base = {"seq": counter[0], "archive": archive, "member": member, "folder": route(member), "name": name}
+                counter[0] += 1
+                if base["folder"] is None:
+                    results.put(dict(base, status="unrouted", detail="unknown file name prefix"))
+                elif info.file_size > MAX_MEMBER_BYTES:
+                    results.put(dict(base, status="too-large", detail=f"{info.file_size} bytes"))
+                else:
+                    try:
+                        with zf.open(info) as f:
+                            data = f.read(MAX_MEMBER_BYTES + 1)
+                    except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+                        results.put(dict(base, status="invalid", detail=f"cannot read member ({e})"))
+                        continue
+                    if len(data) > MAX_MEMBER_BYTES:  # the header understated the size
+                        results.put(dict(base, status="too-large", detail=f"over {MAX_MEMBER_BYTES} bytes"))
+                        continue
+                    jobs.put((base["seq"], archive, member, base["folder"], data))
+
+
+def work(jobs, results, tolerance):
+    while True:
+        job = jobs.get()
+        if job is _DONE:
+            results.put(("worker", None))
+            return
+        try:
+            results.put(process(job, tolerance))
+        except Exception as e:
+            results.put({"seq": job[0], "archive": job[1], "member": job[2], "folder": job[3],
+                         "name": os.path.basename(job[2]), "status": "invalid", "detail": str(e)})
+
+
+def existing_keys(svg_dir):
+    """{content key: relative path} for every icon already in svg/, hashed the way new members are."""
+    keys = {}
+    for folder in sorted(os.listdir(svg_dir)) if os.path.isdir(svg_dir) else []:
+        path = os.path.join(svg_dir, folder)
+        if not os.path.isdir(path):
+            continue
+        for filename in sorted(os.listdir(path)):
+            if not filename.lower().endswith(".svg"):
+                continue
+            with open(os.path.join(path, filename), "rb") as f:
+                data = f.read()
+            try:
+                key = content_key(normalize_icon(data))
+            except ValueError:
+                continue
+            if key:
+                keys.setdefault(key, f"{folder}/{filename}")
+    return keys
+
+
+class Writer:
+    """Single consumer: duplicate check and disk writes, in member order."""
+
+    def __init__(self, svg_dir, seen, replace=False, dry_run=False):
+        self.svg_dir = svg_dir
+        self.seen = seen
+        self.replace = replace
+        self.dry_run = dry_run
+        self.entries = []
+
+    def _write(self, folder, name, data):
+        path = os.path.join(self.svg_dir, folder, name)
+        existed = os.path.exists(path)
+        if not self.dry_run:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        return existed
+
+    def accept_extra(self, name, data, key):
+        """Writes a wireblock's non-scaling copy with the same checks as the wireblock. Returns (status, detail)."""
+        rel_path = f"non-scaling/{name}"
+        if key in self.seen:
+            return "duplicate", f"{rel_path} same as {self.seen[key]}"
+        if os.path.exists(os.path.join(self.svg_dir, "non-scaling", name)) and not self.replace:
+            return "exists", f"{rel_path} has other content (--replace to overwrite)"
+        replaced = self._write("non-scaling", name, data)
+        if key:
+            self.seen[key] = rel_path
+        return ("replaced" if replaced else "added"), rel_path
+
+    def accept(self, result):
+        if "status" not in result:
+            rel_path = f"{result['folder']}/{result['name']}"
+            target = os.path.join(self.svg_dir, result["folder"], result["name"])
+            if result["key"] in self.seen:
+                result.update(status="duplicate", detail=f"same as {self.seen[result['key']]}")
+            elif os.path.exists(target) and not self.replace:
+                result.update(status="exists", detail=f"{rel_path} has other content (--replace to overwrite)")
+            else:
+                replaced = self._write(result["folder"], result["name"], result["data"])
+                result["status"] = "replaced" if replaced else "added"
+                result["detail"] = rel_path
+                if result["key"]:
+                    self.seen[result["key"]] = rel_path
+                if result.get("extra"):
+                    result["nonScaling"], result["nonScalingDetail"] = self.accept_extra(*result["extra"])
+        self.entries.append({k: result.get(k) for k in ("archive", "member", "folder", "status", "detail",
+                                                         "nonScaling", "nonScalingDetail")})
+
+
+def ingest(archives, svg_dir=DEFAULT_SVG_DIR, jobs=None, replace=False, dry_run=False):
+    """Streams every SVG in `archives` into svg_dir. Returns the per-member entries in archive order."""
+    # Written files get a default namespace, not ns0: prefixes
+    ET.register_namespace("", SVG_NS)
+    load_helper("identify-duplicates")
+    load_helper("non-scaling-stroke")
+    tolerance = simplify_tolerance()
+
+    workers = max(1, jobs or os.cpu_count() or 1)
+    writer = Writer(svg_dir, existing_keys(svg_dir), replace, dry_run)
+    job_queue = queue.Queue(maxsize=QUEUE_PER_WORKER * workers)
+    result_queue = queue.Queue(maxsize=QUEUE_PER_WORKER * workers)
+
+    threads = [threading.Thread(target=read_members, args=(archives, job_queue, result_queue, workers), daemon=True)]
+    threads += [threading.Thread(target=work, args=(job_queue, result_queue, tolerance), daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Results arrive in completion order; `pending` holds the few that overtook an earlier member
+    pending, next_seq, total, finished = {}, 0, None, 0
+    while finished < workers or total is None or next_seq < total:
+        item = result_queue.get()
+        if isinstance(item, tuple):
+            if item[0] == "read":
+                total = item[1]
+            else:
+                finished += 1
+        else:
+            pending[item["seq"]] = item
+        while next_seq in pending:
+            writer.accept(pending.pop(next_seq))
+            next_seq += 1
+    for thread in threads:
+        thread.join()
+    return writer.entries
+
+
+def print_report(entries, elapsed, dry_run=False, limit=20):
+    counts = Counter(e["status"] for e in entries)
+    folders = Counter(e["folder"] for e in entries if e["status"] in ("added", "replaced"))
+    folders["non-scaling"] += sum(1 for e in entries if e.get("nonScaling") in ("added", "replaced"))
+    verb = "would be written" if dry_run else "written"
+    print(f"\n📥 {len(entries)} SVG members in {elapsed:.2f}s ({len(entries) / max(elapsed, 1e-9):.0f}/s)")
+    for status in STATUSES:
+        if counts[status]:
+            print(f"   {status}: {counts[status]}")
+    for folder, count in sorted(folders.items()):
+        if count:
+            print(f"   {count} {verb} to {folder}/")
+    for e in entries:
+        if e.get("nonScaling") in ("duplicate", "exists"):
+            print(f"   non-scaling copy {e['nonScaling']}: {e['nonScalingDetail']}")
+    # Duplicates are expected in re-exported drops; list the files that need a look first
+    problems = sorted((e for e in entries if e["status"] not in ("added", "replaced")),
+                      key=lambda e: e["status"] == "duplicate")
+    for e in problems[:limit]:
+        print(f"   {e['status']}: {e['member']} ({e['detail']})")
+    if len(problems) > limit:
+        print(f"   ... {len(problems) - limit} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add the SVGs in zip archives to svg/, normalized and checked for duplicates.")
+    parser.add_argument("archives", nargs="+", help="zip files")
+    parser.add_argument("--svg-dir", default=DEFAULT_SVG_DIR, help="icon source folder (default: svg)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker threads (default: CPU count)")
+    parser.add_argument("--replace", action="store_true", help="overwrite existing files with other content")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--json", help="write the per-member report as JSON")
+    args = parser.parse_args()
+
+    for archive in args.archives:
+        if not os.path.exists(archive):
+            sys.exit(f"❌ {archive} not found")
+
+    start = time.perf_counter()
+    entries = ingest(args.archives, args.svg_dir, args.jobs, args.replace, args.dry_run)
+    print_report(entries, time.perf_counter() - start, args.dry_run)
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        print(f"ℹ️  Report: {args.json}")
+    if any(e["status"] in ("added", "replaced") for e in entries) and not args.dry_run:
+        print("ℹ️  Run generate.py (or gep-icons generate) to rebuild the sprite")
+
+
+if __name__ == "__main__":
+    main()
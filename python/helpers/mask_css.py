@@ -0,0 +1,193 @@
+import io
+import os
+import re
+import sys
+import gzip
+import json
+import base64
+import argparse
+import importlib.util
+from urllib.parse import quote, unquote
+
+from transform_cache import cached_transform
+
+# Builds one stylesheet with a CSS mask class per UI icon.
+#
+#   python mask_css.py "svg/ui icons" -o dist/ui-icons.css
+#
+#   <span class="ui-icon ui-icon-close-icon"></span>     (colored by `color`, sized by font-size)
+#
+# Each icon goes through convert_for_masks() from remove-svg-dimensions.py
+# (unless `prepared`, e.g. the pipeline's ui-masks output) and is inlined as a
+# URL-encoded data URI, which stays readable and compresses
+# better than base64. Encoded icons are kept in the shared transform cache, so
+# only changed files are re-encoded.
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+MASK_HELPER = os.path.join(HELPERS_DIR, "remove-svg-dimensions.py")
+# The mask preparation lives in another file, so its code is part of the cache key too
+PIPELINE_DEPENDS = [MASK_HELPER]
+CLASS_PREFIX = "ui-icon"
+DEFAULT_OUTPUT = "ui-icons.css"
+
+URI_PREFIX = "data:image/svg+xml,"
+URI_PREFIX_BASE64 = "data:image/svg+xml;base64,"
+
+# Characters that can stay as-is inside url("...") in CSS
+URI_SAFE = " '=:/;,.-_()!*~@$&+?[]"
+
+BASE_RULE = f""".{CLASS_PREFIX} {{
+  display: inline-block;
+  width: 1em;
+  height: 1em;
+  background-color: currentColor;
+  -webkit-mask: var(--{CLASS_PREFIX}) no-repeat center / contain;
+  mask: var(--{CLASS_PREFIX}) no-repeat center / contain;
+}}
+"""
+
+_mask_helper = None
+
+
+def convert_for_masks(src, dest):
+    """remove-svg-dimensions.convert_for_masks (the file name is not importable)."""
+    global _mask_helper
+    if _mask_helper is None:
+        spec = importlib.util.spec_from_file_location("remove_svg_dimensions", MASK_HELPER)
+        _mask_helper = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_mask_helper)
+    return _mask_helper.convert_for_masks(src, dest)
+
+
+def minify(svg_bytes):
+    text = svg_bytes.decode("utf-8")
+    text = re.sub(r"<\?xml[^>]*\?>", "", text)
+    text = re.sub(r"<!--.*?-->", "", text, flags=re.S)
+    text = re.sub(r">\s+<", "><", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    # Single quotes need no escaping inside url("...")
+    if "'" not in text:
+        text = text.replace('"', "'")
+    return text
+
+
+@cached_transform("mask-css")
+def encode_mask(src, dest, prepared=False):
+    """
+    Writes the URL-encoded data URI for one icon, prepared for use as a mask.
+    With `prepared`, the source already went through convert_for_masks().
+    """
+    if prepared:
+        svg = src.read()
+    else:
+        out = io.BytesIO()
+        convert_for_masks(src, out)
+        svg = out.getvalue()
+    if not svg:
+        return
+    dest.write((URI_PREFIX + quote(minify(svg), safe=URI_SAFE)).encode("ascii"))
+
+
+def class_name(filename):
+    name = os.path.splitext(filename)[0]
+    if name.startswith("UI_"):
+        name = name[3:]
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    return f"{CLASS_PREFIX}-{slug}"
+
+
+def encode_stylesheet(files, prepared=False):
+    """
+    {filename: svg bytes} -> (stylesheet bytes, size report).
+    Raises ValueError when two files would get the same class.
+    """
+    rules, icons = [], []
+    classes = {}
+    for filename in sorted(files):
+        name = class_name(filename)
+        if name in classes:
+            raise ValueError(f"{classes[name]} and {filename} both map to .{name}; rename one of them")
+        classes[name] = filename
+        data = files[filename]
+        out = io.BytesIO()
+        encode_mask(io.BytesIO(data), out, prepared=prepared)
+        uri = out.getvalue().decode("ascii")
+        if not uri:
+            print(f"  Skipped: {filename} (could not be parsed)")
+            continue
+        rules.append(f'.{name} {{ --{CLASS_PREFIX}: url("{uri}"); }}\n')
+        svg_text = unquote(uri[len(URI_PREFIX):]).encode("utf-8")
+        icons.append({
+            "class": name,
+            "source": len(data),
+            "encoded": len(uri),
+            "base64": len(URI_PREFIX_BASE64) + len(base64.b64encode(svg_text)),
+        })
+
+    css = ("/* Generated by python/helpers/mask_css.py - do not edit */\n" + BASE_RULE + "".join(rules)).encode("utf-8")
+    return css, {"icons": icons, "bytes": len(css), "gzip": len(gzip.compress(css, 9))}
+
+
+def build_stylesheet(files, output=DEFAULT_OUTPUT, prepared=False):
+    """Pipeline entry point: {filename: svg bytes} -> {output: stylesheet bytes}."""
+    css, report = encode_stylesheet(files, prepared)
+    print_report(report)
+    return {output: css}
+
+
+def print_report(report):
+    icons = report["icons"]
+    source = sum(r["source"] for r in icons)
+    encoded = sum(r["encoded"] for r in icons)
+    as_base64 = sum(r["base64"] for r in icons)
+    print(f"\n📦 {len(icons)} UI icons: {source / 1024:.1f} KB source -> {encoded / 1024:.1f} KB data URIs "
+          f"(base64 would be {as_base64 / 1024:.1f} KB)")
+    for r in sorted(icons, key=lambda r: r["encoded"], reverse=True)[:5]:
+        print(f"   {r['class']}: {r['encoded']} B")
+    print(f"   Stylesheet: {report['bytes'] / 1024:.1f} KB, {report['gzip'] / 1024:.1f} KB gzipped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a CSS mask stylesheet from the UI icons.")
+    parser.add_argument("folder", nargs="?", default="svg/ui icons")
+    parser.add_argument("-o", "--output", default=os.path.join("dist", DEFAULT_OUTPUT))
+    parser.add_argument("--report", help="write the size report as JSON")
+    parser.add_argument("--prepared", action="store_true",
+                        help="the files already went through convert_for_masks (e.g. dist/ui-masks)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        sys.exit(f"❌ Folder not found: {args.folder}")
+    files = {}
+    for filename in os.listdir(args.folder):
+        if filename.lower().endswith(".svg"):
+            with open(os.path.join(args.folder, filename), "rb") as f:
+                files[filename] = f.read()
+
+    try:
+        css, report = encode_stylesheet(files, args.prepared)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print_report(report)
+    try:
+        with open(args.output, "rb") as f:
+            unchanged = f.read() == css
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"ℹ️  {args.output} unchanged")
+    else:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "wb") as f:
+            f.write(css)
+        print(f"✓ Stylesheet saved: {args.output}")
+
+    if args.report:
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"ℹ️  Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import os
+import argparse
 import xml.etree.ElementTree as ET
 
+from transform_cache import cached_transform
+
 OUTPUT_DIR = "non-scaling-stroke"
 TARGET_STROKE_WIDTH = "2"
 
@@ -14,7 +17,10 @@ SVG_TAGS_WITH_STROKE = {
     "ellipse",
 }
 
+@cached_transform("non-scaling-stroke", params=lambda: {"stroke_width": TARGET_STROKE_WIDTH})
 def process_svg(input_path, output_path):
+    # Same as the other helpers: write SVG without ns0: prefixes
+    ET.register_namespace("", "http://www.w3.org/2000/svg")
     tree = ET.parse(input_path)
     root = tree.getroot()
 
@@ -41,6 +47,7 @@ def process_svg(input_path, output_path):
     tree.write(output_path, encoding="utf-8", xml_declaration=True)
 
 def main():
+    argparse.ArgumentParser(description=f"Apply non-scaling strokes to every SVG in the current folder (written to {OUTPUT_DIR}/).").parse_args()
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     for filename in os.listdir("."):
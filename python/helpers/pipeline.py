@@ -0,0 +1,435 @@
+import io
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from xml.etree import ElementTree as ET
+
+# Runs the asset pipeline described in python/pipeline.json.
+# Run from the project root:  python python/helpers/pipeline.py
+#
+# Stage kinds (one key per stage):
+#   "source": "svg/wireblocks"                 read a folder (or a single file) from disk
+#   "map":    "helper:function"                fn(src, dest, **params) per file, e.g. non-scaling-stroke:process_svg
+#   "filter": "helper:function"                predicate(src) per file, "keep": true/false (check_icons:has_stroke)
+#   "sprite": "hs-icons-master"                generate.build_sprite over {"folder label": "stage"} inputs
+#                                              ("standalone": true also emits icons/<type>/<id>.<hash>.svg,
+#                                              "related": ["icon-tags", ...] checks ids against those tags
+#                                              and adds related icon ids, "canonical": true writes
+#                                              byte-reproducible output, see canonical_xml.py)
+#   "json":   "helper:function"                fn(document) edits a JSON document in place
+#   "reduce": "helper:function"                fn(files, **params) -> {output name: bytes}, e.g. one stylesheet from many icons
+#
+# Only stages with a "write" folder touch the disk; everything else stays in memory.
+# A stage is skipped when its inputs, settings and helper code hash to the same key as the last run.
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.dirname(HELPERS_DIR)
+DEFAULT_MANIFEST = os.path.join(PYTHON_DIR, "pipeline.json")
+DEFAULT_CACHE_DIR = ".pipeline-cache"
+SVG_NS = "http://www.w3.org/2000/svg"
+
+STAGE_KINDS = ("source", "map", "filter", "sprite", "json", "reduce")
+
+_helpers = {}
+_helpers_lock = threading.Lock()
+
+
+class PipelineError(Exception):
+    pass
+
+
+def load_helper(name):
+    """Imports python/helpers/<name>.py or python/<name>.py, including hyphenated file names."""
+    with _helpers_lock:
+        if name not in _helpers:
+            _helpers[name] = _import_helper(name)
+        return _helpers[name]
+
+
+def _import_helper(name):
+    for base in (HELPERS_DIR, PYTHON_DIR):
+        path = os.path.join(base, f"{name}.py")
+        if os.path.exists(path):
+            module_name = "pipeline_helper_" + re.sub(r"\W", "_", name)
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+    raise PipelineError(f"Helper '{name}' not found in {HELPERS_DIR} or {PYTHON_DIR}")
+
+
+def resolve(ref):
+    """'helper:function' -> (callable, helper source path)."""
+    helper, _, func_name = ref.partition(":")
+    module = load_helper(helper)
+    if not hasattr(module, func_name):
+        raise PipelineError(f"'{helper}' has no function '{func_name}'")
+    return getattr(module, func_name), module.__file__
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def stage_kind(name, spec):
+    kinds = [k for k in STAGE_KINDS if k in spec]
+    if len(kinds) != 1:
+        raise PipelineError(f"Stage '{name}' must define exactly one of: {', '.join(STAGE_KINDS)}")
+    return kinds[0]
+
+
+def stage_inputs(spec):
+    inputs = spec.get("inputs", [])
+    inputs = list(inputs.values()) if isinstance(inputs, dict) else list(inputs)
+    return inputs + [dep for dep in spec.get("related", []) if dep not in inputs]
+
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    stages = manifest.get("stages", {})
+    for name, spec in stages.items():
+        stage_kind(name, spec)
+        for dep in stage_inputs(spec):
+            if dep not in stages:
+                raise PipelineError(f"Stage '{name}' depends on unknown stage '{dep}'")
+    return manifest
+
+
+def topological_order(stages, targets=None):
+    """Returns the stages needed for `targets` (all by default) in dependency order."""
+    order, state = [], {}
+
+    def visit(name, chain):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise PipelineError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = "visiting"
+        for dep in stage_inputs(stages[name]):
+            visit(dep, chain + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for name in targets or stages:
+        if name not in stages:
+            raise PipelineError(f"Unknown stage '{name}'")
+        visit(name, [])
+    return order
+
+
+class StageCache:
+    """Stage keys and output blobs from previous runs (blobs are stored by content hash)."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.state_path = os.path.join(cache_dir, "state.json")
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    def lookup(self, stage, key):
+        entry = self.state.get(stage)
+        if not entry or entry["key"] != key:
+            return None
+        outputs = {}
+        for name, digest in entry["outputs"].items():
+            try:
+                with open(self._blob_path(digest), "rb") as f:
+                    outputs[name] = f.read()
+            except OSError:
+                return None
+        return outputs
+
+    def store(self, stage, key, outputs):
+        digests = {}
+        for name, data in outputs.items():
+            digest = sha256(data)
+            path = self._blob_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+            digests[name] = digest
+        self.state[stage] = {"key": key, "outputs": digests}
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+
+def read_source(path):
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            return {os.path.basename(path): f.read()}
+    if not os.path.isdir(path):
+        raise PipelineError(f"Source '{path}' not found")
+    files = {}
+    for filename in sorted(os.listdir(path)):
+        full = os.path.join(path, filename)
+        if filename.lower().endswith(".svg") and os.path.isfile(full):
+            with open(full, "rb") as f:
+                files[filename] = f.read()
+    return files
+
+
+def rename(filename, rule):
+    if not rule:
+        return filename
+    if rule.get("strip_prefix") and filename.startswith(rule["strip_prefix"]):
+        filename = filename[len(rule["strip_prefix"]):]
+    return rule.get("prefix", "") + filename
+
+
+def run_map(func, files, spec):
+    params = spec.get("params", {})
+    outputs = {}
+    for filename, data in files.items():
+        out = io.BytesIO()
+        try:
+            func(io.BytesIO(data), out, **params)
+        except Exception as e:
+            print(f"  Failed: {filename} — {e}")
+            continue
+        if not out.getvalue():
+            print(f"  Skipped: {filename} (no output)")
+            continue
+        outputs[rename(filename, spec.get("rename"))] = out.getvalue()
+    return outputs
+
+
+def run_filter(func, files, spec):
+    keep = spec.get("keep", True)
+    return {name: data for name, data in files.items() if bool(func(io.BytesIO(data))) == keep}
+
+
+def run_sprite(spec, inputs):
+    generate = load_helper("generate")
+    sources = []
+    for folder_label, stage in spec["inputs"].items():
+        for filename, data in inputs[stage].items():
+            sources.append((folder_label.lower(), filename, io.BytesIO(data)))
+    sprite_bytes, config, standalone_files = generate.build_sprite(sources, spec["sprite"], spec.get("standalone", False),
+                                                                spec.get("canonical", False))
+    if not generate.enforce(sprite_bytes, config):
+        raise PipelineError("Complexity budgets exceeded")
+    files = {}
+    for dep in spec.get("related", []):
+        files.update(inputs[dep])
+    icon_tags = json.loads(files["icon-tags.json"]) if "icon-tags.json" in files else None
+    checker = generate.consistency_check
+    report = checker.check(checker.sprite_symbols(io.BytesIO(sprite_bytes)), config, icon_tags)
+    checker.print_report(report)
+    if report["errors"]:
+        raise PipelineError("Sprite, config and tags disagree")
+    if icon_tags is not None:
+        related = load_helper("related_icons")
+        thesaurus = json.loads(files["tag-thesaurus.json"]) if "tag-thesaurus.json" in files else None
+        count = related.add_related(config, icon_tags, thesaurus=thesaurus)
+        print(f"  Related icons: {count} icons")
+    index = load_helper("sprite_index").build_index(sprite_bytes, config["spriteVersion"])
+    return {
+        f"{spec['sprite']}.svg": sprite_bytes,
+        f"{spec['sprite']}-config.json": generate.encode_config(config),
+        f"{spec['sprite']}-index.json": json.dumps(index, separators=(",", ":")).encode("utf-8"),
+        **standalone_files,
+    }
+
+
+def run_json(func, files, spec):
+    (filename, data), = files.items()
+    document = json.loads(data)
+    func(document)
+    output_name = spec.get("output", filename)
+    return {output_name: json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8")}
+
+
+def stage_key(name, spec, input_sets):
+    """Hash of the stage settings, the helper code and every input file."""
+    h = hashlib.sha256()
+    h.update(json.dumps(spec, sort_keys=True).encode("utf-8"))
+    kind = stage_kind(name, spec)
+    if kind in ("map", "filter", "json", "reduce"):
+        _, helper_path = resolve(spec[kind])
+        # Helpers list other files their output depends on (e.g. the palette in generate.py) in PIPELINE_DEPENDS
+        depends = getattr(load_helper(spec[kind].partition(":")[0]), "PIPELINE_DEPENDS", [])
+        for path in [helper_path, *depends]:
+            with open(path, "rb") as f:
+                h.update(f.read())
+    elif kind == "sprite":
+        generate = load_helper("generate")
+        # The stage runs generate.build_sprite plus its budget, consistency, index and delta helpers
+        # (listed in generate.PIPELINE_DEPENDS), so edits to any of them re-run it
+        paths = [generate.__file__, *generate.PIPELINE_DEPENDS]
+        if spec.get("related"):
+            related = load_helper("related_icons")
+            paths += [related.__file__, related.tag_vocab.__file__]
+        for path in paths:
+            with open(path, "rb") as f:
+                h.update(f.read())
+    for dep in stage_inputs(spec):
+        h.update(dep.encode("utf-8"))
+        for filename, data in input_sets[dep].items():
+            h.update(filename.encode("utf-8"))
+            h.update(sha256(data).encode("ascii"))
+    return h.hexdigest()
+
+
+def write_outputs(folder, outputs):
+    """Writes files whose content changed. Returns the number written."""
+    written = 0
+    for filename, data in outputs.items():
+        path = os.path.join(folder, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    continue
+        except OSError:
+            pass
+        # Replace by rename: readers that memory-map outputs (SpriteReader) never see a truncated file
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        written += 1
+    return written
+
+
+def write_sprite(spec, outputs):
+    """
+    Writes the sprite stage like generate.py does: a delta from the sprite being
+    replaced, and standalone icons with stale content-hashed files removed.
+    """
+    generate = load_helper("generate")
+    folder = spec["write"]
+    sprite_name = f"{spec['sprite']}.svg"
+    try:
+        with open(os.path.join(folder, sprite_name), "rb") as f:
+            previous_sprite = f.read()
+    except OSError:
+        previous_sprite = None
+    standalone_files = {path: data for path, data in outputs.items() if path.startswith(f"{generate.STANDALONE_DIR}/")}
+    written = write_outputs(folder, {path: data for path, data in outputs.items() if path not in standalone_files})
+    if previous_sprite:
+        generate.write_sprite_delta(previous_sprite, outputs[sprite_name], spec["sprite"], folder)
+    if spec.get("standalone"):
+        generate.write_standalone_files(standalone_files, folder)
+    return written
+
+
+def run_stage(name, spec, results, cache, force):
+    kind = stage_kind(name, spec)
+
+    if kind == "source":
+        files = read_source(spec["source"])
+        print(f"✓ {name}: {len(files)} files from {spec['source']}")
+        return files
+
+    key = stage_key(name, spec, results)
+    outputs = None if force else cache.lookup(name, key)
+    status = "unchanged, reused"
+
+    if outputs is None:
+        inputs = stage_inputs(spec)
+        if kind == "sprite":
+            outputs = run_sprite(spec, results)
+        else:
+            func, _ = resolve(spec[kind])
+            files = {}
+            for dep in inputs:
+                files.update(results[dep])
+            if kind == "map":
+                outputs = run_map(func, files, spec)
+            elif kind == "filter":
+                outputs = run_filter(func, files, spec)
+            elif kind == "reduce":
+                outputs = func(files, **spec.get("params", {}))
+            else:
+                outputs = run_json(func, files, spec)
+        cache.store(name, key, outputs)
+        status = "built"
+
+    if spec.get("write"):
+        if kind == "sprite":
+            written = write_sprite(spec, outputs)
+        else:
+            written = write_outputs(spec["write"], outputs)
+        status += f", {written} written to {spec['write']}"
+    print(f"✓ {name}: {len(outputs)} files ({status})")
+    return outputs
+
+
+def run_pipeline(manifest_path=DEFAULT_MANIFEST, targets=None, force=False, jobs=None):
+    manifest = load_manifest(manifest_path)
+    stages = manifest["stages"]
+    order = topological_order(stages, targets)
+    cache = StageCache(manifest.get("cache_dir", DEFAULT_CACHE_DIR))
+
+    # Every helper that writes SVG registers this; doing it once up front keeps
+    # output identical no matter which stage happens to run first.
+    ET.register_namespace("", SVG_NS)
+
+    results = {}
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                if all(dep in results for dep in stage_inputs(stages[name])):
+                    pending.remove(name)
+                    running[pool.submit(run_stage, name, stages[name], results, cache, force)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    for other in running:
+                        other.cancel()
+                    cache.save()
+                    raise PipelineError(f"Stage '{name}' failed: {e}") from e
+
+    cache.save()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the icon asset pipeline.")
+    parser.add_argument("stages", nargs="*", help="stages to build (with their dependencies); default: all")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--force", action="store_true", help="ignore cached stage results")
+    parser.add_argument("--jobs", type=int, default=None, help="stages to run in parallel")
+    parser.add_argument("--list", action="store_true", help="print the stage order and exit")
+    args = parser.parse_args()
+
+    try:
+        if args.list:
+            manifest = load_manifest(args.manifest)
+            for name in topological_order(manifest["stages"], args.stages or None):
+                spec = manifest["stages"][name]
+                deps = ", ".join(stage_inputs(spec)) or "-"
+                print(f"{name:<20} {stage_kind(name, spec):<7} <- {deps}")
+            return
+        run_pipeline(args.manifest, args.stages or None, args.force, args.jobs)
+    except PipelineError as e:
+        sys.exit(f"❌ {e}")
+    print("\n✓ Pipeline complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import mimetypes
+import threading
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from tag_store import TagStore, ConflictError, EmptyStoreError
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Local preview server for index.html / tag-manager.html.
+# Run from the project root:  python python/helpers/preview_server.py
+
+DEFAULT_PORT = 3000
+WATCH_DIR = "dist"
+WATCH_INTERVAL = 0.5
+EVENTS_PATH = "/__events"
+TAGS_API_PATH = "/api/tags"
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+MIN_COMPRESS_BYTES = 1024
+
+# Injected before </body> of every HTML page so open pages reload after a rebuild
+RELOAD_SNIPPET = (
+    "<script>(function(){"
+    "var es=new EventSource('" + EVENTS_PATH + "');"
+    "es.addEventListener('rebuild',function(e){"
+    "console.log('Rebuild detected:',e.data);location.reload();});"
+    "})();</script>"
+)
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/javascript", ".js")
+
+
+class AssetCache:
+    """
+    Keeps served file bodies, their strong ETags and compressed copies in memory.
+    Entries are keyed by path and invalidated when mtime or size changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, path):
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry["stamp"] == stamp:
+                return entry
+
+        with open(path, "rb") as f:
+            body = f.read()
+        if path.lower().endswith((".html", ".htm")):
+            body = inject_reload_snippet(body)
+
+        entry = {
+            "stamp": stamp,
+            "body": body,
+            "etag": '"%s"' % hashlib.sha256(body).hexdigest()[:32],
+            "mtime": st.st_mtime,
+            "encoded": {},
+        }
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def encoded(self, entry, encoding):
+        """Returns the body compressed with `encoding`, compressing at most once per version."""
+        with self._lock:
+            cached = entry["encoded"].get(encoding)
+        if cached is not None:
+            return cached
+
+        if encoding == "br":
+            data = brotli.compress(entry["body"], quality=11)
+        else:
+            data = gzip.compress(entry["body"], compresslevel=9, mtime=0)
+
+        with self._lock:
+            entry["encoded"][encoding] = data
+        return data
+
+
+def inject_reload_snippet(body):
+    marker = b"</body>"
+    idx = body.rfind(marker)
+    if idx == -1:
+        return body
+    return body[:idx] + RELOAD_SNIPPET.encode("utf-8") + body[idx:]
+
+
+def strip_encoding_suffix(etag):
+    """Maps a compressed-variant ETag back to the identity ETag it was derived from."""
+    for suffix in ('-gzip"', '-br"'):
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def pick_encoding(accept_encoding):
+    """Chooses br or gzip from an Accept-Encoding header (q=0 means refused)."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            offered[token.strip().lower()] = q
+
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def parse_range(header, size):
+    """Returns (start, end) inclusive for a single byte range, None if unusable."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class EventHub:
+    """Fan-out of rebuild notifications to every connected EventSource."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = []
+
+    def subscribe(self):
+        cond = {"event": threading.Event(), "messages": []}
+        with self._lock:
+            self._clients.append(cond)
+        return cond
+
+    def unsubscribe(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def publish(self, payload):
+        with self._lock:
+            for client in self._clients:
+                client["messages"].append(payload)
+                client["event"].set()
+
+
+def is_tags_route(route):
+    """True for the tag API itself and paths under it, not for e.g. /api/tagsfoo."""
+    return route == TAGS_API_PATH or route.startswith(TAGS_API_PATH + "/")
+
+
+def snapshot(directory):
+    state = {}
+    for root_dir, dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def watch_for_rebuilds(directory, hub, interval=WATCH_INTERVAL):
+    """Polls `directory` and publishes the changed files once writes have settled."""
+    previous = snapshot(directory)
+    pending = set()
+    while True:
+        time.sleep(interval)
+        current = snapshot(directory)
+        changed = {p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)}
+        previous = current
+        if changed:
+            pending |= changed
+            continue
+        if pending:
+            files = sorted(os.path.relpath(p, directory).replace(os.sep, "/") for p in pending)
+            pending = set()
+            print(f"↻ Rebuild: {', '.join(files)}")
+            hub.publish({"files": files, "time": time.time()})
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    cache = None
+    hub = None
+    tag_store = None
+    tags_json = None
+
+    def end_headers(self):
+        # Always revalidate; a matching ETag turns the reload into a 304
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def do_GET(self):
+        route = self.path.split("?", 1)[0]
+        if route == EVENTS_PATH:
+            return self.stream_events()
+        if is_tags_route(route):
+            return self.handle_tags_api("GET", route)
+        self.serve_asset(head_only=False)
+
+    def do_HEAD(self):
+        self.serve_asset(head_only=True)
+
+    def do_PUT(self):
+        self.handle_tags_api("PUT", self.path.split("?", 1)[0])
+
+    def do_PATCH(self):
+        self.handle_tags_api("PATCH", self.path.split("?", 1)[0])
+
+    def do_POST(self):
+        self.handle_tags_api("POST", self.path.split("?", 1)[0])
+
+    def do_DELETE(self):
+        self.handle_tags_api("DELETE", self.path.split("?", 1)[0])
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def handle_tags_api(self, method, route):
+        """
+        GET   /api/tags            -> whole store (icon-tags.json layout)
+        GET   /api/tags/<id>       -> {"tags", "categories", "version"}
+        PUT   /api/tags/<id>       -> replace; optional "version" guards against stale writes
+        PATCH /api/tags/<id>       -> {"add_tags", "remove_tags", "add_categories", "remove_categories"}
+        DELETE /api/tags/<id>      -> drop one icon (Tag Manager "remove missing icons")
+        POST  /api/tags/import     -> {"icons": {id: {...}}, "replace": bool}, bulk load (Tag Manager import)
+        POST  /api/tags/export     -> materialize icon-tags.json (refused while the store is empty)
+        """
+        if not is_tags_route(route):
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown path {route}"})
+        if self.tag_store is None:
+            return self.send_json(HTTPStatus.NOT_FOUND, {"error": "tag store not enabled (start with --tag-store)"})
+
+        icon_id = unquote(route[len(TAGS_API_PATH):].lstrip("/"))
+        try:
+            if method == "GET" and not icon_id:
+                return self.send_json(HTTPStatus.OK, self.tag_store.all())
+            if method == "GET":
+                entry = self.tag_store.get(icon_id)
+                if entry is None:
+                    return self.send_json(HTTPStatus.NOT_FOUND, {"error": f"'{icon_id}' not found"})
+                return self.send_json(HTTPStatus.OK, entry)
+            if method == "POST" and icon_id == "export":
+                written = self.tag_store.export_json(self.tags_json)
+                return self.send_json(HTTPStatus.OK, {"written": written, "path": self.tags_json})
+            if method == "POST" and icon_id == "import":
+                body = self.read_json()
+                count = self.tag_store.import_data(body.get("icons", {}), replace=bool(body.get("replace")))
+                return self.send_json(HTTPStatus.OK, {"imported": count})
+            if method == "DELETE" and icon_id:
+                if not self.tag_store.delete(icon_id):
+                    return self.send_json(HTTPStatus.NOT_FOUND, {"error": f"'{icon_id}' not found"})
+                return self.send_json(HTTPStatus.OK, {"deleted": icon_id})
+            if method == "PUT" and icon_id:
+                body = self.read_json()
+                version = self.tag_store.put(icon_id, body.get("tags", []), body.get("categories", []),
+                                             expected_version=body.get("version"))
+                return self.send_json(HTTPStatus.OK, {"version": version})
+            if method == "PATCH" and icon_id:
+                body = self.read_json()
+                entry = self.tag_store.patch(
+                    icon_id,
+                    add_tags=body.get("add_tags", []),
+                    remove_tags=body.get("remove_tags", []),
+                    add_categories=body.get("add_categories", []),
+                    remove_categories=body.get("remove_categories", []),
+                )
+                return self.send_json(HTTPStatus.OK, entry)
+        except ConflictError as e:
+            return self.send_json(HTTPStatus.CONFLICT, {"error": str(e), "version": e.actual})
+        except EmptyStoreError as e:
+            return self.send_json(HTTPStatus.CONFLICT, {"error": str(e)})
+        except (ValueError, AttributeError) as e:
+            return self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+        self.send_json(HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not supported on {route}"})
+
+    def serve_asset(self, head_only):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not os.path.isfile(index):
+                return super().do_GET() if not head_only else super().do_HEAD()
+            path = index
+
+        try:
+            entry = self.cache.get(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        ctype = self.guess_type(path)
+        compressible = ctype.startswith(COMPRESSIBLE_TYPES) and len(entry["body"]) >= MIN_COMPRESS_BYTES
+        encoding = pick_encoding(self.headers.get("Accept-Encoding", "")) if compressible else None
+        etag = entry["etag"] if encoding is None else f'{entry["etag"][:-1]}-{encoding}"'
+
+        # Strong validator check (any representation of the same version counts)
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = {strip_encoding_suffix(t.strip()) for t in if_none_match.split(",")}
+            if "*" in tags or entry["etag"] in tags:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                if compressible:
+                    self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+
+        body = entry["body"]
+        status = HTTPStatus.OK
+        content_range = None
+
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (not if_range or if_range.strip() == entry["etag"]):
+            # Ranges address the identity representation
+            byte_range = parse_range(range_header, len(body))
+            if byte_range is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+            content_range = f"bytes {start}-{end}/{len(body)}"
+            body = body[start:end + 1]
+            status = HTTPStatus.PARTIAL_CONTENT
+            encoding = None
+            etag = entry["etag"]
+        elif encoding:
+            body = self.cache.encoded(entry, encoding)
+
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(entry["mtime"]))
+        self.send_header("Accept-Ranges", "bytes")
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+        if not head_only:
+            self.wfile.write(body)
+
+    def stream_events(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        client = self.hub.subscribe()
+        try:
+            self.wfile.write(b"retry: 2000\n\n")
+            self.wfile.flush()
+            while True:
+                # Wake up periodically so dead connections are noticed
+                if not client["event"].wait(timeout=15):
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                    continue
+                client["event"].clear()
+                while client["messages"]:
+                    payload = client["messages"].pop(0)
+                    self.wfile.write(f"event: rebuild\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.unsubscribe(client)
+
+    def log_message(self, format, *args):
+        if self.path.split("?", 1)[0] != EVENTS_PATH:
+            super().log_message(format, *args)
+
+
+def serve(root=".", port=DEFAULT_PORT, watch_dir=WATCH_DIR, tag_store_path=None):
+    root = os.path.abspath(root)
+    hub = EventHub()
+
+    tags_json = os.path.join(root, "dist", "icon-tags.json")
+    tag_store = TagStore(tag_store_path) if tag_store_path else None
+    # A new store starts from the current icon-tags.json, so the Tag Manager never loads an empty one
+    if tag_store is not None and tag_store.count() == 0 and os.path.exists(tags_json):
+        count = tag_store.import_json(tags_json)
+        print(f"ℹ️  Tag store was empty - imported {count} icons from {tags_json}")
+
+    handler = type("Handler", (PreviewHandler,), {
+        "cache": AssetCache(),
+        "hub": hub,
+        "tag_store": tag_store,
+        "tags_json": tags_json,
+    })
+
+    def factory(*args, **kwargs):
+        return handler(*args, directory=root, **kwargs)
+
+    watch_path = os.path.join(root, watch_dir)
+    if os.path.isdir(watch_path):
+        threading.Thread(target=watch_for_rebuilds, args=(watch_path, hub), daemon=True).start()
+    else:
+        print(f"⚠️  '{watch_dir}' not found - rebuild notifications disabled")
+
+    httpd = ThreadingHTTPServer(("", port), factory)
+    httpd.daemon_threads = True
+    print(f"Serving {root} at http://localhost:{port}/")
+    print(f"  Icon Viewer: http://localhost:{port}/index.html")
+    print(f"  Tag Manager: http://localhost:{port}/tag-manager.html")
+    print(f"  Compression: gzip{', br' if brotli else ''}")
+    if tag_store_path:
+        print(f"  Tag store:   {tag_store_path} (API at {TAGS_API_PATH})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview server for the icon viewer and tag manager.")
+    parser.add_argument("--root", default=".", help="project root to serve (default: current directory)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--watch", default=WATCH_DIR, help="folder to watch for rebuilds, relative to root")
+    parser.add_argument("--tag-store", metavar="DB", help="enable the tag store API backed by this SQLite file")
+    args = parser.parse_args()
+    serve(args.root, args.port, args.watch, args.tag_store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# Console prompts shared by the interactive scripts. Every prompt also has a
+# command-line flag; when stdin is closed or empty (a build system, or
+# `gep-icons --no-input`), prompts fall back to their defaults instead of failing.
+
+
+def ask(question, default=""):
+    """The stripped answer, or `default` when the answer is empty or there is no input."""
+    try:
+        answer = input(question).strip()
+    except EOFError:
+        print()
+        return default
+    return answer or default
+
+
+def confirm(question, default=False):
+    """True for y/yes, False for n/no, `default` otherwise."""
+    answer = ask(question).lower()
+    if answer in ("y", "yes"):
+        return True
+    if answer in ("n", "no"):
+        return False
+    return default
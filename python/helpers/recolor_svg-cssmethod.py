@@ -1,12 +1,21 @@
 import os
 import sys
+import shutil
+import argparse
 from xml.etree import ElementTree as ET
 
+from transform_cache import cached_transform
+from color_usage import load_index, compliant
+
+# Only currentColor files are already CSS-ready; palette hex still has to be rewritten
+SKIP_STATUSES = {"themeable"}
+
 def parse_style(style_str):
     if not style_str: return {}
     pairs = [item.split(":", 1) for item in style_str.split(";") if ":" in item]
     return {k.strip().lower(): v.strip() for k, v in pairs}
 
+@cached_transform("recolor-cssmethod")
 def convert_to_css_ready(src, dest):
     ET.register_namespace('', "http://www.w3.org/2000/svg")
     try:
@@ -57,18 +66,40 @@ def convert_to_css_ready(src, dest):
 
     tree.write(dest, encoding="utf-8", xml_declaration=True)
 
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
 def main():
+    parser = argparse.ArgumentParser(description="Recolor every SVG in the current folder to currentColor (written to CSS_Ready_Icons/).")
+    parser.add_argument("--colors", metavar="COLOR_USAGE_JSON",
+                        help="color-usage.json from color_usage.py; files that are already CSS-ready are copied unchanged")
+    args = parser.parse_args()
     svgs = [f for f in os.listdir(".") if f.lower().endswith(".svg")]
     if not svgs:
         sys.exit("No SVG files found.")
 
+    colors = None
+    if args.colors:
+        colors = load_index(args.colors)
+        if colors is None:
+            sys.exit(f"❌ Could not read {args.colors}")
+
     out_dir = "CSS_Ready_Icons"
     os.makedirs(out_dir, exist_ok=True)
 
+    skipped = 0
     for svg_file in svgs:
-        convert_to_css_ready(svg_file, os.path.join(out_dir, svg_file))
+        dest = os.path.join(out_dir, svg_file)
+        if colors is not None and compliant(colors, svg_file, read_bytes(svg_file), SKIP_STATUSES):
+            shutil.copyfile(svg_file, dest)
+            skipped += 1
+            continue
+        convert_to_css_ready(svg_file, dest)
         print(f"Optimized: {svg_file}")
 
+    if skipped:
+        print(f"ℹ️  {skipped} already CSS-ready (copied unchanged)")
     print(f"\nDone! Use these icons with the CSS classes provided.")
 
 if __name__ == "__main__":
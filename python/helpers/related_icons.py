@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+from scipy import sparse
+
+import tag_vocab
+from tag_vocab import Vocabulary, load_thesaurus
+
+# "Related icons" from shared tags and categories.
+#
+# Every icon becomes a sparse TF-IDF vector over its normalized tag terms (see
+# tag_vocab.py). Cosine similarity is a sparse matrix product done in row
+# batches, so only icons that share a tag are ever compared; categories are too
+# broad for that ("business" covers most of the library) and only re-rank those
+# candidates. The top K per icon come from one sort of the batch's pairs. The
+# result goes into the sprite config as "related": [icon ids].
+#
+#   python related_icons.py                          update dist/hs-icons-master-config.json
+#   python related_icons.py benchmark --icons 50000
+
+DEFAULT_K = 8
+DEFAULT_CONFIG = os.path.join("dist", "hs-icons-master-config.json")
+DEFAULT_TAGS = os.path.join("dist", "icon-tags.json")
+
+# Share of the score that comes from matching categories
+CATEGORY_WEIGHT = 0.2
+
+# Icons per batch of the similarity product
+BATCH_ROWS = 4096
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags((1 / norms).astype(np.float32)) @ matrix)
+
+
+def feature_matrices(icon_tags, ids, thesaurus=None):
+    """
+    (tags, categories): CSR matrices with one L2-normalized row per id.
+    Tags are TF-IDF weighted; categories are plain membership.
+    """
+    vocab = Vocabulary(thesaurus)
+    categories = {}
+    tag_rows, tag_cols, cat_rows, cat_cols = [], [], [], []
+    for row, icon_id in enumerate(ids):
+        entry = icon_tags.get(icon_id, {})
+        terms = {vocab.add(tag) for tag in entry.get("tags", [])} - {None}
+        tag_rows.extend([row] * len(terms))
+        tag_cols.extend(terms)
+        cats = {categories.setdefault(c, len(categories)) for c in entry.get("categories", [])}
+        cat_rows.extend([row] * len(cats))
+        cat_cols.extend(cats)
+
+    n = len(ids)
+    tags = sparse.csr_matrix((np.ones(len(tag_cols), dtype=np.float32), (tag_rows, tag_cols)),
+                             shape=(n, len(vocab.ids)))
+    # Smoothed IDF: rare shared tags say more than common ones
+    df = np.bincount(tags.indices, minlength=tags.shape[1])
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    tags = normalize_rows(tags @ sparse.diags(idf))
+
+    cats = sparse.csr_matrix((np.ones(len(cat_cols), dtype=np.float32), (cat_rows, cat_cols)),
+                             shape=(n, len(categories)))
+    return tags, normalize_rows(cats)
+
+
+def top_k_neighbors(tags, cats, k=DEFAULT_K, category_weight=CATEGORY_WEIGHT):
+    """
+    (indices, scores), both (n, k): the k most similar rows per row, best first.
+    Rows with fewer candidates are padded with index -1.
+    """
+    n = tags.shape[0]
+    indices = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if n < 2 or k == 0:
+        return indices, scores
+
+    transposed = tags.T.tocsr()
+    # Icons share a handful of distinct category sets, so category similarity is a table lookup
+    cat_sets, cat_code = np.unique(cats.toarray(), axis=0, return_inverse=True)
+    cat_code = cat_code.ravel()
+    cat_sims = (cat_sets @ cat_sets.T).astype(np.float32)
+
+    for start in range(0, n, BATCH_ROWS):
+        stop = min(start + BATCH_ROWS, n)
+        product = tags[start:stop] @ transposed
+        product.sort_indices()
+        product = product.tocoo()
+        rows, cols, sims = product.row, product.col, product.data
+        keep = rows + start != cols                                  # never your own neighbour
+        rows, cols, sims = rows[keep], cols[keep], sims[keep]
+        if category_weight:
+            sims = (1 - category_weight) * sims + category_weight * cat_sims[cat_code[rows + start], cat_code[cols]]
+
+        # One sort groups the pairs by row, best first: scores are in [0, 1], so row * 2 + (1 - score) orders both
+        order = np.argsort(rows * 2.0 + (1.0 - np.clip(sims, 0, 1)), kind="stable")
+        rows, cols, sims = rows[order], cols[order], sims[order]
+        row_start = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=stop - start))[:-1]))
+        rank = np.arange(len(rows)) - row_start[rows]
+        top = rank < k
+        indices[rows[top] + start, rank[top]] = cols[top]
+        scores[rows[top] + start, rank[top]] = sims[top]
+    return indices, scores
+
+
+def related_icons(icon_tags, ids, k=DEFAULT_K, thesaurus=None):
+    """{icon id: [related icon ids]} for the given ids, using their entries in icon-tags.json."""
+    if not ids:
+        return {}
+    tags, cats = feature_matrices(icon_tags, ids, thesaurus)
+    indices, _ = top_k_neighbors(tags, cats, k)
+    return {icon_id: [ids[j] for j in row if j >= 0] for icon_id, row in zip(ids, indices)}
+
+
+def add_related(config, icon_tags, k=DEFAULT_K, thesaurus=None):
+    """Writes "related" into every config icon that has tags. Returns the number of icons updated."""
+    ids = [icon["id"] for icon in config.get("icons", []) if icon["id"] in icon_tags]
+    related = related_icons(icon_tags, ids, k, load_thesaurus() if thesaurus is None else thesaurus)
+    for icon in config.get("icons", []):
+        if icon["id"] in related:
+            icon["related"] = related[icon["id"]]
+        else:
+            icon.pop("related", None)
+    return len(related)
+
+
+def synthetic_tags(n_icons, tags_per_icon=10, n_categories=13, seed=0):
+    """
+    Random icon-tags.json-style data shaped like the real library: a flat Zipf
+    tag distribution (the most used tag is on ~7% of icons) and a few broad
+    categories, the largest covering over half of the icons.
+    """
+    rng = np.random.default_rng(seed)
+    n_terms = max(1000, n_icons)
+    weights = np.arange(1, n_terms + 1) ** -0.6
+    weights /= weights.sum()
+    terms = [f"term{i}" for i in range(n_terms)]
+    tags = rng.choice(n_terms, size=(n_icons, tags_per_icon), p=weights)
+    cat_weights = np.arange(1, n_categories + 1) ** -1.2
+    cats = rng.choice(n_categories, size=(n_icons, 2), p=cat_weights / cat_weights.sum())
+    return {
+        f"icon{i}": {"tags": [terms[t] for t in tags[i]], "categories": [f"cat{c}" for c in cats[i]]}
+        for i in range(n_icons)
+    }
+
+
+def benchmark(n_icons, k):
+    print(f"Generating {n_icons} synthetic icons...")
+    icon_tags = synthetic_tags(n_icons)
+    ids = list(icon_tags)
+
+    start = time.perf_counter()
+    tags, cats = feature_matrices(icon_tags, ids, {})
+    built = time.perf_counter()
+    indices, _ = top_k_neighbors(tags, cats, k)
+    done = time.perf_counter()
+
+    print(f"✓ {n_icons} icons, {tags.shape[1]} tag terms, {cats.shape[1]} categories, {tags.nnz} non-zeros")
+    print(f"   TF-IDF matrix: {built - start:.2f}s")
+    print(f"   Top-{k} neighbours: {done - built:.2f}s")
+    print(f"   Total: {done - start:.2f}s ({(indices >= 0).sum(axis=1).mean():.1f} neighbours per icon)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute related icons from shared tags.")
+    parser.add_argument("command", nargs="?", choices=["update", "benchmark"], default="update")
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--tags", default=DEFAULT_TAGS)
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help="neighbours per icon")
+    parser.add_argument("--icons", type=int, default=50000, help="benchmark size")
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        benchmark(args.icons, args.k)
+        return
+
+    for path in (args.config, args.tags):
+        if not os.path.exists(path):
+            sys.exit(f"❌ {path} not found")
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    with open(args.tags, "r", encoding="utf-8") as f:
+        icon_tags = json.load(f)
+
+    start = time.perf_counter()
+    count = add_related(config, icon_tags, args.k)
+    with open(args.config, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    print(f"✓ Related icons for {count} icons in {time.perf_counter() - start:.2f}s -> {args.config}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@ import os
 import sys
 from xml.etree import ElementTree as ET
 
+from transform_cache import cached_transform
+
+@cached_transform("masks")
 def convert_for_masks(src, dest):
     ET.register_namespace("", "http://www.w3.org/2000/svg")
     try:
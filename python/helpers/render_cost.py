@@ -0,0 +1,276 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from xml.etree import ElementTree as ET
+
+# Measures how long each sprite symbol takes to paint on the CPU.
+#
+#   python render_cost.py                                  dist/hs-icons-master.svg -> reports/render-cost.json
+#   python render_cost.py --compare old/hs-icons-master.svg
+#   python render_cost.py --compare reports/render-cost-before.json
+#
+# Every symbol becomes a standalone SVG and is rendered at the viewer's card
+# sizes (the preview is at most 110px, twice that on HiDPI screens). After one
+# warm-up render the median of several timed renders is kept, minus the time an
+# empty SVG takes at the same size (pixmap setup and PNG encoding, which would
+# otherwise dominate small icons). Icons are ranked by the sum over all sizes,
+# and totals are summed per asset type from the sprite config. `--compare` measures a second build the same way (or loads a
+# saved report) and lists the icons that got slower or faster.
+#
+# Needs a rasterizer: resvg-py (preferred) or cairosvg. resvg timings include
+# parsing and PNG encoding; cairosvg timings cover only the drawing.
+
+SVG_NS = "http://www.w3.org/2000/svg"
+DEFAULT_SPRITE = os.path.join("dist", "hs-icons-master.svg")
+DEFAULT_REPORT = os.path.join("reports", "render-cost.json")
+
+CARD_SIZES = (110, 220)
+DEFAULT_ITERATIONS = 5
+
+# Rendered to measure the fixed cost per render
+EMPTY_SVG = f'<svg xmlns="{SVG_NS}" viewBox="0 0 110 110"></svg>'.encode("utf-8")
+BASELINE_RUNS = 4
+BACKENDS = ("resvg", "cairosvg")
+
+# A change only counts when it is this large, relative and absolute
+CHANGE_RATIO = 0.2
+CHANGE_MS = 0.05
+
+
+class ResvgBackend:
+    name = "resvg"
+
+    def __init__(self):
+        import resvg_py
+        self._render = resvg_py.svg_to_bytes
+
+    def prepare(self, data):
+        return data.decode("utf-8")
+
+    def render(self, prepared, size):
+        # Icons have no text, so the system font database is not loaded
+        self._render(svg_string=prepared, width=size, height=size, skip_system_fonts=True)
+
+
+class CairoBackend:
+    name = "cairosvg"
+
+    def __init__(self):
+        from cairosvg.parser import Tree
+        from cairosvg.surface import PNGSurface
+        self._tree = Tree
+        self._surface = PNGSurface
+
+    def prepare(self, data):
+        return self._tree(bytestring=data)
+
+    def render(self, prepared, size):
+        # The surface draws the tree when it is created; the PNG is never encoded
+        self._surface(prepared, io.BytesIO(), 96, output_width=size, output_height=size)
+
+
+def load_backend(name="auto"):
+    """A rasterizer backend by name, or the first one installed for "auto"."""
+    classes = {"resvg": ResvgBackend, "cairosvg": CairoBackend}
+    for candidate in (BACKENDS if name == "auto" else (name,)):
+        try:
+            return classes[candidate]()
+        except (ImportError, OSError):  # cairosvg raises OSError when the cairo library is missing
+            continue
+    wanted = "resvg-py or cairosvg" if name == "auto" else name
+    sys.exit(f"❌ No rasterizer available: pip install {wanted}")
+
+
+def symbol_documents(sprite_source):
+    """[(id, standalone SVG bytes)] for every top-level <symbol> of a sprite (path or file-like)."""
+    ET.register_namespace("", SVG_NS)
+    documents = []
+    depth = 0
+    for event, el in ET.iterparse(sprite_source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and el.tag == f"{{{SVG_NS}}}symbol":
+            root = ET.Element(f"{{{SVG_NS}}}svg", {"viewBox": el.get("viewBox", "0 0 110 110")})
+            root.extend(list(el))
+            documents.append((el.get("id"), ET.tostring(root, encoding="utf-8")))
+            el.clear()
+    return documents
+
+
+def load_types(sprite_path):
+    """{icon id: asset type} from the sprite's config, if there is one."""
+    config_path = f"{os.path.splitext(sprite_path)[0]}-config.json"
+    if not os.path.exists(config_path):
+        print(f"ℹ️  {config_path} not found - asset types unknown")
+        return {}
+    with open(config_path, "r", encoding="utf-8") as f:
+        return {icon["id"]: icon.get("type", "general") for icon in json.load(f).get("icons", [])}
+
+
+def time_symbol(backend, data, sizes, iterations):
+    """{size: median ms} for one standalone SVG."""
+    prepared = backend.prepare(data)
+    timings = {}
+    for size in sizes:
+        backend.render(prepared, size)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            backend.render(prepared, size)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[str(size)] = round(statistics.median(samples), 4)
+    return timings
+
+
+def profile_sprite(sprite_path, backend, sizes=CARD_SIZES, iterations=DEFAULT_ITERATIONS):
+    """Renders every symbol and returns the report (ranking slowest first, totals per type)."""
+    types = load_types(sprite_path)
+    documents = symbol_documents(sprite_path)
+    rows, failed = [], []
+    start = time.perf_counter()
+    baseline = time_symbol(backend, EMPTY_SVG, sizes, iterations * BASELINE_RUNS)
+    for n, (icon_id, data) in enumerate(documents, 1):
+        try:
+            ms = {size: round(max(0.0, t - baseline[size]), 4)
+                  for size, t in time_symbol(backend, data, sizes, iterations).items()}
+        except Exception as e:
+            failed.append({"id": icon_id, "error": str(e)})
+            continue
+        rows.append({"id": icon_id, "type": types.get(icon_id, "general"), "bytes": len(data),
+                     "ms": ms, "total": round(sum(ms.values()), 4)})
+        if n % 100 == 0:
+            print(f"   {n}/{len(documents)} symbols...")
+    rows.sort(key=lambda r: r["total"], reverse=True)
+    return {
+        "sprite": sprite_path,
+        "backend": backend.name,
+        "sizes": list(sizes),
+        "iterations": iterations,
+        "baseline": baseline,
+        "seconds": round(time.perf_counter() - start, 2),
+        "total": round(sum(r["total"] for r in rows), 3),
+        "byType": summarize_by_type(rows),
+        "failed": failed,
+        "ranking": rows,
+    }
+
+
+def summarize_by_type(rows):
+    summary = {}
+    for row in rows:
+        summary.setdefault(row["type"], []).append(row)
+    result = {}
+    for asset_type, group in sorted(summary.items()):
+        totals = sorted(r["total"] for r in group)
+        result[asset_type] = {
+            "icons": len(group),
+            "total": round(sum(totals), 3),
+            "mean": round(statistics.mean(totals), 4),
+            "p95": totals[min(len(totals) - 1, int(0.95 * len(totals)))],
+            "max": totals[-1],
+            "slowest": group[0]["id"],
+        }
+    return result
+
+
+def compare_reports(before, after, ratio=CHANGE_RATIO, min_ms=CHANGE_MS):
+    """Per-icon and per-type differences between two reports (after - before)."""
+    old = {r["id"]: r for r in before["ranking"]}
+    new = {r["id"]: r for r in after["ranking"]}
+    changed = []
+    for icon_id in old.keys() & new.keys():
+        a, b = old[icon_id]["total"], new[icon_id]["total"]
+        if abs(b - a) >= min_ms and abs(b - a) >= ratio * a:
+            changed.append({"id": icon_id, "type": new[icon_id]["type"], "before": a, "after": b,
+                            "delta": round(b - a, 4)})
+    changed.sort(key=lambda c: c["delta"], reverse=True)
+    types = sorted(before["byType"].keys() | after["byType"].keys())
+    return {
+        "total": {"before": before["total"], "after": after["total"]},
+        "byType": {t: {"before": before["byType"].get(t, {}).get("total", 0),
+                       "after": after["byType"].get(t, {}).get("total", 0)} for t in types},
+        "slower": [c for c in changed if c["delta"] > 0],
+        "faster": [c for c in reversed(changed) if c["delta"] < 0],
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+    }
+
+
+def print_report(report, top=15):
+    sizes = "/".join(str(s) for s in report["sizes"])
+    baseline = "/".join(f"{report['baseline'][str(s)]:.3f}" for s in report["sizes"])
+    print(f"\n🖌️  {len(report['ranking'])} symbols rendered with {report['backend']} at {sizes}px "
+          f"({report['iterations']} runs each, {report['seconds']}s): {report['total']:.1f} ms per full pass")
+    print(f"   Fixed cost per render ({baseline} ms) is subtracted")
+    for asset_type, s in report["byType"].items():
+        print(f"   {asset_type:<12} {s['icons']:>4} icons  {s['total']:>8.1f} ms  "
+              f"mean {s['mean']:.3f}  p95 {s['p95']:.3f}  max {s['max']:.3f} ({s['slowest']})")
+    print(f"\n📊 Slowest symbols:")
+    for row in report["ranking"][:top]:
+        per_size = "  ".join(f"{row['ms'][str(s)]:.3f}" for s in report["sizes"])
+        print(f"   {row['total']:>7.3f} ms  ({per_size})  {row['id']} ({row['type']})")
+    for f in report["failed"]:
+        print(f"⚠️  {f['id']}: {f['error']}")
+
+
+def print_comparison(diff, top=15):
+    total = diff["total"]
+    change = (total["after"] - total["before"]) / total["before"] * 100 if total["before"] else 0
+    print(f"\n🔀 Full pass: {total['before']:.1f} ms -> {total['after']:.1f} ms ({change:+.1f}%)")
+    for asset_type, t in diff["byType"].items():
+        print(f"   {asset_type:<12} {t['before']:>8.1f} -> {t['after']:>8.1f} ms")
+    for label, rows in (("Slower", diff["slower"]), ("Faster", diff["faster"])):
+        if rows:
+            print(f"{label} ({len(rows)}):")
+            for c in rows[:top]:
+                print(f"   {c['before']:.3f} -> {c['after']:.3f} ms  {c['id']} ({c['type']})")
+    if diff["added"] or diff["removed"]:
+        print(f"ℹ️  {len(diff['added'])} symbols added, {len(diff['removed'])} removed")
+    if not diff["slower"] and not diff["faster"]:
+        print(f"✓ No symbol changed by more than {CHANGE_RATIO:.0%}")
+
+
+def load_or_profile(path, backend_name, sizes, iterations):
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return profile_sprite(path, load_backend(backend_name), sizes, iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank sprite symbols by CPU render time.")
+    parser.add_argument("sprite", nargs="?", default=DEFAULT_SPRITE, help="sprite SVG (default: dist/hs-icons-master.svg)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(CARD_SIZES), help="render sizes in px")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="timed renders per size")
+    parser.add_argument("--backend", choices=("auto",) + BACKENDS, default="auto")
+    parser.add_argument("-o", "--output", default=DEFAULT_REPORT, help="report JSON")
+    parser.add_argument("--compare", metavar="SPRITE_OR_REPORT", help="an older sprite build or saved report")
+    args = parser.parse_args()
+
+    for path in filter(None, (args.sprite, args.compare)):
+        if not os.path.exists(path):
+            sys.exit(f"❌ {path} not found")
+
+    report = load_or_profile(args.sprite, args.backend, args.sizes, args.iterations)
+    print_report(report)
+    if not args.sprite.endswith(".json"):
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"ℹ️  Full ranking: {args.output}")
+
+    if args.compare:
+        before = load_or_profile(args.compare, args.backend, args.sizes, args.iterations)
+        if (before["backend"], before["sizes"]) != (report["backend"], report["sizes"]):
+            print(f"⚠️  {args.compare} was measured with {before['backend']} at {before['sizes']} - timings are not comparable")
+        print_comparison(compare_reports(before, report))
+
+
+if __name__ == "__main__":
+    main()
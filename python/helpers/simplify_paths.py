@@ -0,0 +1,286 @@
+import io
+import os
+import re
+import sys
+import json
+import math
+import argparse
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+from svg_geometry import (local_name, parse_transform, path_cubics, format_number, analyze,
+                          NUMBER_RE, IDENTITY, EPSILON)
+from transform_cache import cached_transform
+
+# Reduces path nodes within a visual tolerance given in viewBox units.
+#
+# Each subpath is flattened to a polyline (curves are sampled just finely
+# enough to stay within a quarter of the tolerance), then Douglas-Peucker keeps
+# only the points needed to stay within half of it; the last quarter covers
+# rounding of the written coordinates. A subpath is only replaced when the
+# result has fewer nodes and fewer bytes than the original, so smooth curves
+# that are already compact are left alone.
+#
+#   python simplify_paths.py "svg/wireblocks" --tolerance 0.1              # report only
+#   python simplify_paths.py "svg/wireblocks" --tolerance 0.1 -o simplified
+
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Path parsing and number formatting live in svg_geometry.py, so its code is part of the cache key
+PIPELINE_DEPENDS = [os.path.join(HELPERS_DIR, "svg_geometry.py")]
+
+SVG_NS = "http://www.w3.org/2000/svg"
+DEFAULT_TOLERANCE = 0.1
+
+# Curves never get more samples than this per segment
+MAX_SAMPLES = 64
+
+SUBPATH_RE = re.compile(r"(?=[Mm])")
+MOVETO_RE = re.compile(r"^\s*([Mm])\s*(" + NUMBER_RE.pattern + r")\s*,?\s*(" + NUMBER_RE.pattern + r")")
+
+
+def precision_for(tolerance):
+    """Decimal places whose rounding error stays within a quarter of the tolerance."""
+    places = 0
+    while 0.5 * 10 ** -places * math.sqrt(2) > tolerance / 4 and places < 6:
+        places += 1
+    return places
+
+
+def flatten(cubics, tolerance):
+    """
+    Samples (N, 4, 2) cubics into a polyline whose distance to the curves is
+    within `tolerance`. Lines get no extra samples.
+    """
+    p0, p1, p2, p3 = cubics[:, 0], cubics[:, 1], cubics[:, 2], cubics[:, 3]
+    # Uniform subdivision into n parts deviates by at most 3/4 * max|second difference| / n^2
+    dd = np.maximum(np.linalg.norm(p0 - 2 * p1 + p2, axis=1), np.linalg.norm(p1 - 2 * p2 + p3, axis=1))
+    steps = np.clip(np.ceil(np.sqrt(0.75 * dd / tolerance)), 1, MAX_SAMPLES).astype(int)
+
+    owner = np.repeat(np.arange(len(cubics)), steps)
+    first = np.cumsum(steps) - steps
+    t = ((np.arange(steps.sum()) - first[owner] + 1) / steps[owner])[:, None]
+    mt = 1 - t
+    pts = (mt ** 3) * p0[owner] + 3 * (mt ** 2) * t * p1[owner] + 3 * mt * (t ** 2) * p2[owner] + (t ** 3) * p3[owner]
+    return np.vstack([cubics[:1, 0], pts])
+
+
+def douglas_peucker(points, tolerance):
+    """Indices of the points to keep (always including both ends)."""
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        chord = b - a
+        length = math.hypot(chord[0], chord[1])
+        if length < EPSILON:
+            # Closed ring: measure from the shared end point
+            dist = np.linalg.norm(inner - a, axis=1)
+        else:
+            dist = np.abs(chord[0] * (inner[:, 1] - a[1]) - chord[1] * (inner[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
+
+
+def polyline_data(points, closed, places):
+    """'M x y l dx dy ...[z]' with relative steps taken between rounded points."""
+    rounded = np.round(points, places)
+    if closed and len(rounded) > 1 and np.allclose(rounded[0], rounded[-1]):
+        rounded = rounded[:-1]
+    fmt = lambda v: format_number(v, places)
+    parts = [f"M{fmt(rounded[0, 0])} {fmt(rounded[0, 1])}"]
+    if len(rounded) > 1:
+        steps = np.diff(rounded, axis=0)
+        parts.append("l" + " ".join(f"{fmt(dx)} {fmt(dy)}" for dx, dy in steps))
+    if closed:
+        parts.append("z")
+    return re.sub(r" -", "-", "".join(parts))
+
+
+def absolute_start(chunk, current):
+    """Rewrites a subpath's leading moveto as absolute. Returns (text, start point)."""
+    match = MOVETO_RE.match(chunk)
+    if not match:
+        raise ValueError(f"Bad subpath {chunk[:20]!r}")
+    command, x, y = match.group(1), float(match.group(2)), float(match.group(3))
+    start = np.array([x, y]) + (current if command == "m" else 0)
+    rest = chunk[match.end():]
+    # Pairs after a relative moveto are relative linetos; keep them that way
+    if command == "m" and NUMBER_RE.match(rest.lstrip(" ,\t\r\n")):
+        rest = "l" + rest.lstrip(" ,\t\r\n")
+    return f"M{format_number(start[0], 6)} {format_number(start[1], 6)}{rest}", start
+
+
+def simplify_path_data(d, tolerance, places):
+    """Returns (new d, nodes before, nodes after). Unchanged paths come back as-is."""
+    chunks = [c for c in SUBPATH_RE.split(d.strip()) if c.strip()]
+    current = np.zeros(2)
+    out, before, after, changed = [], 0, 0, False
+    for chunk in chunks:
+        text, start = absolute_start(chunk, current)
+        cubics, nodes = path_cubics(text)
+        before += nodes
+        stripped = text.rstrip()
+        closes = len(re.findall(r"[Zz]", stripped))
+        closed = stripped[-1:] in ("Z", "z")
+        current = start if closed or not cubics else np.asarray(cubics[-1][3], dtype=float)
+
+        # Only plain subpaths (at most one closepath, at the end) are rewritten
+        if cubics and closes <= int(closed):
+            points = flatten(np.asarray(cubics, dtype=float), tolerance / 4)
+            kept = points[douglas_peucker(points, tolerance / 2)]
+            candidate = polyline_data(kept, closed, places)
+            kept_nodes = len(kept) - (1 if closed and len(kept) > 1 and np.allclose(kept[0], kept[-1]) else 0)
+            if kept_nodes < nodes and len(candidate) < len(stripped):
+                out.append(candidate)
+                after += kept_nodes
+                changed = True
+                continue
+        out.append(text)
+        after += nodes
+    return ("".join(out) if changed else d), before, after
+
+
+def simplify_points(points_attr, closed, tolerance, places):
+    nums = [float(n) for n in NUMBER_RE.findall(points_attr or "")]
+    points = np.array(nums[:len(nums) // 2 * 2], dtype=float).reshape(-1, 2)
+    if len(points) < 3:
+        return points_attr
+    if closed:
+        points = np.vstack([points, points[:1]])
+    kept = points[douglas_peucker(points, tolerance * 3 / 4)]
+    if closed:
+        kept = kept[:-1]
+    rounded = np.round(kept, places)
+    text = " ".join(f"{format_number(x, places)},{format_number(y, places)}" for x, y in rounded)
+    return text if len(rounded) < len(points) - int(closed) else points_attr
+
+
+def simplify_tree(root, tolerance=DEFAULT_TOLERANCE):
+    """
+    Simplifies every path, polyline and polygon under `root` in place.
+    The tolerance is in the root's user units; element transforms are taken into account.
+    """
+    def walk(el, matrix):
+        if el is not root:
+            matrix = matrix @ parse_transform(el.get("transform"))
+        tag = local_name(el.tag)
+        scale = math.sqrt(abs(np.linalg.det(matrix[:2, :2]))) or 1.0
+        local_tol = tolerance / scale
+        places = precision_for(local_tol)
+        if tag == "path" and el.get("d"):
+            try:
+                d, _, _ = simplify_path_data(el.get("d"), local_tol, places)
+            except ValueError:
+                return
+            el.set("d", d)
+        elif tag in ("polyline", "polygon") and el.get("points"):
+            el.set("points", simplify_points(el.get("points"), tag == "polygon", local_tol, places))
+        for child in el:
+            walk(child, matrix)
+
+    walk(root, IDENTITY)
+    return root
+
+
+@cached_transform("simplify", params=lambda: {"max_samples": MAX_SAMPLES})
+def simplify_svg(input_path, output_path, tolerance=DEFAULT_TOLERANCE):
+    ET.register_namespace("", SVG_NS)
+    tree = ET.parse(input_path)
+    simplify_tree(tree.getroot(), tolerance)
+    tree.write(output_path, encoding="utf-8", xml_declaration=True)
+
+
+def measure(data):
+    return {"bytes": len(data), "nodes": analyze(ET.fromstring(data))["nodes"]}
+
+
+def simplify_folder(folder, tolerance, output_dir=None):
+    """Simplifies every SVG in `folder`. Returns report rows; writes results when output_dir is set."""
+    rows = []
+    for filename in sorted(os.listdir(folder)):
+        if not filename.lower().endswith(".svg"):
+            continue
+        with open(os.path.join(folder, filename), "rb") as f:
+            data = f.read()
+        out = simplify_bytes(data, tolerance)
+        before, after = measure(data), measure(out)
+        rows.append({"file": os.path.join(folder, filename),
+                     "nodes": [before["nodes"], after["nodes"]],
+                     "bytes": [before["bytes"], after["bytes"]]})
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, filename), "wb") as f:
+                f.write(out)
+    return rows
+
+
+def simplify_bytes(data, tolerance=DEFAULT_TOLERANCE):
+    out = io.BytesIO()
+    simplify_svg(io.BytesIO(data), out, tolerance=tolerance)
+    return out.getvalue()
+
+
+def print_report(rows, top=10):
+    nodes_before = sum(r["nodes"][0] for r in rows)
+    nodes_after = sum(r["nodes"][1] for r in rows)
+    bytes_before = sum(r["bytes"][0] for r in rows)
+    bytes_after = sum(r["bytes"][1] for r in rows)
+    changed = [r for r in rows if r["nodes"][1] < r["nodes"][0]]
+    changed.sort(key=lambda r: r["bytes"][0] - r["bytes"][1], reverse=True)
+
+    print(f"\n📉 Simplified {len(changed)} of {len(rows)} files")
+    for r in changed[:top]:
+        print(f"   {os.path.basename(r['file'])}: {r['nodes'][0]} → {r['nodes'][1]} nodes, "
+              f"{r['bytes'][0]} → {r['bytes'][1]} B")
+    if rows:
+        print(f"   Total: {nodes_before} → {nodes_after} nodes ({pct(nodes_before, nodes_after)}), "
+              f"{bytes_before} → {bytes_after} B ({pct(bytes_before, bytes_after)})")
+
+
+def pct(before, after):
+    return f"-{(before - after) / before * 100:.1f}%" if before else "0%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reduce path nodes within a tolerance in viewBox units.")
+    parser.add_argument("folders", nargs="+", help='source folders, e.g. "svg/wireblocks"')
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("-o", "--output", help="write simplified files here (default: report only)")
+    parser.add_argument("--report", help="write the per-file report as JSON")
+    args = parser.parse_args()
+
+    if args.tolerance <= 0:
+        sys.exit("❌ Tolerance must be positive")
+
+    rows = []
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            sys.exit(f"❌ Folder not found: {folder}")
+        rows.extend(simplify_folder(folder, args.tolerance, args.output))
+
+    print_report(rows)
+    if args.report:
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"tolerance": args.tolerance, "files": rows}, f, indent=2)
+        print(f"ℹ️  Report: {args.report}")
+    if args.output:
+        print(f"✓ Files saved in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
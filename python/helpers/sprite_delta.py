@@ -0,0 +1,210 @@
+import sys
+import json
+import hashlib
+import argparse
+from xml.etree import ElementTree as ET
+
+# Symbol-level deltas between two builds of the sprite.
+#
+#   python sprite_delta.py diff old.svg new.svg -o delta.json
+#   python sprite_delta.py apply old.svg delta.json -o new.svg
+#   python sprite_delta.py verify old.svg new.svg delta.json
+#
+# Symbols are compared by the hash of their canonical (C14N) XML with rewritten
+# prefixes, so namespace prefixes (whichever ones the process has registered with
+# ElementTree) and attribute order do not count as changes, and every process
+# computes the same version ids.
+
+SVG_NS = "http://www.w3.org/2000/svg"
+VERSION_LENGTH = 16
+
+
+def local_name(tag):
+    return tag.split('}', 1)[1] if '}' in tag else tag
+
+
+def symbol_hash(symbol):
+    canonical = ET.canonicalize(ET.tostring(symbol, encoding="unicode"), strip_text=True, rewrite_prefixes=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def parse_symbols(sprite_bytes):
+    """
+    Returns (root, {id: symbol element}) keeping sprite order. Raises ValueError
+    on a duplicate id, which would otherwise drop a symbol from the delta.
+    """
+    root = ET.fromstring(sprite_bytes)
+    symbols = {}
+    for el in root:
+        if local_name(el.tag) == "symbol" and el.get("id"):
+            if el.get("id") in symbols:
+                raise ValueError(f"Duplicate symbol id '{el.get('id')}' in sprite")
+            symbols[el.get("id")] = el
+    return root, symbols
+
+
+def version_of(hashes):
+    """Version id of a sprite: hash over (id, symbol hash) in sprite order."""
+    h = hashlib.sha256()
+    for icon_id, digest in hashes.items():
+        h.update(icon_id.encode("utf-8"))
+        h.update(b"\0")
+        h.update(digest.encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()[:VERSION_LENGTH]
+
+
+def symbol_hashes(sprite_bytes):
+    _, symbols = parse_symbols(sprite_bytes)
+    return {icon_id: symbol_hash(el) for icon_id, el in symbols.items()}
+
+
+def sprite_version(sprite_bytes):
+    return version_of(symbol_hashes(sprite_bytes))
+
+
+def compute_delta(old_bytes, new_bytes, sprite_name=None):
+    """
+    Returns {"from", "to", "added", "changed", "removed"[, "order"]}.
+    "added"/"changed" hold the serialized <symbol> elements; "order" is only
+    included when the new order is not simply old order minus removed plus added.
+    """
+    ET.register_namespace("", SVG_NS)
+    _, old_symbols = parse_symbols(old_bytes)
+    _, new_symbols = parse_symbols(new_bytes)
+    old_hashes = {k: symbol_hash(v) for k, v in old_symbols.items()}
+    new_hashes = {k: symbol_hash(v) for k, v in new_symbols.items()}
+
+    added, changed = {}, {}
+    for icon_id, digest in new_hashes.items():
+        if icon_id not in old_hashes:
+            added[icon_id] = ET.tostring(new_symbols[icon_id], encoding="unicode")
+        elif old_hashes[icon_id] != digest:
+            changed[icon_id] = ET.tostring(new_symbols[icon_id], encoding="unicode")
+    removed = [icon_id for icon_id in old_hashes if icon_id not in new_hashes]
+
+    delta = {
+        "from": version_of(old_hashes),
+        "to": version_of(new_hashes),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+    }
+    if sprite_name:
+        delta = {"sprite": sprite_name, **delta}
+
+    implied_order = [i for i in old_hashes if i in new_hashes] + list(added)
+    if implied_order != list(new_hashes):
+        delta["order"] = list(new_hashes)
+    return delta
+
+
+def apply_delta(old_bytes, delta):
+    """
+    Patches an old sprite forward. Raises ValueError if the sprite is not the
+    version the delta was made from, or if the result does not hash to delta["to"].
+    """
+    ET.register_namespace("", SVG_NS)
+    root, old_symbols = parse_symbols(old_bytes)
+    old_hashes = {k: symbol_hash(v) for k, v in old_symbols.items()}
+    if version_of(old_hashes) != delta["from"]:
+        raise ValueError(f"Sprite is version {version_of(old_hashes)}, delta expects {delta['from']}")
+
+    symbols = dict(old_symbols)
+    for icon_id in delta["removed"]:
+        symbols.pop(icon_id, None)
+    for icon_id, xml in {**delta["changed"], **delta["added"]}.items():
+        symbols[icon_id] = ET.fromstring(xml)
+
+    removed = set(delta["removed"])
+    order = delta.get("order") or (
+        [i for i in old_symbols if i not in removed] + list(delta["added"])
+    )
+
+    # Keep any non-symbol children (defs etc.) ahead of the symbols
+    for el in list(root):
+        if local_name(el.tag) == "symbol":
+            root.remove(el)
+    for icon_id in order:
+        root.append(symbols[icon_id])
+
+    result = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    if sprite_version(result) != delta["to"]:
+        raise ValueError(f"Patched sprite does not match version {delta['to']}")
+    return result
+
+
+def verify(old_bytes, new_bytes, delta):
+    """True when the delta patches old into a sprite with the same symbols as new."""
+    return sprite_version(apply_delta(old_bytes, delta)) == sprite_version(new_bytes)
+
+
+def describe(delta):
+    return (f"{delta['from']} → {delta['to']}: "
+            f"+{len(delta['added'])} added, ~{len(delta['changed'])} changed, -{len(delta['removed'])} removed")
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol-level deltas between sprite builds.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("diff", help="write the delta from OLD to NEW")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("-o", "--output", help="delta JSON (default: stdout)")
+
+    p = sub.add_parser("apply", help="patch OLD forward with DELTA")
+    p.add_argument("old")
+    p.add_argument("delta")
+    p.add_argument("-o", "--output", required=True)
+
+    p = sub.add_parser("verify", help="check that DELTA turns OLD into NEW")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("delta")
+
+    p = sub.add_parser("version", help="print a sprite's version id")
+    p.add_argument("sprite")
+
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        delta = compute_delta(read(args.old), read(args.new))
+        content = json.dumps(delta, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(content)
+            print(f"✓ {describe(delta)}")
+        else:
+            print(content)
+    elif args.command == "apply":
+        with open(args.delta, "r", encoding="utf-8") as f:
+            delta = json.load(f)
+        try:
+            result = apply_delta(read(args.old), delta)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        with open(args.output, "wb") as f:
+            f.write(result)
+        print(f"✓ Patched to {delta['to']}: {args.output}")
+    elif args.command == "verify":
+        with open(args.delta, "r", encoding="utf-8") as f:
+            delta = json.load(f)
+        try:
+            ok = verify(read(args.old), read(args.new), delta)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        if not ok:
+            sys.exit("❌ Delta does not reproduce the new sprite")
+        print(f"✓ {describe(delta)}")
+    else:
+        print(sprite_version(read(args.sprite)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+from html import escape
+from xml.parsers import expat
+from xml.etree import ElementTree as ET
+
+from sprite_delta import sprite_version
+
+# Byte-offset index for the sprite, so single icons can be pulled out without parsing it.
+#
+#   <name>-index.json   {"size", "spriteVersion", "namespaces", "symbols": {id: [offset, length]}}
+#
+#   reader = SpriteReader("dist/hs-icons-master.svg")
+#   reader.symbol("Business_Barcode")                     # b'<symbol id="Business_Barcode" ...>...</symbol>'
+#   reader.svg("Business_Barcode", {"class": "icon"})      # standalone '<svg xmlns=... viewBox=...>...</svg>'
+#
+# The build writes the sprite by atomic rename, so a reader that is already
+# mapped keeps seeing the previous file until it is reopened.
+
+SVG_NS = "http://www.w3.org/2000/svg"
+VIEWBOX_RE = re.compile(rb'\sviewBox="([^"]*)"')
+
+
+def index_path_for(sprite_path):
+    return f"{os.path.splitext(sprite_path)[0]}-index.json"
+
+
+def build_index(sprite_bytes, version=None):
+    """
+    Offsets of every top-level <symbol> in the serialized sprite, found with
+    one expat pass. Returns the index document.
+    """
+    parser = expat.ParserCreate()
+    symbols = {}
+    namespaces = {}
+    depth = 0
+    current = None
+
+    def start(name, attrs):
+        nonlocal depth, current
+        depth += 1
+        if depth == 1:
+            # Prefixes declared on the sprite root (e.g. xlink) are needed by standalone copies
+            namespaces.update({k: v for k, v in attrs.items() if k.startswith("xmlns:")})
+        elif depth == 2 and name.rpartition(":")[2] == "symbol" and attrs.get("id"):
+            current = (attrs["id"], parser.CurrentByteIndex)
+
+    def end(name):
+        nonlocal depth, current
+        if depth == 2 and current:
+            icon_id, offset = current
+            # The index points at the end tag (or at the tag itself for <symbol ... />)
+            stop = sprite_bytes.index(b">", parser.CurrentByteIndex) + 1
+            symbols[icon_id] = [offset, stop - offset]
+            current = None
+        depth -= 1
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.Parse(sprite_bytes, True)
+
+    index = {"size": len(sprite_bytes), "namespaces": namespaces, "symbols": symbols}
+    if version:
+        index["spriteVersion"] = version
+    return index
+
+
+def write_index(index, path):
+    # Written by rename, like the sprite, so readers never load a half-written index
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class SpriteReader:
+    """
+    Memory-maps a sprite and serves single symbols by id in O(1) using its index.
+    Safe to share across threads; open one per process after forking.
+    """
+
+    def __init__(self, sprite_path, index_path=None):
+        self.sprite_path = sprite_path
+        with open(index_path or index_path_for(sprite_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        self.symbols = index["symbols"]
+        self.version = index.get("spriteVersion")
+        self._namespaces = "".join(f' {k}="{escape(v)}"' for k, v in index.get("namespaces", {}).items())
+
+        self._file = open(sprite_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size != index["size"]:
+            self._file.close()
+            raise ValueError(f"{sprite_path} is {size} bytes, index expects {index['size']} - rebuild the index")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, icon_id):
+        return icon_id in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def ids(self):
+        return list(self.symbols)
+
+    def symbol(self, icon_id):
+        """The <symbol> element's bytes exactly as they appear in the sprite. Raises KeyError."""
+        offset, length = self.symbols[icon_id]
+        return self._map[offset:offset + length]
+
+    def svg(self, icon_id, attrs=None):
+        """
+        The icon as a standalone <svg> string with the symbol's viewBox.
+        `attrs` adds attributes to the root, e.g. {"class": "icon", "aria-hidden": "true"}.
+        """
+        data = self.symbol(icon_id)
+        head_end = data.index(b">") + 1
+        match = VIEWBOX_RE.search(data, 0, head_end)
+        extra = "".join(f' {name}="{escape(str(value))}"' for name, value in (attrs or {}).items())
+        view_box = f' viewBox="{match.group(1).decode("utf-8")}"' if match else ""
+        if data[head_end - 2:head_end] == b"/>":
+            body = ""
+        else:
+            body = data[head_end:data.rindex(b"</")].decode("utf-8")
+        return f'<svg xmlns="{SVG_NS}"{self._namespaces}{view_box}{extra}>{body}</svg>'
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check(sprite_path, index_path=None):
+    """Compares every indexed slice with a full parse of the sprite. Returns a list of problems."""
+    problems = []
+    with open(sprite_path, "rb") as f:
+        root = ET.fromstring(f.read())
+    parsed = {el.get("id"): el for el in root if el.tag.rpartition("}")[2] == "symbol"}
+    with SpriteReader(sprite_path, index_path) as reader:
+        for icon_id in parsed.keys() - reader.symbols.keys():
+            problems.append(f"{icon_id}: missing from index")
+        for icon_id in reader.ids():
+            if icon_id not in parsed:
+                problems.append(f"{icon_id}: not in sprite")
+                continue
+            try:
+                standalone = ET.fromstring(reader.svg(icon_id))
+            except ET.ParseError as e:
+                problems.append(f"{icon_id}: slice does not parse ({e})")
+                continue
+            expected = parsed[icon_id]
+            if (standalone.get("viewBox") != expected.get("viewBox")
+                    or len(standalone) != len(expected)
+                    or [c.tag for c in standalone] != [c.tag for c in expected]):
+                problems.append(f"{icon_id}: slice does not match the sprite")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Byte-offset index for single-icon lookups in the sprite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="write <sprite>-index.json")
+    p.add_argument("sprite")
+
+    p = sub.add_parser("get", help="print one icon")
+    p.add_argument("sprite")
+    p.add_argument("id")
+    p.add_argument("--svg", action="store_true", help="standalone <svg> instead of the <symbol>")
+
+    p = sub.add_parser("check", help="verify the index against a full parse")
+    p.add_argument("sprite")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.sprite, "rb") as f:
+            data = f.read()
+        index = build_index(data, sprite_version(data))
+        path = index_path_for(args.sprite)
+        write_index(index, path)
+        print(f"✓ Indexed {len(index['symbols'])} symbols -> {path}")
+    elif args.command == "get":
+        with SpriteReader(args.sprite) as reader:
+            if args.id not in reader:
+                sys.exit(f"❌ No icon '{args.id}' in {args.sprite}")
+            print(reader.svg(args.id) if args.svg else reader.symbol(args.id).decode("utf-8"))
+    else:
+        problems = check(args.sprite)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✓ Index matches the sprite")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+import re
+import math
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+# Geometry bounds for SVG icons.
+#
+# Every shape (path data, rect, circle, ellipse, line, polyline, polygon) is
+# turned into cubic Bezier segments - lines and quadratics convert exactly,
+# arcs use the standard <= 90 degree cubic approximation - and transformed into
+# the root's user space. Bounds are then the endpoints plus the derivative
+# roots of every cubic, solved for all segments at once with NumPy.
+
+CONTAINER_TAGS = {"svg", "g", "a", "switch"}
+SHAPE_TAGS = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon"}
+SKIP_TAGS = {"defs", "clipPath", "mask", "pattern", "marker", "symbol", "linearGradient",
+             "radialGradient", "filter", "style", "title", "desc", "metadata"}
+
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+COMMAND_RE = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]")
+TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+IDENTITY = np.eye(3)
+EPSILON = 1e-12
+
+
+def local_name(tag):
+    return tag.split('}', 1)[1] if '}' in tag else tag
+
+
+def parse_length(value, default=0.0):
+    if value is None:
+        return default
+    value = value.strip()
+    if not value or value.endswith("%"):
+        return default
+    match = NUMBER_RE.match(value)
+    return float(match.group()) if match else default
+
+
+def parse_style(style_str):
+    if not style_str:
+        return {}
+    pairs = [item.split(":", 1) for item in style_str.split(";") if ":" in item]
+    return {k.strip().lower(): v.strip() for k, v in pairs}
+
+
+def parse_transform(value):
+    """Returns the 3x3 matrix for an SVG transform attribute."""
+    matrix = IDENTITY.copy()
+    if not value:
+        return matrix
+    for name, args in TRANSFORM_RE.findall(value):
+        nums = [float(n) for n in NUMBER_RE.findall(args)]
+        if name == "matrix" and len(nums) == 6:
+            a, b, c, d, e, f = nums
+            m = np.array([[a, c, e], [b, d, f], [0, 0, 1]])
+        elif name == "translate" and nums:
+            tx, ty = nums[0], nums[1] if len(nums) > 1 else 0.0
+            m = np.array([[1, 0, tx], [0, 1, ty], [0, 0, 1]])
+        elif name == "scale" and nums:
+            sx, sy = nums[0], nums[1] if len(nums) > 1 else nums[0]
+            m = np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]])
+        elif name == "rotate" and nums:
+            angle = math.radians(nums[0])
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            m = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
+            if len(nums) == 3:
+                cx, cy = nums[1], nums[2]
+                m = np.array([[1, 0, cx], [0, 1, cy], [0, 0, 1]]) @ m @ np.array([[1, 0, -cx], [0, 1, -cy], [0, 0, 1]])
+        elif name == "skewX" and nums:
+            m = np.array([[1, math.tan(math.radians(nums[0])), 0], [0, 1, 0], [0, 0, 1]])
+        elif name == "skewY" and nums:
+            m = np.array([[1, 0, 0], [math.tan(math.radians(nums[0])), 1, 0], [0, 0, 1]])
+        else:
+            continue
+        matrix = matrix @ m
+    return matrix
+
+
+def tokenize_path(d):
+    """Yields command letters and numbers. Arc flags may be packed ("a1 1 0 011 5 5")."""
+    tokens = []
+    pos, length = 0, len(d)
+    command = None
+    arg_index = 0
+    while pos < length:
+        ch = d[pos]
+        if ch in " \t\r\n,":
+            pos += 1
+            continue
+        if COMMAND_RE.match(ch):
+            command = ch
+            arg_index = 0
+            tokens.append(ch)
+            pos += 1
+            continue
+        # Arc flags (4th and 5th argument of each 7) are single characters
+        if command in ("A", "a") and arg_index % 7 in (3, 4) and ch in "01":
+            tokens.append(float(ch))
+            arg_index += 1
+            pos += 1
+            continue
+        match = NUMBER_RE.match(d, pos)
+        if not match:
+            raise ValueError(f"Bad path data near {d[pos:pos + 20]!r}")
+        tokens.append(float(match.group()))
+        arg_index += 1
+        pos = match.end()
+    return tokens
+
+
+def line_cubic(p0, p1):
+    return [p0, p0 + (p1 - p0) / 3.0, p0 + (p1 - p0) * 2.0 / 3.0, p1]
+
+
+def quad_cubic(p0, q, p1):
+    return [p0, p0 + (q - p0) * 2.0 / 3.0, p1 + (q - p1) * 2.0 / 3.0, p1]
+
+
+def arc_cubics(p0, rx, ry, phi_deg, large_arc, sweep, p1):
+    """SVG endpoint arc -> list of cubic segments (SVG spec F.6.5 / F.6.6)."""
+    if np.allclose(p0, p1):
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx < EPSILON or ry < EPSILON:
+        return [line_cubic(p0, p1)]
+
+    phi = math.radians(phi_deg % 360)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (p0 - p1) / 2.0
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+
+    lam = (x1p ** 2) / (rx ** 2) + (y1p ** 2) / (ry ** 2)
+    if lam > 1:
+        scale = math.sqrt(lam)
+        rx, ry = rx * scale, ry * scale
+
+    num = rx ** 2 * ry ** 2 - rx ** 2 * y1p ** 2 - ry ** 2 * x1p ** 2
+    den = rx ** 2 * y1p ** 2 + ry ** 2 * x1p ** 2
+    coef = math.sqrt(max(num / den, 0.0)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    mid = (p0 + p1) / 2.0
+    cx = cos_phi * cxp - sin_phi * cyp + mid[0]
+    cy = sin_phi * cxp + cos_phi * cyp + mid[1]
+
+    def angle(ux, uy, vx, vy):
+        a = math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+        return a
+
+    theta1 = angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    dtheta = angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and dtheta > 0:
+        dtheta -= 2 * math.pi
+    elif sweep and dtheta < 0:
+        dtheta += 2 * math.pi
+
+    segments = max(1, int(math.ceil(abs(dtheta) / (math.pi / 2) - 1e-9)))
+    delta = dtheta / segments
+    k = 4.0 / 3.0 * math.tan(delta / 4.0)
+
+    def point(theta):
+        x, y = rx * math.cos(theta), ry * math.sin(theta)
+        return np.array([cos_phi * x - sin_phi * y + cx, sin_phi * x + cos_phi * y + cy])
+
+    def deriv(theta):
+        x, y = -rx * math.sin(theta), ry * math.cos(theta)
+        return np.array([cos_phi * x - sin_phi * y, sin_phi * x + cos_phi * y])
+
+    cubics = []
+    start = p0
+    for i in range(segments):
+        t1 = theta1 + i * delta
+        t2 = t1 + delta
+        end = p1 if i == segments - 1 else point(t2)
+        cubics.append([start, start + k * deriv(t1), end - k * deriv(t2), end])
+        start = end
+    return cubics
+
+
+def path_cubics(d):
+    """Returns (cubics, node_count) for path data in local coordinates."""
+    tokens = tokenize_path(d)
+    cubics = []
+    nodes = 0
+    pos = np.zeros(2)
+    start = np.zeros(2)
+    last_ctrl = None
+    last_cmd = None
+    i = 0
+    command = None
+
+    def take(n):
+        nonlocal i
+        values = tokens[i:i + n]
+        if len(values) < n or any(isinstance(v, str) for v in values):
+            raise ValueError("Truncated path data")
+        i += n
+        return values
+
+    while i < len(tokens):
+        if isinstance(tokens[i], str):
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            raise ValueError("Path data must start with a command")
+
+        upper = command.upper()
+        rel = command.islower()
+        base = pos if rel else np.zeros(2)
+
+        if upper == "Z":
+            # closepath takes no arguments; browsers stop drawing at a number after it
+            if i < len(tokens) and not isinstance(tokens[i], str):
+                raise ValueError(f"Number after closepath: {tokens[i]:g}")
+            if not np.allclose(pos, start):
+                cubics.append(line_cubic(pos, start))
+            pos = start.copy()
+            last_ctrl = None
+            last_cmd = "Z"
+            continue
+
+        if upper == "M":
+            x, y = take(2)
+            pos = base + (x, y)
+            start = pos.copy()
+            nodes += 1
+            # Further pairs after a moveto are implicit linetos
+            command = "l" if rel else "L"
+            last_ctrl = None
+            last_cmd = "M"
+            continue
+
+        if upper == "L":
+            x, y = take(2)
+            end = base + (x, y)
+            cubics.append(line_cubic(pos, end))
+            pos = end
+            last_ctrl = None
+        elif upper == "H":
+            (x,) = take(1)
+            end = np.array([pos[0] + x if rel else x, pos[1]])
+            cubics.append(line_cubic(pos, end))
+            pos = end
+            last_ctrl = None
+        elif upper == "V":
+            (y,) = take(1)
+            end = np.array([pos[0], pos[1] + y if rel else y])
+            cubics.append(line_cubic(pos, end))
+            pos = end
+            last_ctrl = None
+        elif upper == "C":
+            x1, y1, x2, y2, x, y = take(6)
+            c1, c2, end = base + (x1, y1), base + (x2, y2), base + (x, y)
+            cubics.append([pos, c1, c2, end])
+            pos, last_ctrl = end, c2
+        elif upper == "S":
+            x2, y2, x, y = take(4)
+            c1 = 2 * pos - last_ctrl if last_cmd in ("C", "S") and last_ctrl is not None else pos
+            c2, end = base + (x2, y2), base + (x, y)
+            cubics.append([pos, c1, c2, end])
+            pos, last_ctrl = end, c2
+        elif upper == "Q":
+            x1, y1, x, y = take(4)
+            q, end = base + (x1, y1), base + (x, y)
+            cubics.append(quad_cubic(pos, q, end))
+            pos, last_ctrl = end, q
+        elif upper == "T":
+            x, y = take(2)
+            q = 2 * pos - last_ctrl if last_cmd in ("Q", "T") and last_ctrl is not None else pos
+            end = base + (x, y)
+            cubics.append(quad_cubic(pos, q, end))
+            pos, last_ctrl = end, q
+        elif upper == "A":
+            rx, ry, rot, large_arc, sweep, x, y = take(7)
+            end = base + (x, y)
+            cubics.extend(arc_cubics(pos, rx, ry, rot, bool(large_arc), bool(sweep), end))
+            pos = end
+            last_ctrl = None
+        else:
+            raise ValueError(f"Unknown path command {command!r}")
+        nodes += 1
+        last_cmd = upper
+    return cubics, nodes
+
+
+def points_cubics(points, closed):
+    nums = [float(n) for n in NUMBER_RE.findall(points or "")]
+    pts = [np.array(nums[j:j + 2]) for j in range(0, len(nums) - 1, 2)]
+    cubics = [line_cubic(a, b) for a, b in zip(pts, pts[1:])]
+    if closed and len(pts) > 2:
+        cubics.append(line_cubic(pts[-1], pts[0]))
+    return cubics, len(pts)
+
+
+def ellipse_cubics(cx, cy, rx, ry):
+    if rx <= 0 or ry <= 0:
+        return []
+    p0 = np.array([cx + rx, cy])
+    p_mid = np.array([cx - rx, cy])
+    return (arc_cubics(p0, rx, ry, 0, False, True, p_mid)
+            + arc_cubics(p_mid, rx, ry, 0, False, True, p0))
+
+
+def shape_cubics(tag, el):
+    """(cubics, node_count) for one shape element, in its own coordinates."""
+    if tag == "path":
+        return path_cubics(el.get("d", ""))
+    if tag == "rect":
+        x, y = parse_length(el.get("x")), parse_length(el.get("y"))
+        w, h = parse_length(el.get("width")), parse_length(el.get("height"))
+        if w <= 0 or h <= 0:
+            return [], 0
+        corners = [np.array(p) for p in ((x, y), (x + w, y), (x + w, y + h), (x, y + h))]
+        return [line_cubic(a, b) for a, b in zip(corners, corners[1:] + corners[:1])], 4
+    if tag == "circle":
+        r = parse_length(el.get("r"))
+        return ellipse_cubics(parse_length(el.get("cx")), parse_length(el.get("cy")), r, r), 4
+    if tag == "ellipse":
+        return ellipse_cubics(parse_length(el.get("cx")), parse_length(el.get("cy")),
+                              parse_length(el.get("rx")), parse_length(el.get("ry"))), 4
+    if tag == "line":
+        p0 = np.array([parse_length(el.get("x1")), parse_length(el.get("y1"))])
+        p1 = np.array([parse_length(el.get("x2")), parse_length(el.get("y2"))])
+        return [line_cubic(p0, p1)], 2
+    if tag in ("polyline", "polygon"):
+        return points_cubics(el.get("points"), closed=(tag == "polygon"))
+    return [], 0
+
+
+def stroke_width_of(el, inherited):
+    """Stroke width if the element is stroked, else 0 (inherited is (stroke, width))."""
+    style = parse_style(el.get("style"))
+    stroke = style.get("stroke", el.get("stroke", inherited[0]))
+    width = style.get("stroke-width", el.get("stroke-width", inherited[1]))
+    return stroke, width
+
+
+def collect(root):
+    """
+    Walks the SVG tree. Returns (cubics array (N, 4, 2) in root user space,
+    node count, element count, max stroke width, errors). Shapes whose data
+    cannot be read are left out and described in errors.
+    """
+    all_cubics = []
+    counts = {"nodes": 0, "elements": 0, "stroke": 0.0}
+    errors = []
+
+    def walk(el, matrix, inherited):
+        tag = local_name(el.tag)
+        # The root is walked even when it is a <symbol>, which is skipped inside icons
+        if el is not root and tag in SKIP_TAGS:
+            return
+        style = parse_style(el.get("style"))
+        if el.get("display") == "none" or style.get("display") == "none":
+            return
+        if el is not root:
+            matrix = matrix @ parse_transform(el.get("transform"))
+        stroke, width = stroke_width_of(el, inherited)
+
+        if tag in SHAPE_TAGS:
+            try:
+                cubics, nodes = shape_cubics(tag, el)
+            except ValueError as e:
+                errors.append(f"<{tag}{' id=' + repr(el.get('id')) if el.get('id') else ''}>: {e}")
+                cubics, nodes = [], 0
+            counts["elements"] += 1
+            counts["nodes"] += nodes
+            if cubics:
+                pts = np.asarray(cubics, dtype=float)
+                ones = np.ones(pts.shape[:2] + (1,))
+                pts = (np.concatenate([pts, ones], axis=2) @ matrix.T)[..., :2]
+                all_cubics.append(pts)
+                if stroke and stroke.lower() != "none":
+                    scale = math.sqrt(abs(np.linalg.det(matrix[:2, :2]))) or 1.0
+                    counts["stroke"] = max(counts["stroke"], parse_length(width, 1.0) * scale)
+        elif tag in CONTAINER_TAGS or el is root:
+            for child in el:
+                walk(child, matrix, (stroke, width))
+
+    walk(root, IDENTITY, (None, "1"))
+    cubics = np.concatenate(all_cubics) if all_cubics else np.zeros((0, 4, 2))
+    return cubics, counts["nodes"], counts["elements"], counts["stroke"], errors
+
+
+def cubic_extrema_points(cubics):
+    """
+    All candidate extreme points of the cubics: the endpoints plus the points
+    where dx/dt or dy/dt is zero for 0 < t < 1. Returns (points (M, 2), owner index (M,)).
+    """
+    n = len(cubics)
+    if n == 0:
+        return np.zeros((0, 2)), np.zeros(0, dtype=int)
+    p0, p1, p2, p3 = cubics[:, 0], cubics[:, 1], cubics[:, 2], cubics[:, 3]
+
+    # B'(t)/3 = a t^2 + b t + c, per coordinate
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disc = b * b - 4 * a * c
+        sqrt_disc = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        quad = np.abs(a) > EPSILON
+        r1 = np.where(quad, (-b + sqrt_disc) / (2 * a), -c / b)
+        r2 = np.where(quad, (-b - sqrt_disc) / (2 * a), np.nan)
+
+    ts = np.concatenate([r1, r2], axis=1)          # (n, 4): two roots for x, two for y
+    valid = np.isfinite(ts) & (ts > 0) & (ts < 1)
+    ts = np.where(valid, ts, 0.0)                   # invalid roots evaluate to p0, which is harmless
+
+    t = ts[..., None]                               # (n, 4, 1)
+    mt = 1 - t
+    pts = (mt ** 3) * p0[:, None] + 3 * (mt ** 2) * t * p1[:, None] + 3 * mt * (t ** 2) * p2[:, None] + (t ** 3) * p3[:, None]
+
+    candidates = np.concatenate([p0[:, None], p3[:, None], pts], axis=1)   # (n, 6, 2)
+    owner = np.repeat(np.arange(n), candidates.shape[1])
+    return candidates.reshape(-1, 2), owner
+
+
+def bounds(cubics):
+    """(min_x, min_y, max_x, max_y) of a cubic array, or None when empty."""
+    if len(cubics) == 0:
+        return None
+    points, _ = cubic_extrema_points(cubics)
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    return float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])
+
+
+def batch_bounds(cubic_sets):
+    """
+    Bounds for many icons in one vectorized pass.
+    `cubic_sets` is a list of (N_i, 4, 2) arrays; returns a list of bounds tuples (None for empty sets).
+    """
+    sizes = np.array([len(c) for c in cubic_sets], dtype=int)
+    results = [None] * len(cubic_sets)
+    if sizes.sum() == 0:
+        return results
+    cubics = np.concatenate([c for c in cubic_sets if len(c)])
+    points, owner = cubic_extrema_points(cubics)
+
+    # Map every segment to its icon, then reduce per icon
+    icon_of_segment = np.repeat(np.arange(len(cubic_sets)), sizes)
+    icon = icon_of_segment[owner]
+    non_empty = np.flatnonzero(sizes)
+    starts = np.searchsorted(icon, non_empty)
+    mins = np.minimum.reduceat(points, starts, axis=0)
+    maxs = np.maximum.reduceat(points, starts, axis=0)
+    for k, idx in enumerate(non_empty):
+        results[idx] = (float(mins[k, 0]), float(mins[k, 1]), float(maxs[k, 0]), float(maxs[k, 1]))
+    return results
+
+
+def format_number(value, precision=3):
+    text = f"{value:.{precision}f}".rstrip("0").rstrip(".")
+    return "0" if text in ("-0", "") else text
+
+
+def viewbox_string(box, pad=0.0):
+    """'x y w h' for bounds, grown by `pad` on every side (e.g. half the stroke width)."""
+    min_x, min_y, max_x, max_y = box
+    return " ".join(format_number(v) for v in (min_x - pad, min_y - pad, max_x - min_x + 2 * pad, max_y - min_y + 2 * pad))
+
+
+def analyze(root):
+    """
+    Geometry summary for one parsed <svg>/<symbol> root:
+    {"bbox": [x, y, w, h], "area", "nodes", "elements", "stroke", "tightViewBox"}.
+    "area" is the bounding-box area; "tightViewBox" includes half the widest stroke.
+    An "errors" list is added when some shapes could not be read.
+    """
+    cubics, nodes, elements, stroke, errors = collect(root)
+    return summarize(bounds(cubics), nodes, elements, stroke, errors)
+
+
+def summarize(box, nodes, elements, stroke, errors=()):
+    info = {"nodes": nodes, "elements": elements}
+    if errors:
+        info["errors"] = list(errors)
+    if box is None:
+        info.update({"bbox": None, "area": 0.0, "tightViewBox": None})
+        return info
+    min_x, min_y, max_x, max_y = box
+    w, h = max_x - min_x, max_y - min_y
+    info.update({
+        "bbox": [round(min_x, 3), round(min_y, 3), round(w, 3), round(h, 3)],
+        "area": round(w * h, 3),
+        "tightViewBox": viewbox_string(box, stroke / 2.0),
+    })
+    return info
+
+
+def analyze_many(roots):
+    """analyze() for a list of roots, with the bounds computed in one batch."""
+    collected = [collect(root) for root in roots]
+    boxes = batch_bounds([c[0] for c in collected])
+    return [summarize(box, nodes, elements, stroke, errors)
+            for box, (_, nodes, elements, stroke, errors) in zip(boxes, collected)]
+
+
+def analyze_file(path):
+    return analyze(ET.parse(path).getroot())
+
+
+def main():
+    import json
+    import argparse
+    parser = argparse.ArgumentParser(description="Print the bounding box, area and node count of SVG files as JSON lines.")
+    parser.add_argument("files", nargs="+")
+    for file_path in parser.parse_args().files:
+        print(json.dumps({file_path: analyze_file(file_path)}))
+
+
+if __name__ == "__main__":
+    main()
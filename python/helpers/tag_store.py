@@ -0,0 +1,297 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+
+# SQLite-backed store for icon tags & categories.
+# Each icon is one row, so an edit touches one row instead of rewriting icon-tags.json.
+# icon-tags.json stays the build artifact: `export` materializes it from the store.
+
+DEFAULT_DB = "icon-tags.db"
+DEFAULT_JSON = os.path.join("dist", "icon-tags.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS icons (
+    position   INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         TEXT NOT NULL UNIQUE,
+    tags       TEXT NOT NULL DEFAULT '[]',
+    categories TEXT NOT NULL DEFAULT '[]',
+    version    INTEGER NOT NULL DEFAULT 1,
+    updated    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0), ('exported_generation', -1);
+"""
+
+
+class EmptyStoreError(Exception):
+    """Raised instead of exporting an empty store over icon-tags.json."""
+
+
+class ConflictError(Exception):
+    """Raised when a put is based on an outdated version of the icon."""
+
+    def __init__(self, icon_id, expected, actual):
+        super().__init__(f"'{icon_id}' is at version {actual}, not {expected}")
+        self.icon_id = icon_id
+        self.expected = expected
+        self.actual = actual
+
+
+def merge_unique(current, add=(), remove=()):
+    """Adds/removes values while keeping the existing order (new values go last)."""
+    removed = set(remove)
+    result = [v for v in current if v not in removed]
+    for value in add:
+        if value not in result and value not in removed:
+            result.append(value)
+    return result
+
+
+class TagStore:
+    """
+    Per-icon get/put/patch on top of SQLite in WAL mode.
+
+    Every write runs in its own IMMEDIATE transaction, so several editors
+    (tag manager tabs, scripts) can write concurrently. `patch` applies
+    add/remove operations to the current row, which means two people editing
+    the same icon merge instead of overwriting each other; `put` can be
+    guarded with `expected_version` for whole-record replacement.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write(self, fn):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn)
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_entry(row):
+        return {"tags": json.loads(row[0]), "categories": json.loads(row[1]), "version": row[2]}
+
+    @staticmethod
+    def _upsert(conn, icon_id, tags, categories):
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO icons (id, tags, categories, updated) VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                tags = excluded.tags,
+                categories = excluded.categories,
+                version = icons.version + 1,
+                updated = excluded.updated
+            """,
+            (icon_id, json.dumps(tags, ensure_ascii=False), json.dumps(categories, ensure_ascii=False), now),
+        )
+        return conn.execute("SELECT version FROM icons WHERE id = ?", (icon_id,)).fetchone()[0]
+
+    def get(self, icon_id):
+        """Returns {"tags", "categories", "version"} or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT tags, categories, version FROM icons WHERE id = ?", (icon_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_entry(row) if row else None
+
+    def put(self, icon_id, tags, categories, expected_version=None):
+        """Replaces an icon's tags and categories. Returns the new version."""
+        def apply(conn):
+            if expected_version is not None:
+                row = conn.execute("SELECT version FROM icons WHERE id = ?", (icon_id,)).fetchone()
+                actual = row[0] if row else 0
+                if actual != expected_version:
+                    raise ConflictError(icon_id, expected_version, actual)
+            return self._upsert(conn, icon_id, list(tags), list(categories))
+
+        return self._write(apply)
+
+    def patch(self, icon_id, add_tags=(), remove_tags=(), add_categories=(), remove_categories=()):
+        """Applies add/remove operations to the stored lists. Returns the updated entry."""
+        def apply(conn):
+            row = conn.execute("SELECT tags, categories FROM icons WHERE id = ?", (icon_id,)).fetchone()
+            tags, categories = (json.loads(row[0]), json.loads(row[1])) if row else ([], [])
+            tags = merge_unique(tags, add_tags, remove_tags)
+            categories = merge_unique(categories, add_categories, remove_categories)
+            version = self._upsert(conn, icon_id, tags, categories)
+            return {"tags": tags, "categories": categories, "version": version}
+
+        return self._write(apply)
+
+    def delete(self, icon_id):
+        return self._write(lambda conn: conn.execute("DELETE FROM icons WHERE id = ?", (icon_id,)).rowcount > 0)
+
+    def count(self):
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM icons").fetchone()[0]
+        finally:
+            conn.close()
+
+    def all(self):
+        """Returns the whole store in icon-tags.json shape, in insertion order."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT id, tags, categories FROM icons ORDER BY position").fetchall()
+        finally:
+            conn.close()
+        return {icon_id: {"tags": json.loads(tags), "categories": json.loads(categories)} for icon_id, tags, categories in rows}
+
+    def import_json(self, json_path, replace=False):
+        """
+        Bulk-loads an icon-tags.json file (new format) in one transaction.
+        Existing icons are overwritten; with replace=True icons missing from the file are dropped.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            return self.import_data(json.load(f), replace)
+
+    def import_data(self, data, replace=False):
+        """import_json for a document that is already loaded ({id: {"tags", "categories"}})."""
+        def apply(conn):
+            if replace:
+                conn.execute("DELETE FROM icons")
+            for icon_id, info in data.items():
+                self._upsert(conn, icon_id, info.get("tags", []), info.get("categories", []))
+            return len(data)
+
+        return self._write(apply)
+
+    def export_json(self, json_path=DEFAULT_JSON, force=False):
+        """
+        Materializes the store to icon-tags.json (same layout as the Tag Manager export).
+        Skips the write when nothing changed since the last export. Returns True if written.
+        An empty store is never exported: it would wipe every tag in the file.
+        """
+        conn = self._connect()
+        try:
+            generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+            exported = conn.execute("SELECT value FROM meta WHERE key = 'exported_generation'").fetchone()[0]
+        finally:
+            conn.close()
+
+        if not force and generation == exported and os.path.exists(json_path):
+            return False
+
+        data = self.all()
+        if not data:
+            raise EmptyStoreError(f"{self.path} has no icons - import {json_path} first instead of exporting over it")
+        content = json.dumps(data, indent=2, ensure_ascii=False)
+
+        # Write next to the target and swap in atomically so readers never see a partial file
+        out_dir = os.path.dirname(os.path.abspath(json_path))
+        os.makedirs(out_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".icon-tags-", suffix=".json", dir=out_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, json_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'exported_generation'", (generation,))
+        finally:
+            conn.close()
+        return True
+
+
+def split_list(value):
+    return [v.strip().lower() for v in (value or "").split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-icon tag store for icon-tags.json.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite database (default: {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="bulk-load an icon-tags.json file")
+    p.add_argument("json", nargs="?", default=DEFAULT_JSON)
+    p.add_argument("--replace", action="store_true", help="drop icons that are not in the file")
+
+    p = sub.add_parser("export", help="materialize icon-tags.json from the store")
+    p.add_argument("json", nargs="?", default=DEFAULT_JSON)
+    p.add_argument("--force", action="store_true")
+
+    p = sub.add_parser("get", help="show one icon")
+    p.add_argument("icon_id")
+
+    p = sub.add_parser("put", help="replace one icon's tags and categories")
+    p.add_argument("icon_id")
+    p.add_argument("--tags", default="")
+    p.add_argument("--categories", default="")
+    p.add_argument("--expected-version", type=int)
+
+    p = sub.add_parser("patch", help="add/remove tags and categories on one icon")
+    p.add_argument("icon_id")
+    p.add_argument("--add-tags", default="")
+    p.add_argument("--remove-tags", default="")
+    p.add_argument("--add-categories", default="")
+    p.add_argument("--remove-categories", default="")
+
+    args = parser.parse_args()
+    store = TagStore(args.db)
+
+    if args.command == "import":
+        count = store.import_json(args.json, replace=args.replace)
+        print(f"✓ Imported {count} icons from {args.json} into {args.db}")
+    elif args.command == "export":
+        try:
+            written = store.export_json(args.json, force=args.force)
+        except EmptyStoreError as e:
+            raise SystemExit(f"❌ {e}")
+        if written:
+            print(f"✓ Wrote {args.json}")
+        else:
+            print(f"✓ {args.json} is up to date")
+    elif args.command == "get":
+        entry = store.get(args.icon_id)
+        if entry is None:
+            raise SystemExit(f"❌ '{args.icon_id}' not found")
+        print(json.dumps({args.icon_id: entry}, indent=2, ensure_ascii=False))
+    elif args.command == "put":
+        try:
+            version = store.put(args.icon_id, split_list(args.tags), split_list(args.categories),
+                                expected_version=args.expected_version)
+        except ConflictError as e:
+            raise SystemExit(f"❌ Conflict: {e}")
+        print(f"✓ {args.icon_id} saved (version {version})")
+    elif args.command == "patch":
+        entry = store.patch(
+            args.icon_id,
+            add_tags=split_list(args.add_tags),
+            remove_tags=split_list(args.remove_tags),
+            add_categories=split_list(args.add_categories),
+            remove_categories=split_list(args.remove_categories),
+        )
+        print(json.dumps({args.icon_id: entry}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import unicodedata
+from collections import Counter, defaultdict
+
+# Normalized tag vocabulary for dist/icon-tags.json.
+#
+# Tags are normalized (case, accents, punctuation), stemmed word by word and
+# merged through the thesaurus, so "connect", "connection" and "connectivity"
+# become one term. The output lists every term once with an integer id and
+# stores each icon's tags as a list of ids:
+#
+#   {"vocab": ["connection", ...],            id -> label (the most used spelling)
+#    "aliases": {"connect": 0, ...},          other spellings that were merged into a term
+#    "icons": ["Business_110", ...],
+#    "tags": [[0, 4, 9], ...],                per icon, same order as "icons"
+#    "categories": [...], "iconCategories": [[0], ...],
+#    "source": "9f2c..."}                     sha256 of the icon-tags.json it was built from
+#
+# The viewer loads only this file for search and the category filter; it falls
+# back to downloading icon-tags.json when that was saved after the index.
+#
+#   python tag_vocab.py                       dist/icon-tags.json -> dist/icon-tags-index.json
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THESAURUS = os.path.join(PYTHON_DIR, "tag-thesaurus.json")
+DEFAULT_INPUT = os.path.join("dist", "icon-tags.json")
+DEFAULT_OUTPUT = "icon-tags-index.json"
+
+VOWELS = "aeiou"
+
+
+class PorterStemmer:
+    """The classic Porter (1980) stemmer."""
+
+    STEP2 = [("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"), ("izer", "ize"),
+             ("bli", "ble"), ("alli", "al"), ("entli", "ent"), ("eli", "e"), ("ousli", "ous"),
+             ("ization", "ize"), ("ation", "ate"), ("ator", "ate"), ("alism", "al"), ("iveness", "ive"),
+             ("fulness", "ful"), ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+             ("logi", "log")]
+    STEP3 = [("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"), ("ical", "ic"),
+             ("ful", ""), ("ness", "")]
+    STEP4 = ["al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment", "ent",
+             "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize"]
+
+    def __init__(self):
+        self._cache = {}
+
+    @staticmethod
+    def _cons(word, i):
+        ch = word[i]
+        if ch in VOWELS:
+            return False
+        if ch == "y":
+            return i == 0 or not PorterStemmer._cons(word, i - 1)
+        return True
+
+    @classmethod
+    def _measure(cls, stem):
+        """m in [C](VC)^m[V]."""
+        m, i, n = 0, 0, len(stem)
+        while i < n and cls._cons(stem, i):
+            i += 1
+        while i < n:
+            while i < n and not cls._cons(stem, i):
+                i += 1
+            if i >= n:
+                break
+            while i < n and cls._cons(stem, i):
+                i += 1
+            m += 1
+        return m
+
+    @classmethod
+    def _has_vowel(cls, stem):
+        return any(not cls._cons(stem, i) for i in range(len(stem)))
+
+    @classmethod
+    def _double_cons(cls, word):
+        return len(word) >= 2 and word[-1] == word[-2] and cls._cons(word, len(word) - 1)
+
+    @classmethod
+    def _cvc(cls, word):
+        n = len(word)
+        return (n >= 3 and cls._cons(word, n - 3) and not cls._cons(word, n - 2)
+                and cls._cons(word, n - 1) and word[-1] not in "wxy")
+
+    def _replace(self, word, rules, min_measure):
+        for suffix, replacement in rules:
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                return stem + replacement if self._measure(stem) > min_measure else word
+        return word
+
+    def stem(self, word):
+        if len(word) <= 2 or not word.isalpha():
+            return word
+        if word in self._cache:
+            return self._cache[word]
+        w = word
+
+        # Step 1a: plurals
+        if w.endswith("sses"):
+            w = w[:-2]
+        elif w.endswith("ies"):
+            w = w[:-2]
+        elif w.endswith("s") and not w.endswith("ss"):
+            w = w[:-1]
+
+        # Step 1b: -eed, -ed, -ing
+        if w.endswith("eed"):
+            if self._measure(w[:-3]) > 0:
+                w = w[:-1]
+        else:
+            for suffix in ("ed", "ing"):
+                if w.endswith(suffix) and self._has_vowel(w[:-len(suffix)]):
+                    w = w[:-len(suffix)]
+                    if w.endswith(("at", "bl", "iz")):
+                        w += "e"
+                    elif self._double_cons(w) and w[-1] not in "lsz":
+                        w = w[:-1]
+                    elif self._measure(w) == 1 and self._cvc(w):
+                        w += "e"
+                    break
+
+        # Step 1c: y -> i
+        if w.endswith("y") and self._has_vowel(w[:-1]):
+            w = w[:-1] + "i"
+
+        w = self._replace(w, self.STEP2, 0)
+        w = self._replace(w, self.STEP3, 0)
+
+        # Step 4: drop suffixes when the stem is long enough
+        for suffix in sorted(self.STEP4, key=len, reverse=True):
+            if w.endswith(suffix):
+                stem = w[:-len(suffix)]
+                if self._measure(stem) > 1 and (suffix != "ion" or stem.endswith(("s", "t"))):
+                    w = stem
+                break
+
+        # Step 5: final -e and -ll
+        if w.endswith("e"):
+            stem = w[:-1]
+            m = self._measure(stem)
+            if m > 1 or (m == 1 and not self._cvc(stem)):
+                w = stem
+        if w.endswith("ll") and self._measure(w) > 1:
+            w = w[:-1]
+
+        self._cache[word] = w
+        return w
+
+
+_stemmer = PorterStemmer()
+
+
+def normalize(tag):
+    """Lowercase ASCII words separated by single spaces ('Computer-Based  Training' -> 'computer based training')."""
+    text = unicodedata.normalize("NFKD", tag).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def stem_key(normalized, protected=()):
+    # Protected words are marked so that other words cannot stem onto them ("presentation" vs "present")
+    return " ".join(f"={w}" if w in protected else _stemmer.stem(w) for w in normalized.split())
+
+
+def load_thesaurus(path=DEFAULT_THESAURUS):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class Vocabulary:
+    """Maps raw tags to term ids. Synonym groups from the thesaurus share one id."""
+
+    def __init__(self, thesaurus=None):
+        thesaurus = thesaurus or {}
+        self.protected = {normalize(w) for w in thesaurus.get("protected", [])}
+        self.stopwords = {normalize(w) for w in thesaurus.get("stopwords", [])}
+        # stem key -> stem key of the group's first entry
+        self.synonyms = {}
+        for group in thesaurus.get("synonyms", []):
+            keys = [self.key(w) for w in group]
+            for key in keys:
+                self.synonyms.setdefault(key, keys[0])
+        self.ids = {}
+        self.spellings = defaultdict(Counter)
+
+    def key(self, normalized):
+        return stem_key(normalized, self.protected)
+
+    def canonical(self, tag):
+        """Group key for a raw tag, or None when it is empty or a stopword."""
+        normalized = normalize(tag)
+        if not normalized or normalized in self.stopwords:
+            return None, normalized
+        key = self.key(normalized)
+        return self.synonyms.get(key, key), normalized
+
+    def add(self, tag):
+        group, normalized = self.canonical(tag)
+        if group is None:
+            return None
+        if group not in self.ids:
+            self.ids[group] = len(self.ids)
+        self.spellings[group][normalized] += 1
+        return self.ids[group]
+
+    def labels(self):
+        """Display label per id: the most used spelling (ties: the shortest)."""
+        labels = [None] * len(self.ids)
+        for group, term_id in self.ids.items():
+            counts = self.spellings[group]
+            labels[term_id] = min(counts, key=lambda s: (-counts[s], len(s), s))
+        return labels
+
+    def aliases(self):
+        labels = self.labels()
+        table = {}
+        for group, term_id in self.ids.items():
+            for spelling in self.spellings[group]:
+                if spelling != labels[term_id]:
+                    table[spelling] = term_id
+        return dict(sorted(table.items()))
+
+
+def build_index(icon_tags, thesaurus=None):
+    """icon-tags.json document -> (index document, report)."""
+    vocab = Vocabulary(thesaurus)
+    categories = {}
+    icons, tag_ids, category_ids = [], [], []
+    raw_tags = Counter()
+
+    for icon_id, entry in icon_tags.items():
+        ids = []
+        for tag in entry.get("tags", []):
+            raw_tags[tag] += 1
+            term_id = vocab.add(tag)
+            if term_id is not None and term_id not in ids:
+                ids.append(term_id)
+        cats = []
+        for category in entry.get("categories", []):
+            cat_id = categories.setdefault(category, len(categories))
+            if cat_id not in cats:
+                cats.append(cat_id)
+        icons.append(icon_id)
+        tag_ids.append(sorted(ids))
+        category_ids.append(sorted(cats))
+
+    index = {
+        "vocab": vocab.labels(),
+        "aliases": vocab.aliases(),
+        "icons": icons,
+        "tags": tag_ids,
+        "categories": list(categories),
+        "iconCategories": category_ids,
+    }
+    merged = sorted(((vocab.labels()[i], sorted(vocab.spellings[g])) for g, i in vocab.ids.items()
+                     if len(vocab.spellings[g]) > 1), key=lambda item: -len(item[1]))
+    report = {
+        "icons": len(icons),
+        "rawTags": sum(raw_tags.values()),
+        "distinctBefore": len(raw_tags),
+        "distinctAfter": len(vocab.ids),
+        "merged": merged,
+    }
+    return index, report
+
+
+def source_hash(data):
+    """sha256 of the icon-tags.json bytes, recording which file the index was built from."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def encode(index):
+    return json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def print_report(report, source_bytes, index_bytes):
+    print(f"\n🏷️  {report['icons']} icons, {report['rawTags']} tags: "
+          f"{report['distinctBefore']} distinct -> {report['distinctAfter']} terms")
+    for label, spellings in report["merged"][:10]:
+        print(f"   {label}: {', '.join(spellings)}")
+    if len(report["merged"]) > 10:
+        print(f"   ... {len(report['merged']) - 10} more merged terms")
+    print(f"   Size: {source_bytes / 1024:.1f} KB -> {index_bytes / 1024:.1f} KB")
+
+
+def build_tag_index(files, output=DEFAULT_OUTPUT):
+    """
+    Pipeline entry point: {"icon-tags.json": bytes[, "tag-thesaurus.json": bytes]} -> {output: index bytes}.
+    Passing the thesaurus as an input makes thesaurus edits invalidate the stage.
+    """
+    data = files["icon-tags.json"]
+    thesaurus_name = os.path.basename(DEFAULT_THESAURUS)
+    thesaurus = json.loads(files[thesaurus_name]) if thesaurus_name in files else load_thesaurus()
+    index, report = build_index(json.loads(data), thesaurus)
+    index["source"] = source_hash(data)
+    encoded = encode(index)
+    print_report(report, len(data), len(encoded))
+    return {output: encoded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the normalized tag vocabulary and per-icon tag ids.")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    parser.add_argument("-o", "--output", default=os.path.join("dist", DEFAULT_OUTPUT))
+    parser.add_argument("--thesaurus", default=DEFAULT_THESAURUS)
+    parser.add_argument("--explain", metavar="TAG", help="show how one tag is normalized and grouped")
+    args = parser.parse_args()
+
+    thesaurus = load_thesaurus(args.thesaurus)
+    if args.explain:
+        vocab = Vocabulary(thesaurus)
+        group, normalized = vocab.canonical(args.explain)
+        print(f"{args.explain!r} -> normalized {normalized!r} -> stem {vocab.key(normalized)!r} -> group {group!r}")
+        return
+
+    if not os.path.exists(args.input):
+        sys.exit(f"❌ {args.input} not found")
+    with open(args.input, "rb") as f:
+        data = f.read()
+    index, report = build_index(json.loads(data), thesaurus)
+    index["source"] = source_hash(data)
+    encoded = encode(index)
+    with open(args.output, "wb") as f:
+        f.write(encoded)
+    print_report(report, len(data), len(encoded))
+    print(f"✓ Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
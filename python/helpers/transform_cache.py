@@ -0,0 +1,218 @@
+import io
+import os
+import json
+import hashlib
+import argparse
+import functools
+import threading
+
+# Content-addressed cache for the per-file SVG transforms in this folder.
+# An entry is keyed by the source bytes, the transform name, its parameters and
+# the helper's code (its own file plus the files it lists in PIPELINE_DEPENDS),
+# so re-running a helper only re-parses files that changed.
+
+# Relative to the working directory, so an installed copy never writes into
+# site-packages; helpers run from an svg/ folder keep their own cache there
+DEFAULT_CACHE_DIR = os.environ.get("GEP_TRANSFORM_CACHE_DIR", ".transform-cache")
+DEFAULT_MAX_MB = float(os.environ.get("GEP_TRANSFORM_CACHE_MB", 256))
+
+# After an eviction pass the cache is trimmed down to this share of the cap
+EVICT_TO = 0.9
+
+
+class TransformCache:
+    """
+    Blobs live in <cache_dir>/<key[:2]>/<key>. A hit touches the file's mtime,
+    so eviction (oldest mtime first) is least-recently-used.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = None
+
+    @staticmethod
+    def make_key(data, transform, params=None, code=""):
+        h = hashlib.sha256()
+        h.update(transform.encode("utf-8"))
+        h.update(b"\0")
+        h.update(json.dumps(params or {}, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\0")
+        h.update(code.encode("utf-8"))
+        h.update(b"\0")
+        h.update(hashlib.sha256(data).digest())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._total is None:
+                self._total = self.size()
+            else:
+                self._total += len(data)
+            if self._total > self.max_bytes:
+                self._total = self.evict(int(self.max_bytes * EVICT_TO))
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for bucket in os.listdir(self.cache_dir):
+            bucket_path = os.path.join(self.cache_dir, bucket)
+            if not os.path.isdir(bucket_path):
+                continue
+            for name in os.listdir(bucket_path):
+                path = os.path.join(bucket_path, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_bytes):
+        """Deletes least-recently-used entries until the cache fits in target_bytes. Returns the new size."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+    def clear(self):
+        return self.evict(0)
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TransformCache()
+    return _default_cache
+
+
+def read_source(src):
+    if hasattr(src, "read"):
+        return src.read()
+    with open(src, "rb") as f:
+        return f.read()
+
+
+def write_dest(dest, data):
+    if hasattr(dest, "write"):
+        dest.write(data)
+    else:
+        with open(dest, "wb") as f:
+            f.write(data)
+
+
+def code_digest(paths):
+    """sha256 over the given files; missing files count as empty."""
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cached_transform(name, params=None):
+    """
+    Decorator for fn(src, dest, **kwargs) helpers. `params` is a callable
+    returning the settings that affect the output (read at call time, so
+    changed module constants produce new keys); keyword arguments are part of
+    the key as well. On a hit the cached bytes are written to
+    `dest` without parsing the source. Empty results are never cached, which
+    keeps "print an error and return" behaviour intact.
+
+    Helpers that import other helper modules list those files in a module-level
+    PIPELINE_DEPENDS (defined above the decorated function), so a change there
+    invalidates the cached output as well.
+    """
+    def decorator(fn):
+        own = fn.__globals__.get("__file__")
+        code = code_digest(([own] if own else []) + list(fn.__globals__.get("PIPELINE_DEPENDS", [])))
+
+        @functools.wraps(fn)
+        def wrapper(src, dest, **kwargs):
+            cache = default_cache()
+            data = read_source(src)
+            key = cache.make_key(data, name, {**(params() if params else {}), **kwargs}, code)
+
+            hit = cache.get(key)
+            if hit is not None:
+                write_dest(dest, hit)
+                return
+
+            out = io.BytesIO()
+            result = fn(io.BytesIO(data), out, **kwargs)
+            output = out.getvalue()
+            if output:
+                cache.put(key, output)
+                write_dest(dest, output)
+            return result
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared transform cache.")
+    parser.add_argument("command", choices=["stats", "clear", "trim"])
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    args = parser.parse_args()
+
+    cache = TransformCache(args.dir, int(args.max_mb * 1024 * 1024))
+    if args.command == "stats":
+        entries = cache._entries()
+        total = sum(size for _, size, _ in entries)
+        print(f"{args.dir}: {len(entries)} entries, {total / 1024:.1f} KB (cap {args.max_mb:g} MB)")
+    elif args.command == "trim":
+        total = cache.evict(cache.max_bytes)
+        print(f"✓ Trimmed to {total / 1024:.1f} KB")
+    else:
+        cache.clear()
+        print(f"✓ Cleared {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ let currentTab = 'pictograph'; // Track current tab - default to Pictographs
 
 // 1. CALCULATE DYNAMIC BASE PATH
 const baseUrl = window.location.href.substring(0, window.location.href.lastIndexOf('/') + 1);
-let iconTagsData = null; // Will store the icon-tags.json data
+let iconTagsData = null; // Per icon: categories plus term ids (from the index) or raw tags (from icon-tags.json)
+let tagIndex = null; // Normalized tag vocabulary from icon-tags-index.json (optional)
 
 
 
@@ -133,8 +134,10 @@ function formatColorLabel(cls) {
     ).join(' ');
 }
 
-// *** UPDATED: Load tags and categories from separate icon-tags.json file ***
+// *** UPDATED: Load tags and categories, from the compact tag index when there is one ***
+// icon-tags.json (raw tag strings) is only downloaded when the index is missing or older.
 async function loadIconTags() {
+    if (await loadTagIndex()) return;
     try {
         const response = await fetch('./dist/icon-tags.json');
         if (response.ok) {
@@ -148,6 +151,60 @@ async function loadIconTags() {
     }
 }
 
+// Last-Modified time of a file from a HEAD request, or NaN when unknown
+async function lastModified(url) {
+    try {
+        const response = await fetch(url, { method: 'HEAD' });
+        return response.ok ? Date.parse(response.headers.get('Last-Modified')) : NaN;
+    } catch (e) {
+        return NaN;
+    }
+}
+
+// Optional: normalized vocabulary + per-icon term ids built by python/helpers/tag_vocab.py.
+// Skipped when icon-tags.json was saved after it (new or edited tags would be missing),
+// so search falls back to the raw tags until the index is rebuilt. Returns true when used.
+async function loadTagIndex() {
+    try {
+        const response = await fetch('./dist/icon-tags-index.json');
+        if (!response.ok) return false;
+        const indexTime = Date.parse(response.headers.get('Last-Modified'));
+        const tagsTime = await lastModified('./dist/icon-tags.json');
+        if (tagsTime > indexTime) {
+            console.log('Tag index is older than icon-tags.json - loading raw tags (re-run tag_vocab.py)');
+            return false;
+        }
+        const index = await response.json();
+        iconTagsData = {};
+        index.icons.forEach((iconId, position) => {
+            iconTagsData[iconId] = {
+                termIds: index.tags[position],
+                categories: index.iconCategories[position].map(id => index.categories[id])
+            };
+        });
+        tagIndex = { vocab: index.vocab, aliases: index.aliases || {} };
+        console.log(`Loaded tags & categories from the tag index (${index.vocab.length} terms)`);
+        return true;
+    } catch (e) {
+        console.log('Tag index not available:', e.message);
+        return false;
+    }
+}
+
+// Term ids whose label or merged spelling contains the query
+function matchingTermIds(q) {
+    const normalized = q.replace(/[^a-z0-9]+/g, ' ').trim();
+    const ids = new Set();
+    if (!normalized) return ids;
+    tagIndex.vocab.forEach((label, id) => {
+        if (label.includes(normalized)) ids.add(id);
+    });
+    for (const [spelling, id] of Object.entries(tagIndex.aliases)) {
+        if (spelling.includes(normalized)) ids.add(id);
+    }
+    return ids;
+}
+
 
 // --- SYSTEM LOGIC ---
 async function loadConfig() {
@@ -284,6 +341,8 @@ function filterIcons() {
     debounceTimer = setTimeout(() => {
         const q = document.getElementById('search-input').value.toLowerCase();
         const c = document.getElementById('category-filter').value;
+        // With the tag index, tag search is a set lookup per icon instead of scanning every tag string
+        const termIds = tagIndex && q ? matchingTermIds(q) : null;
         
         filteredIconsGlobal = currentConfig.icons.filter(i => {
             // Filter by current tab type
@@ -309,10 +368,14 @@ function filterIcons() {
             
             if (iconTagsData && iconTagsData[i.id]) {
                 // Search in tags
-                const tags = iconTagsData[i.id].tags || [];
-                matchesTags = tags.some(tag => 
-                    tag.toLowerCase().includes(q)
-                );
+                if (termIds && iconTagsData[i.id].termIds) {
+                    matchesTags = iconTagsData[i.id].termIds.some(id => termIds.has(id));
+                } else {
+                    const tags = iconTagsData[i.id].tags || [];
+                    matchesTags = tags.some(tag => 
+                        tag.toLowerCase().includes(q)
+                    );
+                }
                 
                 // Search in categories
                 const categories = iconTagsData[i.id].categories || [];
@@ -0,0 +1,20 @@
+import os
+import sys
+from xml.etree import ElementTree as ET
+
+import pytest
+
+# The helpers import each other by bare name, as when run from python/helpers
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (os.path.join(ROOT, "python"), os.path.join(ROOT, "python", "helpers")):
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+
+
+@pytest.fixture(autouse=True)
+def namespace_registry():
+    """Restores ElementTree's global prefix registry, which tests and helpers change with register_namespace."""
+    saved = dict(ET._namespace_map)
+    yield
+    ET._namespace_map.clear()
+    ET._namespace_map.update(saved)
@@ -0,0 +1,20 @@
+from color_usage import build_index, compliant
+
+THEMEABLE = b'<svg xmlns="http://www.w3.org/2000/svg"><path fill="currentColor" d="M0 0h1v1z"/></svg>'
+BRAND = b'<svg xmlns="http://www.w3.org/2000/svg"><path fill="#0072BC" d="M0 0h1v1z"/></svg>'
+
+
+def test_only_themeable_files_skip_the_css_ready_pass():
+    index, _ = build_index({"themeable.svg": (THEMEABLE, None), "brand.svg": (BRAND, None)})
+    assert index["files"]["brand.svg"]["status"] == "brand"
+    assert compliant(index, "themeable.svg", THEMEABLE)
+    # Literal palette hex still has to become currentColor
+    assert not compliant(index, "brand.svg", BRAND)
+    assert compliant(index, "brand.svg", BRAND, statuses={"themeable", "brand"})
+
+
+def test_changed_or_unknown_files_are_not_skipped():
+    index, _ = build_index({"themeable.svg": (THEMEABLE, None)})
+    assert not compliant(index, "themeable.svg", BRAND)
+    assert not compliant(index, "missing.svg")
+    assert not compliant(None, "themeable.svg")
@@ -0,0 +1,22 @@
+from xml.etree import ElementTree as ET
+
+from complexity_budget import measure_symbol, count_path_commands
+
+SVG_NS = "http://www.w3.org/2000/svg"
+SYMBOL = f'<symbol xmlns="{SVG_NS}" id="a" viewBox="0 0 10 10"><path d="M0 0L10 10 5 5Z"/><circle r="2"/></symbol>'
+
+
+def test_counts_elements_and_implicit_path_commands():
+    measured = measure_symbol(ET.fromstring(SYMBOL))
+    assert measured["elements"] == 2
+    assert measured["path_commands"] == 4
+    assert count_path_commands("M0 0 1 1 2 2") == 3
+
+
+def test_bytes_do_not_depend_on_registered_prefixes():
+    # The registry is restored after each test (see conftest.py)
+    ET.register_namespace("svg", SVG_NS)
+    with_prefix = measure_symbol(ET.fromstring(SYMBOL))["bytes"]
+    ET.register_namespace("", SVG_NS)
+    assert measure_symbol(ET.fromstring(SYMBOL))["bytes"] == with_prefix
+    assert with_prefix == len(ET.tostring(ET.fromstring(SYMBOL), encoding="utf-8"))
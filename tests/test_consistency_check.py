@@ -0,0 +1,33 @@
+import io
+
+from consistency_check import check, gate, sprite_symbols
+
+SVG_NS = "http://www.w3.org/2000/svg"
+SPRITE = (f'<svg xmlns="{SVG_NS}"><symbol id="a" viewBox="0 0 10 10"/>'
+          f'<symbol id="b" viewBox="0 0 10 10"/></svg>').encode("utf-8")
+CONFIG = {"icons": [{"id": "a", "type": "UI", "viewBox": "0 0 10 10"},
+                    {"id": "b", "type": "UI", "viewBox": "0 0 10 10"}]}
+
+
+def kinds(issues):
+    return {(kind, icon_id) for kind, icon_id, _ in issues}
+
+
+def test_tags_for_deleted_icon_are_a_warning():
+    tags = {"a": {"tags": ["x"]}, "b": {"tags": ["y"]}, "deleted": {"tags": ["z"]}}
+    report = check(sprite_symbols(io.BytesIO(SPRITE)), CONFIG, tags)
+    assert report["errors"] == []
+    assert ("orphan-tags", "deleted") in kinds(report["warnings"])
+
+
+def test_gate_passes_with_orphan_tags(tmp_path):
+    tags_path = tmp_path / "icon-tags.json"
+    tags_path.write_text('{"a": {"tags": ["x"]}, "b": {"tags": ["y"]}, "deleted": {"tags": ["z"]}}')
+    assert gate(io.BytesIO(SPRITE), CONFIG, str(tags_path))
+
+
+def test_gate_fails_on_mismatched_ids():
+    config = {"icons": CONFIG["icons"] + [{"id": "c", "type": "UI", "viewBox": "0 0 10 10"}]}
+    assert not gate(io.BytesIO(SPRITE), config, None)
+    report = check(sprite_symbols(io.BytesIO(SPRITE)), config)
+    assert ("missing-from-sprite", "c") in kinds(report["errors"])
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from sprite_delta import sprite_version
+
+# Builds a small library twice with generate.py --canonical, in fresh interpreters
+# with different hash seeds, and compares every file the build writes: sprite,
+# config (with "related"), index, delta from the previous build and standalone icons.
+# The second build reads the sources in a shuffled order and has an unrelated
+# prefix registered for the SVG namespace, as another machine or helper might.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHON_DIR = os.path.join(ROOT, "python")
+SPRITE = "test-icons"
+ICONS_PER_FOLDER = 12
+
+BUILD = """
+import sys, random
+from xml.etree import ElementTree as ET
+sys.path.insert(0, sys.argv[1])
+import generate
+
+shuffle = int(sys.argv[3])
+if shuffle:
+    sources = list(generate.iter_source_files("svg"))
+    random.Random(shuffle).shuffle(sources)
+    generate.iter_source_files = lambda svg_dir: iter(sources)
+    ET.register_namespace("svg", generate.SVG_NS)
+generate.create_gep_sprite_system(sys.argv[2], standalone=True, canonical=True)
+"""
+
+
+def build(project, hash_seed, shuffle):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    result = subprocess.run([sys.executable, "-c", BUILD, PYTHON_DIR, SPRITE, str(shuffle)],
+                            cwd=project, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def make_project(path):
+    """A project with the first icons of each svg/ folder and the shared tags."""
+    folders = sorted(f for f in os.listdir(os.path.join(ROOT, "svg")) if os.path.isdir(os.path.join(ROOT, "svg", f)))
+    for folder in folders:
+        os.makedirs(os.path.join(path, "svg", folder))
+        names = sorted(n for n in os.listdir(os.path.join(ROOT, "svg", folder)) if n.lower().endswith(".svg"))
+        for name in names[:ICONS_PER_FOLDER]:
+            shutil.copy(os.path.join(ROOT, "svg", folder, name), os.path.join(path, "svg", folder, name))
+    os.makedirs(os.path.join(path, "dist"))
+    shutil.copy(os.path.join(ROOT, "dist", "icon-tags.json"), os.path.join(path, "dist", "icon-tags.json"))
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def dist_files(project):
+    """{path relative to dist/: bytes} for everything the builds wrote."""
+    dist = os.path.join(project, "dist")
+    return {os.path.relpath(os.path.join(root_dir, filename), dist): read(os.path.join(root_dir, filename))
+            for root_dir, _, filenames in os.walk(dist) for filename in filenames}
+
+
+@pytest.fixture(scope="module")
+def builds(tmp_path_factory):
+    outputs = []
+    for hash_seed, shuffle in ((0, 0), (12345, 7)):
+        project = str(tmp_path_factory.mktemp(f"build-{hash_seed}"))
+        make_project(project)
+        # The previous build lacks one icon and has another one changed, so a delta is written
+        folder = os.path.join(project, "svg", "pictographs")
+        first, second = sorted(os.listdir(folder))[:2]
+        kept = {name: read(os.path.join(folder, name)) for name in (first, second)}
+        os.remove(os.path.join(folder, first))
+        with open(os.path.join(folder, second), "wb") as f:
+            f.write(kept[first])
+        build(project, hash_seed, 0)
+        for name, data in kept.items():
+            with open(os.path.join(folder, name), "wb") as f:
+                f.write(data)
+        build(project, hash_seed, shuffle)
+        outputs.append(dist_files(project))
+    return outputs
+
+
+def test_builds_write_the_same_files(builds):
+    first, second = builds
+    assert sorted(first) == sorted(second)
+    for name in (f"{SPRITE}.svg", f"{SPRITE}-config.json", f"{SPRITE}-index.json", f"{SPRITE}-delta.json"):
+        assert name in first
+    assert any(name.startswith("icons") for name in first)
+
+
+def test_builds_are_byte_identical(builds):
+    first, second = builds
+    different = [name for name in sorted(first) if first[name] != second.get(name)]
+    assert different == []
+
+
+def test_config_includes_related_icons(builds):
+    pytest.importorskip("scipy")
+    config = builds[0][f"{SPRITE}-config.json"]
+    assert b'"related"' in config
+
+
+def test_index_config_and_delta_agree_on_the_version(builds):
+    # The build with other prefixes registered, checked from this process
+    files = builds[1]
+    version = sprite_version(files[f"{SPRITE}.svg"])
+    assert json.loads(files[f"{SPRITE}-config.json"])["spriteVersion"] == version
+    assert json.loads(files[f"{SPRITE}-index.json"])["spriteVersion"] == version
+    assert json.loads(files[f"{SPRITE}-delta.json"])["to"] == version
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from sprite_delta import compute_delta, apply_delta, parse_symbols, sprite_version, verify
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+def sprite(*symbols):
+    body = "".join(f'<symbol id="{icon_id}" viewBox="0 0 10 10">{content}</symbol>' for icon_id, content in symbols)
+    return f'<?xml version="1.0" encoding="utf-8"?><svg xmlns="{SVG_NS}"><defs/>{body}</svg>'.encode("utf-8")
+
+
+OLD = sprite(
+    ("a", '<path d="M0 0L10 10"/>'),
+    ("b", '<circle cx="5" cy="5" r="4"/>'),
+    ("c", '<rect width="10" height="10"/>'),
+)
+NEW = sprite(
+    ("a", '<path d="M0 0L10 10"/>'),
+    ("b", '<circle cx="5" cy="5" r="3"/>'),
+    ("d", '<path d="M0 10L10 0"/>'),
+)
+
+
+def test_delta_lists_added_changed_and_removed():
+    delta = compute_delta(OLD, NEW, "test")
+    assert delta["sprite"] == "test"
+    assert list(delta["added"]) == ["d"]
+    assert list(delta["changed"]) == ["b"]
+    assert delta["removed"] == ["c"]
+    assert delta["from"] == sprite_version(OLD)
+    assert delta["to"] == sprite_version(NEW)
+    assert "order" not in delta
+
+
+def test_apply_reproduces_new_sprite():
+    delta = compute_delta(OLD, NEW)
+    patched = apply_delta(OLD, delta)
+    assert sprite_version(patched) == sprite_version(NEW)
+    _, symbols = parse_symbols(patched)
+    assert list(symbols) == ["a", "b", "d"]
+    assert symbols["b"].find(f"{{{SVG_NS}}}circle").get("r") == "3"
+    assert verify(OLD, NEW, delta)
+
+
+def test_apply_keeps_reordered_symbols():
+    reordered = sprite(
+        ("c", '<rect width="10" height="10"/>'),
+        ("a", '<path d="M0 0L10 10"/>'),
+        ("b", '<circle cx="5" cy="5" r="4"/>'),
+    )
+    delta = compute_delta(OLD, reordered)
+    assert delta["order"] == ["c", "a", "b"]
+    assert not delta["added"] and not delta["changed"] and not delta["removed"]
+    _, symbols = parse_symbols(apply_delta(OLD, delta))
+    assert list(symbols) == ["c", "a", "b"]
+
+
+def test_unchanged_sprite_gives_empty_delta():
+    delta = compute_delta(OLD, OLD)
+    assert delta["from"] == delta["to"]
+    assert not delta["added"] and not delta["changed"] and not delta["removed"]
+
+
+def test_apply_rejects_other_from_version():
+    delta = compute_delta(OLD, NEW)
+    with pytest.raises(ValueError, match="delta expects"):
+        apply_delta(NEW, delta)
+
+
+def test_apply_rejects_result_that_does_not_match_to():
+    delta = compute_delta(OLD, NEW)
+    delta["changed"]["b"] = f'<symbol xmlns="{SVG_NS}" id="b" viewBox="0 0 10 10"/>'
+    with pytest.raises(ValueError, match="does not match"):
+        apply_delta(OLD, delta)
+
+
+def test_duplicate_symbol_ids_are_rejected():
+    duplicated = sprite(("a", '<path d="M0 0L10 10"/>'), ("a", '<path d="M0 10L10 0"/>'))
+    with pytest.raises(ValueError, match="Duplicate symbol id 'a'"):
+        parse_symbols(duplicated)
+    with pytest.raises(ValueError):
+        compute_delta(OLD, duplicated)
+
+
+# Run in fresh interpreters: the first registers its own prefixes for the SVG and
+# sodipodi namespaces (as canonical_xml.serialize does for the latter) before
+# hashing, the second applies the delta with ElementTree's defaults
+SODIPODI_NS = "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd"
+
+DIFF_WITH_OTHER_PREFIXES = """
+import sys, json
+from xml.etree import ElementTree as ET
+sys.path.insert(0, sys.argv[1])
+ET.register_namespace("svg", "http://www.w3.org/2000/svg")
+ET.register_namespace("sodipodi", "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd")
+from sprite_delta import compute_delta, sprite_version
+old, new = open(sys.argv[2], "rb").read(), open(sys.argv[3], "rb").read()
+version = sprite_version(new)
+print(json.dumps({"version": version, "delta": compute_delta(old, new)}))
+"""
+
+APPLY = """
+import sys, json
+sys.path.insert(0, sys.argv[1])
+from sprite_delta import apply_delta, sprite_version
+old = open(sys.argv[2], "rb").read()
+delta = json.load(open(sys.argv[3], encoding="utf-8"))
+print(json.dumps({"patched": sprite_version(apply_delta(old, delta)), "old": sprite_version(old)}))
+"""
+
+HELPERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python", "helpers")
+
+
+def run_script(script, *args):
+    result = subprocess.run([sys.executable, "-c", script, HELPERS_DIR, *map(str, args)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_versions_do_not_depend_on_registered_prefixes(tmp_path):
+    def with_sodipodi(sprite):
+        return sprite.replace(b"<svg ", f'<svg xmlns:sodipodi="{SODIPODI_NS}" '.encode(), 1).replace(
+            b'<symbol id="a"', b'<symbol sodipodi:docname="a.svg" id="a"')
+    old, new = with_sodipodi(OLD), with_sodipodi(NEW)
+    (tmp_path / "old.svg").write_bytes(old)
+    (tmp_path / "new.svg").write_bytes(new)
+
+    diffed = run_script(DIFF_WITH_OTHER_PREFIXES, tmp_path / "old.svg", tmp_path / "new.svg")
+    assert diffed["delta"]["to"] == diffed["version"] == sprite_version(new)
+    assert diffed["delta"]["from"] == sprite_version(old)
+
+    (tmp_path / "delta.json").write_text(json.dumps(diffed["delta"]), encoding="utf-8")
+    applied = run_script(APPLY, tmp_path / "old.svg", tmp_path / "delta.json")
+    assert applied == {"patched": diffed["delta"]["to"], "old": diffed["delta"]["from"]}
@@ -0,0 +1,35 @@
+import pytest
+from xml.etree import ElementTree as ET
+
+from svg_geometry import analyze, path_cubics
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+def test_closepath_returns_to_subpath_start():
+    cubics, nodes = path_cubics("M0 0L10 0L10 10Z")
+    assert nodes == 3
+    assert len(cubics) == 3
+    assert list(cubics[-1][3]) == [0, 0]
+
+
+def test_numbers_after_closepath_are_rejected():
+    with pytest.raises(ValueError, match="after closepath"):
+        path_cubics("M0 0 L10 10 Z 5 5")
+
+
+def test_unreadable_shape_is_reported():
+    root = ET.fromstring(f'<svg xmlns="{SVG_NS}"><path id="bad" d="M0 0 L10 10 Z 5 5"/>'
+                         f'<rect width="2" height="2"/></svg>')
+    info = analyze(root)
+    assert info["bbox"] == [0.0, 0.0, 2.0, 2.0]
+    assert info["errors"] == ["<path id='bad'>: Number after closepath: 5"]
+    assert "errors" not in analyze(ET.fromstring(f'<svg xmlns="{SVG_NS}"><rect width="2" height="2"/></svg>'))
+
+
+def test_symbol_root_is_measured():
+    root = ET.fromstring(f'<symbol xmlns="{SVG_NS}" viewBox="0 0 10 10"><rect x="1" y="2" width="3" height="4"/>'
+                         f'<symbol><rect width="50" height="50"/></symbol></symbol>')
+    info = analyze(root)
+    assert info["bbox"] == [1.0, 2.0, 3.0, 4.0]
+    assert info["nodes"] == 4
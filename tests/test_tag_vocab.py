@@ -0,0 +1,25 @@
+import json
+import hashlib
+
+from tag_vocab import build_tag_index
+
+TAGS = {
+    "Business_Plug": {"tags": ["Connect", "plug"], "categories": ["business"]},
+    "Business_Socket": {"tags": ["connection", "socket"], "categories": ["business"]},
+}
+
+
+def test_index_records_its_source_and_merges_spellings():
+    data = json.dumps(TAGS, indent=2).encode("utf-8")
+    index = json.loads(build_tag_index({"icon-tags.json": data})["icon-tags-index.json"])
+    assert index["source"] == hashlib.sha256(data).hexdigest()
+    assert index["icons"] == ["Business_Plug", "Business_Socket"]
+    # "Connect" and "connection" are one term
+    assert set(index["tags"][0]) & set(index["tags"][1])
+
+
+def test_edited_tags_change_the_source():
+    before = json.dumps(TAGS).encode("utf-8")
+    after = json.dumps({**TAGS, "Business_Plug": {"tags": ["Connect", "plug", "power"]}}).encode("utf-8")
+    source = lambda data: json.loads(build_tag_index({"icon-tags.json": data})["icon-tags-index.json"])["source"]
+    assert source(before) != source(after)